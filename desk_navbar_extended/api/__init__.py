@@ -7,6 +7,7 @@ get_timezone_overview = _root_api.get_timezone_overview
 transcribe_audio = _root_api.transcribe_audio
 process_transcription = _root_api.process_transcription
 log_search_metrics = _root_api.log_search_metrics
+log_search_metrics_batch = _root_api.log_search_metrics_batch
 log_doctype_presence = _root_api.log_doctype_presence
 
 from . import (  # noqa: F401
@@ -14,6 +15,7 @@ from . import (  # noqa: F401
     help,
     history,
     kpi,
+    metrics,
     notifications,
     pins,
     quick_create,
@@ -27,11 +29,13 @@ __all__ = [
     "transcribe_audio",
     "process_transcription",
     "log_search_metrics",
+    "log_search_metrics_batch",
     "log_doctype_presence",
     "command_palette",
     "help",
     "history",
     "kpi",
+    "metrics",
     "notifications",
     "pins",
     "quick_create",
@@ -2,132 +2,272 @@
 
 from __future__ import annotations
 
+import json
+from hashlib import sha1
 from typing import Any
 
 import frappe
 from frappe import _
+from frappe.utils import cint
+from werkzeug.wrappers import Response
 
+from desk_navbar_extended import frecency
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.doctype_catalog import get_catalog_index, get_permitted_doctypes
+from desk_navbar_extended.metrics.instrumentation import instrument
+from desk_navbar_extended.search.fuzzy import FuzzyIndex
+
+# Feature flag each source depends on, in display order.
+SOURCE_FEATURES = {
+    "doctypes": None,
+    "saved_searches": "saved_searches",
+    "pins": "pins",
+    "recent": "grouped_history",
+    "quick_create": "quick_create",
+    "help": None,
+}
+
+# Catalog-like sources may be reused by the browser for a while; per-user
+# lists that change on every edit are always revalidated against their ETag.
+SOURCE_CACHE_CONTROL = {
+    "doctypes": "private, max-age=300",
+    "saved_searches": "private, no-cache",
+    "pins": "private, no-cache",
+    "recent": "private, no-cache",
+    "quick_create": "private, max-age=300",
+    "help": "private, max-age=3600",
+}
+
+MAX_SEARCH_RESULTS = 100
 
 
 @frappe.whitelist()
+@instrument("command_palette")
 def get_command_palette_sources() -> dict[str, Any]:
     """Get all command palette sources."""
     features = get_enabled_features_for_user()
     if not features.get("command_palette"):
         frappe.throw(_("Command palette feature is disabled"), frappe.PermissionError)
 
-    sources = {
-        "doctypes": [],
-        "saved_searches": [],
-        "pins": [],
-        "recent": [],
-        "quick_create": [],
-        "help": [],
+    return {
+        source: build_source(source) if not feature or features.get(feature) else []
+        for source, feature in SOURCE_FEATURES.items()
     }
 
-    # Get doctypes user can access
-    all_doctypes = frappe.get_all(
-        "DocType",
-        filters={"istable": 0, "issingle": 0},
-        fields=["name", "icon"],
-        limit=100,
-    )
-
-    for dt in all_doctypes:
-        if frappe.has_permission(dt.name, "read"):
-            meta = frappe.get_meta(dt.name)
-            sources["doctypes"].append(
-                {
-                    "type": "doctype",
-                    "label": _(dt.name),
-                    "value": dt.name,
-                    "icon": dt.icon or meta.icon or "octicon octicon-file",
-                    "route": f"/app/{frappe.scrub(dt.name)}",
-                    "description": f"Open {_(dt.name)} list",
-                }
-            )
-
-    # Get saved searches if enabled
-    if features.get("saved_searches"):
-        from desk_navbar_extended.api import saved_searches as ss_api
 
-        try:
-            saved = ss_api.list_saved_searches()
-            for search in saved:
-                sources["saved_searches"].append(
-                    {
-                        "type": "saved_search",
-                        "label": search["title"],
-                        "value": search["name"],
-                        "icon": "octicon octicon-search",
-                        "description": search["query"],
-                        "data": search,
-                    }
-                )
-        except Exception:  # noqa: BLE001
-            pass
-
-    # Get pins if enabled
-    if features.get("pins"):
-        from desk_navbar_extended.api import pins as pins_api
+@frappe.whitelist(methods=["GET"])
+@instrument("command_palette")
+def get_command_palette_source(source: str) -> Response:
+    """
+    Get a single command palette source with HTTP caching headers.
 
-        try:
-            pins = pins_api.list_pins()
-            for pin in pins:
-                sources["pins"].append(
-                    {
-                        "type": "pin",
-                        "label": pin["label"],
-                        "value": pin["name"],
-                        "icon": pin.get("icon") or "octicon octicon-star",
-                        "route": pin["route"],
-                        "color": pin.get("color"),
-                    }
-                )
-        except Exception:  # noqa: BLE001
-            pass
-
-    # Get quick create if enabled
-    if features.get("quick_create"):
-        from desk_navbar_extended.api import quick_create as qc_api
+    Args:
+        source: One of doctypes, saved_searches, pins, recent, quick_create, help
 
-        try:
-            options = qc_api.get_quick_create_options()
-            for opt in options:
-                sources["quick_create"].append(
-                    {
-                        "type": "quick_create",
-                        "label": f"New {opt['label']}",
-                        "value": opt["doctype"],
-                        "icon": opt.get("icon") or "octicon octicon-plus",
-                        "route": opt["route"],
-                        "description": f"Create new {opt['label']}",
-                    }
-                )
-        except Exception:  # noqa: BLE001
-            pass
-
-    # Get recent activity if enabled
-    if features.get("grouped_history"):
-        from desk_navbar_extended.api import history as hist_api
+    Returns:
+        JSON response with the source entries as ``message``, an ETag and a
+        per-source Cache-Control header (304 when the ETag still matches)
+    """
+    features = get_enabled_features_for_user()
+    if not features.get("command_palette"):
+        frappe.throw(_("Command palette feature is disabled"), frappe.PermissionError)
+
+    if source not in SOURCE_FEATURES:
+        frappe.throw(_("Unknown command palette source: {0}").format(source))
+
+    feature = SOURCE_FEATURES[source]
+    if feature and not features.get(feature):
+        frappe.throw(
+            _("Command palette source {0} is disabled").format(source), frappe.PermissionError
+        )
+
+    body = frappe.as_json({"message": build_source(source)}, indent=None, separators=(",", ":"))
+    headers = {
+        "Cache-Control": SOURCE_CACHE_CONTROL[source],
+        "ETag": f'"{sha1(body.encode()).hexdigest()}"',
+        "Vary": "Cookie",
+    }
+    if frappe.get_request_header("If-None-Match") == headers["ETag"]:
+        return Response(status=304, headers=headers)
+
+    return Response(body, content_type="application/json", headers=headers)
+
+
+@frappe.whitelist(methods=["GET"])
+@instrument("command_palette")
+def search_command_palette(query: str, limit: int = 20) -> list[dict[str, Any]]:
+    """
+    Rank the entries of every enabled source against a fuzzy query.
+
+    Used by the browser when the palette holds too many entries to rank locally.
+
+    Args:
+        query: Text typed into the palette
+        limit: Maximum number of entries (capped at MAX_SEARCH_RESULTS)
+
+    Returns:
+        Best matching entries first, each with its ``source`` and ``score``
+    """
+    features = get_enabled_features_for_user()
+    if not features.get("command_palette"):
+        frappe.throw(_("Command palette feature is disabled"), frappe.PermissionError)
+
+    limit = max(1, min(cint(limit) or 20, MAX_SEARCH_RESULTS))
+    ranked = []
+    for source, feature in SOURCE_FEATURES.items():
+        if feature and not features.get(feature):
+            continue
+        if source == "doctypes":
+            entries, index = get_catalog_index()
+        else:
+            entries = build_source(source)
+            index = FuzzyIndex(entry.get("label") or entry.get("value") or "" for entry in entries)
+        ranked.extend(
+            (value, {**entries[idx], "source": source, "score": round(value, 3)})
+            for value, idx in index.search(query, limit, boosts=_frecency_boosts(entries))
+        )
+
+    # Stable sort: equal scores keep the display order of sources.
+    ranked.sort(key=lambda pair: pair[0], reverse=True)
+    return [entry for _value, entry in ranked[:limit]]
+
+
+@frappe.whitelist(methods=["POST"])
+@instrument("command_palette")
+def record_visits(visits: str | list[dict[str, Any]]) -> dict[str, int]:
+    """Count a batch of desk page visits towards the user's frecency.
+
+    Each visit is ``{"route": path, "ts": unix_seconds}``. Malformed visits are
+    skipped rather than failing the batch; at most ``MAX_VISIT_BATCH`` visits
+    are accepted per call.
+    """
+    features = get_enabled_features_for_user()
+    if not features.get("command_palette"):
+        frappe.throw(_("Command palette feature is disabled"), frappe.PermissionError)
 
+    if isinstance(visits, str):
+        visits = json.loads(visits)
+    if not isinstance(visits, list):
+        frappe.throw(_("Visits must be a list."))
+
+    pairs = []
+    for visit in visits[: frecency.MAX_VISIT_BATCH]:
         try:
-            recent = hist_api.get_recent_activity(limit=10)
-            for item in recent.get("items", []):
-                sources["recent"].append(
-                    {
-                        "type": "recent",
-                        "label": item.get("title") or item.get("name"),
-                        "value": item.get("name"),
-                        "icon": "octicon octicon-history",
-                        "route": item.get("route"),
-                        "description": f"{item.get('doctype')} · {item.get('modified')}",
-                    }
-                )
-        except Exception:  # noqa: BLE001
-            pass
-
-    return sources
+            pairs.append((str(visit["route"]), float(visit.get("ts") or 0)))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            continue
+
+    accepted = frecency.record_visits(pairs)
+    return {"accepted": accepted, "rejected": len(visits) - accepted}
+
+
+def build_source(source: str) -> list[dict[str, Any]]:
+    """Return the entries of one palette source, most used first.
+
+    Entries the user opened recently or often carry their ``frecency`` boost;
+    failures yield an empty list.
+    """
+    try:
+        entries = _SOURCE_BUILDERS[source]()
+    except Exception:  # noqa: BLE001
+        return []
+
+    boosts = _frecency_boosts(entries)
+    if not boosts:
+        return entries
+    # Copies, since the DocType catalog is shared between requests.
+    entries = [
+        {**entry, "frecency": round(boosts[idx], 3)} if idx in boosts else entry
+        for idx, entry in enumerate(entries)
+    ]
+    entries.sort(key=lambda entry: entry.get("frecency", 0), reverse=True)
+    return entries
+
+
+def _frecency_boosts(entries: list[dict[str, Any]]) -> dict[int, float]:
+    return frecency.get_boosts(frecency.route_key(entry.get("route")) for entry in entries)
+
+
+def _doctype_entries() -> list[dict[str, Any]]:
+    return get_permitted_doctypes()
+
+
+def _saved_search_entries() -> list[dict[str, Any]]:
+    from desk_navbar_extended.api import saved_searches as ss_api
+
+    return [
+        {
+            "type": "saved_search",
+            "label": search["title"],
+            "value": search["name"],
+            "icon": "octicon octicon-search",
+            "description": search["query"],
+            "data": search,
+        }
+        for search in ss_api.list_saved_searches()
+    ]
+
+
+def _pin_entries() -> list[dict[str, Any]]:
+    from desk_navbar_extended.api import pins as pins_api
+
+    return [
+        {
+            "type": "pin",
+            "label": pin["label"],
+            "value": pin["name"],
+            "icon": pin.get("icon") or "octicon octicon-star",
+            "route": pin["route"],
+            "color": pin.get("color"),
+        }
+        for pin in pins_api.list_pins()
+    ]
+
+
+def _recent_entries() -> list[dict[str, Any]]:
+    from desk_navbar_extended.api import history as hist_api
+
+    recent = hist_api.get_recent_activity(limit=10)
+    return [
+        {
+            "type": "recent",
+            "label": item.get("title") or item.get("name"),
+            "value": item.get("name"),
+            "icon": "octicon octicon-history",
+            "route": item.get("route"),
+            "description": f"{item.get('doctype')} · {item.get('modified')}",
+        }
+        for item in recent.get("items", [])
+    ]
+
+
+def _quick_create_entries() -> list[dict[str, Any]]:
+    from desk_navbar_extended.api import quick_create as qc_api
+
+    return [
+        {
+            "type": "quick_create",
+            "label": f"New {opt['label']}",
+            "value": opt["doctype"],
+            "icon": opt.get("icon") or "octicon octicon-plus",
+            "route": opt["route"],
+            "description": f"Create new {opt['label']}",
+        }
+        for opt in qc_api.get_quick_create_options()
+    ]
+
+
+def _help_entries() -> list[dict[str, Any]]:
+    return []
+
+
+_SOURCE_BUILDERS = {
+    "doctypes": _doctype_entries,
+    "saved_searches": _saved_search_entries,
+    "pins": _pin_entries,
+    "recent": _recent_entries,
+    "quick_create": _quick_create_entries,
+    "help": _help_entries,
+}
@@ -10,9 +10,11 @@ from frappe import _
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.metrics.instrumentation import instrument
 
 
 @frappe.whitelist()
+@instrument("help_search")
 def search_help(query: str, limit: int = 10) -> list[dict[str, Any]]:
     """Search help documentation and user manual."""
     features = get_enabled_features_for_user()
@@ -8,78 +8,51 @@ from typing import Any
 import frappe
 from frappe import _
 
+from desk_navbar_extended import recent_docs, title_cache
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.metrics.instrumentation import instrument
 
 # get_datetime was removed because it's not used in this module
 
 
 @frappe.whitelist()
+@instrument("grouped_history")
 def get_recent_activity(limit: int = 20) -> dict[str, Any]:
-    """Get recent activity grouped by app/doctype."""
+    """Get recently opened or saved documents grouped by doctype.
+
+    Reads the user's recent documents buffer, newest first, instead of
+    scanning Activity Log.
+    """
     features = get_enabled_features_for_user()
     if not features.get("grouped_history"):
         frappe.throw(_("Grouped history feature is disabled"), frappe.PermissionError)
 
     limit = min(int(limit or 20), 100)
 
-    # Get recently accessed documents
-    recent_docs = frappe.get_all(
-        "Activity Log",
-        filters={
-            "user": frappe.session.user,
-            "status": "Success",
-            "operation": ["in", ["read", "save"]],
-        },
-        fields=["reference_doctype", "reference_name", "creation"],
-        order_by="creation desc",
-        limit=limit * 2,  # Get more to filter and group
-    )
+    # Get more to make up for documents the user can no longer read
+    entries = recent_docs.get_recent(limit * 2)
+
+    # Only documents the user can still read come back
+    titles = _get_titles(entries)
 
     # Group by doctype
     grouped = defaultdict(list)
-    seen = set()
-
-    for doc in recent_docs:
-        if not doc.reference_doctype or not doc.reference_name:
-            continue
-
-        # Skip duplicates
-        key = f"{doc.reference_doctype}::{doc.reference_name}"
-        if key in seen:
-            continue
-        seen.add(key)
-
-        # Check if user still has access
-        if not frappe.has_permission(doc.reference_doctype, "read"):
+    for doc in entries:
+        readable = titles.get(doc["doctype"], {})
+        if doc["name"] not in readable:
             continue
 
-        try:
-            # Get doc title
-            meta = frappe.get_meta(doc.reference_doctype)
-            title_field = meta.get_title_field()
-
-            if title_field:
-                title = frappe.db.get_value(
-                    doc.reference_doctype,
-                    doc.reference_name,
-                    title_field,
-                )
-            else:
-                title = doc.reference_name
-
-            grouped[doc.reference_doctype].append(
-                {
-                    "doctype": doc.reference_doctype,
-                    "name": doc.reference_name,
-                    "title": title or doc.reference_name,
-                    "modified": str(doc.creation),
-                    "route": f"/app/{frappe.scrub(doc.reference_doctype)}/{doc.reference_name}",
-                }
-            )
-        except Exception:  # noqa: BLE001
-            continue
+        grouped[doc["doctype"]].append(
+            {
+                "doctype": doc["doctype"],
+                "name": doc["name"],
+                "title": readable[doc["name"]],
+                "modified": str(doc["timestamp"]),
+                "route": f"/app/{frappe.scrub(doc['doctype'])}/{doc['name']}",
+            }
+        )
 
     # Build grouped response
     groups = []
@@ -107,3 +80,37 @@ def get_recent_activity(limit: int = 20) -> dict[str, Any]:
         "groups": groups[:10],  # Limit to 10 groups
         "items": all_items[:limit],  # Flat list limited
     }
+
+
+def _get_titles(entries: list[dict[str, Any]]) -> dict[str, dict[str, str]]:
+    """Return ``{doctype: {name: title}}`` for the documents the user can still read.
+
+    Permission is checked once per doctype, and one ``get_list`` of names per
+    doctype applies user permissions and permission query conditions, so
+    deleted or no longer shared documents drop out. Titles come from the
+    shared title cache. DocTypes that cannot be read (e.g. dropped tables)
+    are omitted.
+    """
+    names_by_doctype = defaultdict(list)
+    for doc in entries:
+        names_by_doctype[doc["doctype"]].append(doc["name"])
+
+    readable = []
+    for doctype, names in names_by_doctype.items():
+        try:
+            if not frappe.has_permission(doctype, "read"):
+                continue
+            permitted = frappe.get_list(
+                doctype,
+                filters={"name": ["in", names]},
+                pluck="name",
+                limit=len(names),
+            )
+        except Exception:  # noqa: BLE001
+            continue
+        readable.extend((doctype, name) for name in permitted)
+
+    titles = defaultdict(dict)
+    for (doctype, name), title in title_cache.get_titles(readable).items():
+        titles[doctype][name] = title
+    return titles
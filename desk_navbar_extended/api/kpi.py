@@ -11,9 +11,11 @@ from frappe.utils import flt
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.metrics.instrumentation import instrument
 
 
 @frappe.whitelist()
+@instrument("kpi_widgets", timed=True)
 def get_kpi_data() -> list[dict[str, Any]]:
     """Get KPI widget data based on user roles and permissions."""
     features = get_enabled_features_for_user()
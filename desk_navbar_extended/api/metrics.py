@@ -0,0 +1,118 @@
+"""Search analytics, API timing and Prometheus reporting API."""
+
+from __future__ import annotations
+
+import hmac
+import math
+from typing import Any
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime, now_datetime
+from frappe.utils.password import get_decrypted_password
+from werkzeug.wrappers import Response
+
+from desk_navbar_extended.metrics import exposition, registry
+from desk_navbar_extended.metrics.instrumentation import (
+    DB_QUERIES_METRIC,
+    DB_TIME_METRIC,
+    DURATION_METRIC,
+    ERRORS_METRIC,
+    instrument,
+)
+from desk_navbar_extended.metrics.rollups import summarize_range
+
+SETTINGS_DOCTYPE = "Desk Navbar Extended Settings"
+
+
+@frappe.whitelist()
+@instrument()
+def get_search_latency(start: str, end: str | None = None) -> dict[str, Any]:
+    """
+    Return search latency percentiles for a time range.
+
+    Args:
+        start: Range start (datetime string, inclusive)
+        end: Range end (datetime string, exclusive; defaults to now)
+
+    Returns:
+        dict with count, errors, error_rate, mean_ms, max_ms and p50/p95/p99
+    """
+    frappe.only_for("System Manager")
+
+    start_dt = get_datetime(start)
+    end_dt = get_datetime(end) if end else now_datetime()
+    if end_dt <= start_dt:
+        frappe.throw(_("End must be after start"))
+
+    return summarize_range(start_dt, end_dt)
+
+
+@frappe.whitelist()
+@instrument()
+def get_api_stats() -> list[dict[str, Any]]:
+    """
+    Return aggregated timings of instrumented endpoints.
+
+    Returns:
+        list of dicts with endpoint, feature, calls, errors, mean_ms, p95_ms,
+        mean_queries and mean_db_ms (None for calls timed while instrumentation
+        was off), slowest endpoints first
+    """
+    frappe.only_for("System Manager")
+
+    snapshot = registry.snapshot()
+    histograms = snapshot["histograms"]
+    stats = []
+    for key, duration in histograms.items():
+        if key[0] != DURATION_METRIC or not duration["count"]:
+            continue
+        calls = duration["count"]
+        queries = histograms.get((DB_QUERIES_METRIC, key[1]), {})
+        db_time = histograms.get((DB_TIME_METRIC, key[1]), {})
+        errors = snapshot["counters"].get((ERRORS_METRIC, key[1]), {})
+        p95 = registry.quantile_from_buckets(duration["buckets"], 0.95)
+        stats.append(
+            {
+                **registry.labels_of(key),
+                "calls": int(calls),
+                "errors": int(errors.get("value", 0)),
+                "mean_ms": round(duration["sum"] / calls, 2),
+                # None when the 95th percentile overflows the largest bucket.
+                "p95_ms": None if p95 == math.inf else p95,
+                "mean_queries": _mean(queries),
+                "mean_db_ms": _mean(db_time),
+            }
+        )
+
+    return sorted(stats, key=lambda row: row["mean_ms"], reverse=True)
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_prometheus_metrics(token: str | None = None) -> Response:
+    """
+    Return navbar metrics in Prometheus text exposition format.
+
+    The scraper authenticates with the Metrics Token from Desk Navbar Extended
+    Settings, sent as ``Authorization: Bearer <token>`` or a ``token`` query
+    parameter. The endpoint is disabled while no token is configured.
+
+    Args:
+        token: Metrics token (when not sent in the Authorization header)
+    """
+    expected = get_decrypted_password(
+        SETTINGS_DOCTYPE, SETTINGS_DOCTYPE, "metrics_token", raise_exception=False
+    )
+    header = frappe.get_request_header("Authorization") or ""
+    if header.lower().startswith("bearer "):
+        token = header[len("bearer ") :].strip()
+
+    if not expected or not token or not hmac.compare_digest(token.encode(), expected.encode()):
+        frappe.throw(_("Invalid metrics token"), frappe.AuthenticationError)
+
+    return Response(exposition.render(registry.snapshot()), content_type=exposition.CONTENT_TYPE)
+
+
+def _mean(histogram: dict[str, Any]) -> float | None:
+    count = histogram.get("count")
+    return round(histogram["sum"] / count, 2) if count else None
@@ -10,9 +10,11 @@ from frappe import _
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.metrics.instrumentation import instrument
 
 
 @frappe.whitelist()
+@instrument("notifications_center", timed=True)
 def get_notifications(limit: int = 20) -> dict[str, Any]:
     """Get notifications for current user."""
     features = get_enabled_features_for_user()
@@ -44,6 +46,7 @@ def get_notifications(limit: int = 20) -> dict[str, Any]:
 
 
 @frappe.whitelist()
+@instrument("notifications_center", timed=True)
 def mark_as_read(names: str | list[str]) -> dict[str, str]:
     """Mark notifications as read."""
     features = get_enabled_features_for_user()
@@ -55,15 +58,22 @@ def mark_as_read(names: str | list[str]) -> dict[str, str]:
 
         names = json.loads(names)
 
-    for name in names:
-        doc = frappe.get_doc("Notification Log", name)
-        if doc.for_user == frappe.session.user:
-            doc.db_set("read", 1, update_modified=False)
+    if names:
+        # Notifications of other users are left untouched
+        frappe.db.sql(
+            """
+            UPDATE `tabNotification Log`
+            SET `read` = 1
+            WHERE `name` IN %s AND `for_user` = %s
+            """,
+            (tuple(names), frappe.session.user),
+        )
 
     return {"status": "success", "count": len(names)}
 
 
 @frappe.whitelist()
+@instrument("notifications_center", timed=True)
 def mark_all_as_read() -> dict[str, str]:
     """Mark all notifications as read for current user."""
     features = get_enabled_features_for_user()
@@ -11,9 +11,11 @@ from frappe import _
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.metrics.instrumentation import instrument
 
 
 @frappe.whitelist()
+@instrument("pins")
 def list_pins() -> list[dict[str, Any]]:
     """List pins for current user."""
     features = get_enabled_features_for_user()
@@ -31,6 +33,7 @@ def list_pins() -> list[dict[str, Any]]:
 
 
 @frappe.whitelist()
+@instrument("pins")
 def create_pin(payload: str | dict[str, Any]) -> dict[str, Any]:
     """Create a new pin."""
     features = get_enabled_features_for_user()
@@ -68,6 +71,7 @@ def create_pin(payload: str | dict[str, Any]) -> dict[str, Any]:
 
 
 @frappe.whitelist()
+@instrument("pins")
 def delete_pin(name: str) -> dict[str, str]:
     """Delete a pin."""
     features = get_enabled_features_for_user()
@@ -86,8 +90,17 @@ def delete_pin(name: str) -> dict[str, str]:
 
 
 @frappe.whitelist()
-def reorder_pins(payload: str | dict[str, Any]) -> dict[str, str]:
-    """Reorder pins by updating sequence."""
+@instrument("pins")
+def reorder_pins(payload: str | dict[str, Any]) -> dict[str, Any]:
+    """Reorder pins by updating sequence.
+
+    Args:
+        payload: ``{"pins": [{"name": "DNP-0001", "sequence": 1}, ...]}``.
+
+    Returns:
+        The number of pins reordered and the names that were rejected: pins
+        that do not exist, belong to another user or come without a sequence.
+    """
     features = get_enabled_features_for_user()
     if not features.get("pins"):
         frappe.throw(_("Pins feature is disabled"), frappe.PermissionError)
@@ -97,24 +110,52 @@ def reorder_pins(payload: str | dict[str, Any]) -> dict[str, str]:
     else:
         data = payload
 
-    # Expect format: {"pins": [{"name": "DNP-0001", "sequence": 1}, ...]}
     pins_data = data.get("pins", [])
     if not pins_data:
         frappe.throw(_("Pins data is required"))
 
+    sequences: dict[str, int] = {}
+    rejected: list[str] = []
     for pin_data in pins_data:
         name = pin_data.get("name")
-        sequence = pin_data.get("sequence")
-
-        if not name or sequence is None:
+        if not name:
             continue
-
-        doc = frappe.get_doc("Desk Navbar Pin", name)
-
-        # Check ownership
-        if doc.owner != frappe.session.user:
+        if pin_data.get("sequence") is None:
+            rejected.append(name)
             continue
-
-        doc.db_set("sequence", sequence, update_modified=False)
-
-    return {"status": "reordered", "count": len(pins_data)}
+        if name in sequences:
+            frappe.throw(_("Pin {0} appears more than once").format(name))
+        try:
+            sequences[name] = int(pin_data["sequence"])
+        except (TypeError, ValueError):
+            frappe.throw(_("Sequence of pin {0} must be an integer").format(name))
+
+    if len(set(sequences.values())) < len(sequences):
+        frappe.throw(_("Each pin needs its own sequence"))
+
+    owned: list[str] = []
+    if sequences:
+        # Lock the caller's pins so they cannot change hands before the update
+        owned = frappe.get_all(
+            "Desk Navbar Pin",
+            filters={"name": ["in", list(sequences)], "owner": frappe.session.user},
+            pluck="name",
+            for_update=True,
+        )
+    owned_names = set(owned)
+    rejected.extend(name for name in sequences if name not in owned_names)
+
+    if owned:
+        # One statement for every sequence; the owner check is repeated in SQL
+        whens = " ".join(["WHEN %s THEN %s"] * len(owned))
+        values = [value for name in owned for value in (name, sequences[name])]
+        frappe.db.sql(
+            f"""
+            UPDATE `tabDesk Navbar Pin`
+            SET `sequence` = CASE `name` {whens} ELSE `sequence` END
+            WHERE `owner` = %s AND `name` IN %s
+            """,
+            (*values, frappe.session.user, tuple(owned)),
+        )
+
+    return {"status": "reordered", "count": len(owned), "rejected": rejected}
@@ -11,9 +11,11 @@ from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_sett
     get_enabled_features_for_user,
     get_settings_doc,
 )
+from desk_navbar_extended.metrics.instrumentation import instrument
 
 
 @frappe.whitelist()
+@instrument("quick_create")
 def get_quick_create_options() -> list[dict[str, Any]]:
     """Get quick create options based on user permissions."""
     features = get_enabled_features_for_user()
@@ -11,9 +11,11 @@ from frappe import _
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.metrics.instrumentation import instrument
 
 
 @frappe.whitelist()
+@instrument("saved_searches")
 def list_saved_searches() -> list[dict[str, Any]]:
     """List saved searches for current user + global searches."""
     features = get_enabled_features_for_user()
@@ -61,6 +63,7 @@ def list_saved_searches() -> list[dict[str, Any]]:
 
 
 @frappe.whitelist()
+@instrument("saved_searches")
 def create_saved_search(payload: str | dict[str, Any]) -> dict[str, Any]:
     """Create a new saved search."""
     features = get_enabled_features_for_user()
@@ -101,6 +104,7 @@ def create_saved_search(payload: str | dict[str, Any]) -> dict[str, Any]:
 
 
 @frappe.whitelist()
+@instrument("saved_searches")
 def update_saved_search(name: str, payload: str | dict[str, Any]) -> dict[str, Any]:
     """Update an existing saved search."""
     features = get_enabled_features_for_user()
@@ -150,6 +154,7 @@ def update_saved_search(name: str, payload: str | dict[str, Any]) -> dict[str, A
 
 
 @frappe.whitelist()
+@instrument("saved_searches")
 def delete_saved_search(name: str) -> dict[str, str]:
     """Delete a saved search."""
     features = get_enabled_features_for_user()
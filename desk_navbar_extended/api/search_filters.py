@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import base64
+import heapq
+import json
+from datetime import datetime
+from hashlib import sha1
 from typing import Any
 
 import frappe
@@ -9,12 +14,28 @@ from frappe import _
 from frappe.desk.search import search_link
 from frappe.utils import cint, get_datetime, now_datetime
 
+from desk_navbar_extended import frecency, title_cache
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
+    get_cached_settings,
     get_enabled_features_for_user,
 )
+from desk_navbar_extended.metrics import registry
+from desk_navbar_extended.metrics.instrumentation import instrument
+from desk_navbar_extended.search import result_cache
+from desk_navbar_extended.search.fanout import DEFAULT_DEADLINE_MS, DEFAULT_MAX_WORKERS, fan_out
+from desk_navbar_extended.search.index import (
+    escape_like,
+    get_search_columns,
+    get_search_doctypes,
+    search_index,
+)
+
+# Unfiltered global searches keep the awesomebar mixed across doctypes.
+GLOBAL_RESULTS_PER_DOCTYPE = 5
 
 
 @frappe.whitelist()
+@instrument("smart_filters")
 def search_with_filters(
     query: str,
     doctype: str | None = None,
@@ -52,145 +73,46 @@ def search_with_filters(
     filters = {}
     start_time = now_datetime()
 
-    def normalize_results(
-        raw_results: list[dict[str, Any]], result_doctype: str | None
-    ) -> list[dict[str, Any]]:
-        normalized: list[dict[str, Any]] = []
-        for item in raw_results:
-            docname = item.get("name") or item.get("value")
-            normalized.append(
-                {
-                    **item,
-                    "name": docname,
-                    "value": docname,
-                    "doctype": result_doctype or item.get("doctype"),
-                }
-            )
-        return normalized
-
     try:
-        if doctype:
-            # Validate doctype exists and user has permission
-            if not frappe.db.exists("DocType", doctype):
-                frappe.throw(_("DocType {0} does not exist").format(doctype))
-
-            if not frappe.has_permission(doctype, "read"):
-                frappe.throw(
-                    _("Insufficient permissions for DocType {0}").format(doctype),
-                    frappe.PermissionError,
-                )
-
-            # Use search_link for specific doctype
-            results = normalize_results(
-                search_link(
-                    doctype=doctype,
-                    txt=query,
-                    page_length=limit,
-                ),
+        created_from = get_datetime(date_from) if date_from else None
+        created_to = get_datetime(date_to) if date_to else None
+
+        scope = _resolve_scope(doctype)
+
+        # Writes to doctypes outside global search do not invalidate the cache.
+        cache_key = None
+        if result_cache.is_cacheable(scope):
+            cache_key = result_cache.make_key(
+                query=query,
+                doctype=doctype,
+                scope=scope,
+                owner=owner,
+                date_from=date_from,
+                date_to=date_to,
+                limit=limit,
+            )
+        results = result_cache.get(cache_key) if cache_key else None
+        cached = results is not None
+        breakdown: dict[str, dict[str, Any]] = {}
+        if not cached:
+            results, breakdown = _run_search(
+                query,
                 doctype,
+                scope,
+                owner,
+                created_from,
+                created_to,
+                limit,
+                use_index=bool(features.get("search_index")),
             )
-
-            # Apply additional filters if provided
-            if owner or date_from or date_to:
-                filtered_results = []
-                for result in results:
-                    doc_name = result.get("name") or result.get("value")
-                    if not doc_name:
-                        continue
-
-                    try:
-                        doc = frappe.get_doc(doctype, doc_name)
-
-                        # Owner filter
-                        if owner and doc.owner != owner:
-                            continue
-
-                        # Date filters
-                        if date_from or date_to:
-                            doc_date = get_datetime(doc.creation)
-                            if date_from:
-                                date_from_dt = get_datetime(date_from)
-                                if doc_date < date_from_dt:
-                                    continue
-                            if date_to:
-                                date_to_dt = get_datetime(date_to)
-                                if doc_date > date_to_dt:
-                                    continue
-
-                        filtered_results.append(result)
-                    except Exception:  # noqa: BLE001
-                        continue
-
-                results = filtered_results[:limit]
-        else:
-            # Global search - search across common doctypes
-            results = []
-            common_doctypes = ["User", "Note", "ToDo", "Event", "Task"]
-
-            for dt in common_doctypes:
-                if frappe.has_permission(dt, "read"):
-                    try:
-                        dt_results = normalize_results(
-                            search_link(
-                                doctype=dt,
-                                txt=query,
-                                page_length=5,  # Limit per doctype
-                            ),
-                            dt,
-                        )
-                        results.extend(dt_results)
-                        if len(results) >= limit:
-                            break
-                    except Exception:  # noqa: BLE001
-                        continue
-
-            results = results[:limit]
-
-            # Apply owner/date filters if specified
-            if owner or date_from or date_to:
-                filtered_results = []
-                for result in results:
-                    try:
-                        dt = result.get("doctype")
-                        dn = result.get("name") or result.get("value")
-                        if not dt or not dn:
-                            continue
-
-                        doc = frappe.get_doc(dt, dn)
-
-                        if owner and doc.owner != owner:
-                            continue
-
-                        if date_from or date_to:
-                            doc_date = get_datetime(doc.creation)
-                            if date_from:
-                                date_from_dt = get_datetime(date_from)
-                                if doc_date < date_from_dt:
-                                    continue
-                            if date_to:
-                                date_to_dt = get_datetime(date_to)
-                                if doc_date > date_to_dt:
-                                    continue
-
-                        filtered_results.append(result)
-                    except Exception:  # noqa: BLE001
-                        continue
-
-                results = filtered_results[:limit]
+            # Partial pages are not cached, so the next request can complete them.
+            if cache_key and not any(entry["timed_out"] for entry in breakdown.values()):
+                result_cache.set(cache_key, results)
+        # After the cache, which is shared by every user with the same scope.
+        results = _with_titles(_rank_by_frecency(results))
 
         execution_ms = (now_datetime() - start_time).total_seconds() * 1000
-
-        # Log metrics if analytics enabled
-        from desk_navbar_extended import api as main_api
-
-        if features.get("usage_analytics"):
-            main_api.log_search_metrics(
-                {
-                    "search_length": len(query),
-                    "execution_ms": execution_ms,
-                    "status": "success",
-                }
-            )
+        _log_search(features, query, execution_ms)
 
         return {
             "results": results,
@@ -203,23 +125,400 @@ def search_with_filters(
             },
             "count": len(results),
             "execution_ms": execution_ms,
+            "cached": cached,
+            "partial": any(entry["timed_out"] for entry in breakdown.values()),
+            "breakdown": breakdown,
         }
 
     except frappe.PermissionError:
         raise
     except Exception as exc:  # noqa: BLE001
         frappe.logger("desk_navbar_extended").error(f"Search error: {str(exc)}", exc_info=True)
+        _log_search(
+            features,
+            query,
+            (now_datetime() - start_time).total_seconds() * 1000,
+            error=str(exc),
+        )
+        frappe.throw(_("Search failed: {0}").format(str(exc)))
+
+
+@frappe.whitelist()
+@instrument("smart_filters")
+def search_with_cursor(
+    query: str,
+    doctype: str | None = None,
+    owner: str | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """
+    Search with filters, one page at a time.
 
-        if features.get("usage_analytics"):
-            from desk_navbar_extended import api as main_api
+    Pages walk the matches by last modification, newest first, and documents
+    the user opens often or recently move to the front of their page. Each
+    response carries an opaque ``cursor`` holding the last ``(modified, name)``
+    key returned per doctype; passing it back continues after that key, so
+    every page costs the same as the first.
 
-            main_api.log_search_metrics(
-                {
-                    "search_length": len(query),
-                    "execution_ms": (now_datetime() - start_time).total_seconds() * 1000,
-                    "status": "error",
-                    "error_message": str(exc)[:140],
-                }
+    Args:
+        query: Search query string
+        doctype: Optional DocType filter
+        owner: Optional owner filter (email)
+        date_from: Optional start date (ISO format)
+        date_to: Optional end date (ISO format)
+        limit: Page size (default 20, max 100)
+        cursor: Token from the previous page, omitted for the first page
+
+    Returns:
+        dict with results, the next cursor (None when exhausted) and metadata
+    """
+    features = get_enabled_features_for_user()
+    if not features.get("smart_filters"):
+        frappe.throw(_("Smart filters feature is disabled"), frappe.PermissionError)
+
+    if not query or not query.strip():
+        frappe.throw(_("Search query is required"))
+
+    query = query.strip()
+    limit = min(cint(limit) or 20, 100)
+    start_time = now_datetime()
+    filters = {"doctype": doctype, "owner": owner, "date_from": date_from, "date_to": date_to}
+    fingerprint = _cursor_fingerprint(query, filters)
+    position = _decode_cursor(cursor, fingerprint) if cursor else {"after": {}, "done": []}
+
+    try:
+        created_from = get_datetime(date_from) if date_from else None
+        created_to = get_datetime(date_to) if date_to else None
+        scope = [dt for dt in _resolve_scope(doctype) if dt not in position["done"]]
+
+        pages: dict[str, list[dict[str, Any]]] = {}
+        for dt in scope:
+            after = position["after"].get(dt)
+            try:
+                pages[dt] = _normalize_results(
+                    _filtered_search(
+                        dt,
+                        query,
+                        owner,
+                        created_from,
+                        created_to,
+                        limit,
+                        after=tuple(after) if after else None,
+                    ),
+                    dt,
+                )
+            except frappe.PermissionError:
+                raise
+            except Exception:  # noqa: BLE001
+                if doctype:
+                    raise
+                pages[dt] = []
+
+        results = list(
+            heapq.merge(
+                *pages.values(),
+                key=lambda row: (str(row["modified"]), row["name"]),
+                reverse=True,
             )
+        )[:limit]
+
+        after = dict(position["after"])
+        done = list(position["done"])
+        taken: dict[str, int] = {}
+        for row in results:
+            taken[row["doctype"]] = taken.get(row["doctype"], 0) + 1
+            after[row["doctype"]] = [str(row["modified"]), row["name"]]
+        for dt, rows in pages.items():
+            # Fewer rows than asked for, all of them consumed: nothing is left.
+            if len(rows) < limit and taken.get(dt, 0) == len(rows):
+                done.append(dt)
+                after.pop(dt, None)
+
+        has_more = any(dt not in done for dt in scope)
+        execution_ms = (now_datetime() - start_time).total_seconds() * 1000
+        _log_search(features, query, execution_ms)
 
+        return {
+            # Ranked after the keys above are taken, so the cursor is unaffected.
+            "results": _with_titles(_rank_by_frecency(results)),
+            "query": query,
+            "filters": filters,
+            "count": len(results),
+            "cursor": _encode_cursor(fingerprint, after, done) if has_more else None,
+            "has_more": has_more,
+            "execution_ms": execution_ms,
+        }
+
+    except frappe.PermissionError:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        frappe.logger("desk_navbar_extended").error(f"Search error: {str(exc)}", exc_info=True)
+        _log_search(
+            features,
+            query,
+            (now_datetime() - start_time).total_seconds() * 1000,
+            error=str(exc),
+        )
         frappe.throw(_("Search failed: {0}").format(str(exc)))
+
+
+def _resolve_scope(doctype: str | None) -> list[str]:
+    """Return the doctypes a search covers, validating an explicit ``doctype``."""
+    if not doctype:
+        return [dt for dt in get_search_doctypes() if frappe.has_permission(dt, "read")]
+
+    # Validate doctype exists and user has permission
+    if not frappe.db.exists("DocType", doctype):
+        frappe.throw(_("DocType {0} does not exist").format(doctype))
+
+    if not frappe.has_permission(doctype, "read"):
+        frappe.throw(
+            _("Insufficient permissions for DocType {0}").format(doctype),
+            frappe.PermissionError,
+        )
+    return [doctype]
+
+
+def _log_search(
+    features: dict[str, bool], query: str, execution_ms: float, error: str | None = None
+) -> None:
+    """Record search latency, and a search metric when usage analytics are enabled."""
+    status = "error" if error else "success"
+    registry.observe("search_latency_ms", execution_ms, {"status": status})
+    if error:
+        registry.inc("search_errors")
+    if not features.get("usage_analytics"):
+        return
+
+    from desk_navbar_extended import api as main_api
+
+    metric = {
+        "search_length": len(query),
+        "execution_ms": execution_ms,
+        "status": status,
+    }
+    if error:
+        metric["error_message"] = error[:140]
+    main_api.log_search_metrics(metric)
+
+
+def _cursor_fingerprint(query: str, filters: dict[str, Any]) -> str:
+    payload = json.dumps([query.lower(), filters], sort_keys=True, default=str)
+    return sha1(payload.encode()).hexdigest()[:16]
+
+
+def _encode_cursor(fingerprint: str, after: dict[str, list[str]], done: list[str]) -> str:
+    payload = json.dumps({"f": fingerprint, "after": after, "done": done}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> dict[str, Any]:
+    """Decode a continuation token, rejecting tokens issued for another search."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        after = {
+            str(dt): [str(key[0]), str(key[1])] for dt, key in (payload.get("after") or {}).items()
+        }
+        done = [str(dt) for dt in payload.get("done") or []]
+    except (ValueError, TypeError, AttributeError, IndexError):
+        frappe.throw(_("Invalid search cursor"))
+
+    if payload.get("f") != fingerprint:
+        frappe.throw(_("Search cursor does not match the query or filters"))
+    return {"after": after, "done": done}
+
+
+def _rank_by_frecency(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Move documents the user opens often or recently to the front.
+
+    The sort is stable, so the relevance order holds among the rest.
+    """
+    boosts = frecency.get_boosts(
+        frecency.doc_key(item["doctype"], item["name"])
+        if item.get("doctype") and item.get("name")
+        else None
+        for item in results
+    )
+    if not boosts:
+        return results
+    order = sorted(range(len(results)), key=lambda idx: boosts.get(idx, 0.0), reverse=True)
+    return [results[idx] for idx in order]
+
+
+def _with_titles(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Fill in ``title`` from the shared title cache where the search left it out."""
+    pairs = [
+        (item["doctype"], item["name"])
+        for item in results
+        if not item.get("title") and item.get("doctype") and item.get("name")
+    ]
+    if not pairs:
+        return results
+    titles = title_cache.get_titles(pairs)
+    filled = []
+    for item in results:
+        pair = (item.get("doctype"), item.get("name"))
+        filled.append(item if item.get("title") else {**item, "title": titles.get(pair)})
+    return filled
+
+
+def _normalize_results(
+    raw_results: list[dict[str, Any]], result_doctype: str | None
+) -> list[dict[str, Any]]:
+    normalized: list[dict[str, Any]] = []
+    for item in raw_results:
+        docname = item.get("name") or item.get("value")
+        normalized.append(
+            {
+                **item,
+                "name": docname,
+                "value": docname,
+                "doctype": result_doctype or item.get("doctype"),
+            }
+        )
+    return normalized
+
+
+def _run_search(
+    query: str,
+    doctype: str | None,
+    scope: list[str],
+    owner: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    limit: int,
+    use_index: bool = False,
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Execute an uncached search over the permitted doctypes in ``scope``.
+
+    Returns the results and, for a fanned-out global search, the per-doctype
+    ``ms``/``timed_out`` breakdown (empty otherwise).
+    """
+    if doctype:
+        return _search_doctype(doctype, query, owner, created_from, created_to, limit), {}
+
+    if use_index:
+        # Global search - one ranked lookup in the navbar search index
+        results = search_index(
+            query,
+            scope,
+            owner=owner,
+            created_from=created_from,
+            created_to=created_to,
+            limit=limit,
+        )
+        return results, {}
+
+    # Global search - query the configured doctypes concurrently under a deadline
+    settings = get_cached_settings()
+    pages, breakdown = fan_out(
+        _search_doctype,
+        scope,
+        query,
+        owner,
+        created_from,
+        created_to,
+        limit,
+        per_doctype_limit=GLOBAL_RESULTS_PER_DOCTYPE,
+        deadline_ms=cint(settings.get("search_deadline_ms")) or DEFAULT_DEADLINE_MS,
+        max_workers=cint(settings.get("search_max_workers")) or DEFAULT_MAX_WORKERS,
+    )
+    results = [row for dt in scope for row in pages.get(dt, [])]
+    return results[:limit], breakdown
+
+
+def _search_doctype(
+    doctype: str,
+    query: str,
+    owner: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    limit: int,
+    per_doctype_limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Search a single doctype, applying owner/date predicates when given."""
+    if owner or created_from or created_to:
+        raw_results = _filtered_search(doctype, query, owner, created_from, created_to, limit)
+    else:
+        raw_results = search_link(
+            doctype=doctype,
+            txt=query,
+            page_length=per_doctype_limit or limit,
+        )
+    return _normalize_results(raw_results, doctype)
+
+
+def _filtered_search(
+    doctype: str,
+    query: str,
+    owner: str | None,
+    created_from: datetime | None,
+    created_to: datetime | None,
+    limit: int,
+    after: tuple[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    """Search one doctype with owner and creation predicates applied in SQL.
+
+    Issues a single permission-aware query regardless of how many rows match,
+    so the page is filled up to ``limit`` instead of being filtered afterwards.
+    Rows are ordered by ``(modified, name)`` descending; ``after`` resumes
+    strictly after such a key without scanning the rows before it.
+    """
+    if limit <= 0:
+        return []
+
+    meta = frappe.get_meta(doctype)
+    columns = get_search_columns(meta)
+    title_field = meta.get_title_field()
+    if title_field not in columns or title_field == "name":
+        title_field = None
+
+    pattern = f"%{escape_like(query)}%"
+    filters: list[list[Any]] = []
+    if owner:
+        filters.append(["owner", "=", owner])
+    if created_from:
+        filters.append(["creation", ">=", created_from])
+    if created_to:
+        filters.append(["creation", "<=", created_to])
+
+    def fetch(keyset: list[list[Any]], page_length: int) -> list[dict[str, Any]]:
+        return frappe.get_list(
+            doctype,
+            fields=list(dict.fromkeys([*columns, "modified"])),
+            filters=filters + keyset,
+            or_filters=[[column, "like", pattern] for column in columns],
+            order_by="modified desc, name desc",
+            limit_page_length=page_length,
+        )
+
+    if after:
+        # (modified, name) < after, split so each half is a plain indexed range.
+        last_modified, last_name = after
+        rows = fetch([["modified", "=", last_modified], ["name", "<", last_name]], limit)
+        if len(rows) < limit:
+            rows += fetch([["modified", "<", last_modified]], limit - len(rows))
+    else:
+        rows = fetch([], limit)
+
+    results = []
+    for row in rows:
+        description = ", ".join(
+            str(row.get(column))
+            for column in columns
+            if column not in ("name", title_field) and row.get(column)
+        )
+        results.append(
+            {
+                "value": row.name,
+                "label": row.get(title_field) if title_field else None,
+                "description": description,
+                "modified": row.modified,
+            }
+        )
+    return results
+
@@ -0,0 +1,426 @@
+"""Endpoint latency benchmark on seeded synthetic data.
+
+Two entry points:
+
+* ``bench --site <site> execute desk_navbar_extended.benchmarks.api.run
+  --kwargs "{'scales': [0.01, 0.1, 1], 'output': 'navbar-bench.json'}"``
+  seeds Activity Logs, Notification Logs, pins, saved searches, recent
+  documents and, when
+  ERPNext is installed, Sales Orders and Bins, then times every navbar
+  endpoint at each scale of :data:`FULL_SIZES`. Seeding is deterministic and
+  incremental, so larger scales only top up the smaller ones. Seeded rows are
+  removed afterwards unless ``keep`` is set.
+* ``python -m desk_navbar_extended.benchmarks.api baseline.json current.json``
+  diffs two result files and exits non-zero when an endpoint got slower than
+  the threshold or issues more queries than before.
+
+Every feature flag is switched on for the run and restored afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from desk_navbar_extended.benchmarks.search import BENCH_NAME_PREFIX, generate_titles, summarize
+
+FULL_SIZES = {
+    "Activity Log": 100_000,
+    "Notification Log": 50_000,
+    "Desk Navbar Pin": 1_000,
+    "Desk Navbar Saved Search": 10_000,
+    # Bounded per user by recent_docs.MAX_RECENT_DOCS.
+    "Desk Navbar Recent Document": 100,
+    "Sales Order": 50_000,
+    "Bin": 50_000,
+}
+DEFAULT_SCALES = (0.01, 0.1, 1.0)
+DEFAULT_THRESHOLD = 0.2
+INSERT_CHUNK_SIZE = 5_000
+OPTIONAL_DOCTYPES = ("Sales Order", "Bin")
+
+
+def bench_name(doctype: str, idx: int) -> str:
+    """Return the deterministic name of seeded row ``idx`` of ``doctype``."""
+    code = "".join(word[0] for word in doctype.split()).upper()
+    return f"{BENCH_NAME_PREFIX}{code}-{idx:08d}"
+
+
+def _activity_log(idx: int, rng: random.Random, ctx: dict[str, Any]) -> dict[str, Any]:
+    ref_doctype = rng.choice(("Desk Navbar Pin", "Desk Navbar Saved Search"))
+    return {
+        "user": ctx["user"] if rng.random() < 0.7 else "Guest",
+        "operation": rng.choice(("read", "read", "save", "login")),
+        "status": "Success",
+        "subject": f"Benchmark activity {idx}",
+        "reference_doctype": ref_doctype,
+        "reference_name": bench_name(ref_doctype, rng.randrange(ctx["sizes"][ref_doctype] or 1)),
+    }
+
+
+def _recent_document(idx: int, rng: random.Random, ctx: dict[str, Any]) -> dict[str, Any]:
+    ref_doctype = rng.choice(("Desk Navbar Pin", "Desk Navbar Saved Search"))
+    ref_idx = rng.randrange(ctx["sizes"][ref_doctype] or 1)
+    return {
+        "user": ctx["user"],
+        "reference_doctype": ref_doctype,
+        "reference_name": bench_name(ref_doctype, ref_idx),
+        "last_seen": ctx["now"] - timedelta(minutes=idx),
+    }
+
+
+def _notification_log(idx: int, rng: random.Random, ctx: dict[str, Any]) -> dict[str, Any]:
+    pins = ctx["sizes"]["Desk Navbar Pin"] or 1
+    return {
+        "for_user": ctx["user"] if rng.random() < 0.5 else "Guest",
+        "from_user": ctx["user"],
+        "type": rng.choice(("Alert", "Mention", "Assignment")),
+        "subject": f"Benchmark notification {idx}",
+        "document_type": "Desk Navbar Pin",
+        "document_name": bench_name("Desk Navbar Pin", idx % pins),
+        "read": int(rng.random() < 0.8),
+    }
+
+
+def _pin(idx: int, rng: random.Random, ctx: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "label": ctx["titles"][idx % len(ctx["titles"])],
+        "route": f"/app/todo/{idx}",
+        "icon": "octicon octicon-star",
+        "sequence": idx,
+    }
+
+
+def _saved_search(idx: int, rng: random.Random, ctx: dict[str, Any]) -> dict[str, Any]:
+    title = ctx["titles"][idx % len(ctx["titles"])]
+    return {
+        "title": title,
+        "query": title.split()[1].lower(),
+        "doctype_filter": rng.choice((None, "ToDo", "Note")),
+        "is_global": int(rng.random() < 0.1),
+        "filters_json": "{}",
+    }
+
+
+def _sales_order(idx: int, rng: random.Random, ctx: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "docstatus": rng.choice((0, 1, 1, 1)),
+        "status": rng.choice(("To Deliver and Bill", "Completed", "Closed")),
+        "transaction_date": (ctx["now"] - timedelta(days=rng.randrange(365))).date(),
+        "grand_total": round(rng.uniform(10, 10_000), 2),
+        "customer": f"{BENCH_NAME_PREFIX}Customer",
+    }
+
+
+def _bin(idx: int, rng: random.Random, ctx: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "item_code": f"{BENCH_NAME_PREFIX}ITEM-{idx:08d}",
+        "warehouse": f"{BENCH_NAME_PREFIX}Stores",
+        "actual_qty": rng.randrange(0, 500),
+        "projected_qty": rng.randrange(0, 500),
+    }
+
+
+GENERATORS: dict[str, Callable[[int, random.Random, dict[str, Any]], dict[str, Any]]] = {
+    "Desk Navbar Pin": _pin,
+    "Desk Navbar Saved Search": _saved_search,
+    "Activity Log": _activity_log,
+    "Desk Navbar Recent Document": _recent_document,
+    "Notification Log": _notification_log,
+    "Sales Order": _sales_order,
+    "Bin": _bin,
+}
+
+
+def seed_context(sizes: dict[str, int], seed_value: int = 42) -> dict[str, Any]:
+    """Return the generator context for rows owned by the session user.
+
+    ``sizes`` holds the row count of every seeded doctype, so generated
+    references only point at rows that exist.
+    """
+    import frappe
+    from frappe.utils import now_datetime
+
+    return {
+        "user": frappe.session.user,
+        "now": now_datetime(),
+        "titles": generate_titles(2_000, seed_value),
+        "sizes": sizes,
+    }
+
+
+def seed(doctype: str, start: int, stop: int, seed_value: int, ctx: dict[str, Any]) -> None:
+    """Insert seeded rows ``start`` to ``stop`` of ``doctype`` without controllers."""
+    import frappe
+
+    generator = GENERATORS[doctype]
+    fields = None
+    values = []
+    for idx in range(start, stop):
+        rng = random.Random(f"{seed_value}:{doctype}:{idx}")
+        row = generator(idx, rng, ctx)
+        # Newest rows first, one minute apart.
+        created = ctx["now"] - timedelta(minutes=idx)
+        row = {
+            "name": bench_name(doctype, idx),
+            "creation": created,
+            "modified": created,
+            "owner": ctx["user"],
+            "modified_by": ctx["user"],
+            **row,
+        }
+        fields = fields or list(row)
+        values.append([row[field] for field in fields])
+        if len(values) >= INSERT_CHUNK_SIZE:
+            frappe.db.bulk_insert(doctype, fields, values)
+            values = []
+    if values:
+        frappe.db.bulk_insert(doctype, fields, values)
+    frappe.db.commit()
+    _reload_recent_docs(doctype, ctx["user"])
+
+
+def cleanup(doctypes: list[str]) -> None:
+    """Delete every seeded row."""
+    import frappe
+
+    for doctype in doctypes:
+        frappe.db.delete(doctype, {"name": ["like", f"{BENCH_NAME_PREFIX}%"]})
+    frappe.db.commit()
+    for doctype in doctypes:
+        _reload_recent_docs(doctype, frappe.session.user)
+
+
+def _reload_recent_docs(doctype: str, user: str) -> None:
+    """Make the next history read reload the user's buffer from the seeded table."""
+    from desk_navbar_extended import recent_docs
+
+    if doctype == recent_docs.RECENT_DOCTYPE:
+        recent_docs.clear_buffer(user)
+
+
+def endpoints() -> dict[str, tuple[Callable, dict[str, Any], Callable | None]]:
+    """Return ``{label: (endpoint, kwargs, before_each)}`` for every timed endpoint."""
+    from desk_navbar_extended.api import (
+        command_palette,
+        history,
+        kpi,
+        notifications,
+        pins,
+        saved_searches,
+        search_filters,
+    )
+    from desk_navbar_extended.cache import bump_cache_version
+    from desk_navbar_extended.search.result_cache import doctype_version_name
+
+    def cold_search_cache():
+        bump_cache_version(doctype_version_name("Desk Navbar Saved Search"))
+
+    return {
+        "get_recent_activity": (history.get_recent_activity, {"limit": 20}, None),
+        "get_command_palette_sources": (command_palette.get_command_palette_sources, {}, None),
+        "search_with_filters": (
+            search_filters.search_with_filters,
+            {"query": "ac", "doctype": "Desk Navbar Saved Search"},
+            cold_search_cache,
+        ),
+        "get_kpi_data": (kpi.get_kpi_data, {}, None),
+        "get_notifications": (notifications.get_notifications, {"limit": 20}, None),
+        "list_pins": (pins.list_pins, {}, None),
+        "list_saved_searches": (saved_searches.list_saved_searches, {}, None),
+    }
+
+
+def time_endpoint(
+    func: Callable, kwargs: dict[str, Any], before: Callable | None, repeat: int
+) -> dict[str, Any]:
+    """Return latency percentiles and the query count of ``func(**kwargs)``."""
+    from desk_navbar_extended.metrics.instrumentation import QueryCounter
+
+    samples: list[float] = []
+    queries = 0
+    # The first call warms metadata and settings caches and is not measured.
+    for iteration in range(repeat + 1):
+        if before:
+            before()
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with counter:
+            func(**kwargs)
+        if iteration:
+            samples.append((time.perf_counter() - started) * 1000)
+            queries = max(queries, counter.queries)
+
+    stats = summarize(samples, 0, 0)
+    stats.pop("recall")
+    stats["mean_ms"] = round(sum(samples) / len(samples), 3)
+    stats["queries"] = queries
+    return stats
+
+
+def run(
+    scales: str | list[float] = DEFAULT_SCALES,
+    repeat: int = 20,
+    seed_value: int = 42,
+    output: str | None = None,
+    keep: bool = False,
+) -> dict[str, Any]:
+    """Seed synthetic data and time every endpoint at each scale of :data:`FULL_SIZES`."""
+    import frappe
+
+    if isinstance(scales, str):
+        scales = [float(scale) for scale in scales.split(",")]
+    repeat, seed_value = int(repeat), int(seed_value)
+
+    doctypes = [
+        doctype
+        for doctype in GENERATORS
+        if doctype not in OPTIONAL_DOCTYPES or frappe.db.exists("DocType", doctype)
+    ]
+    ctx = seed_context(dict.fromkeys(doctypes, 0), seed_value)
+    report: dict[str, Any] = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "repeat": repeat,
+            "seed": seed_value,
+            "user": ctx["user"],
+            "doctypes": doctypes,
+        },
+        "scales": {},
+    }
+
+    restore_features = _enable_all_features()
+    try:
+        for scale in sorted(scales):
+            sizes = {doctype: int(FULL_SIZES[doctype] * scale) for doctype in doctypes}
+            previous = ctx["sizes"]
+            # References point into the final sizes, so update them before seeding.
+            ctx["sizes"] = {doctype: max(sizes[doctype], previous[doctype]) for doctype in doctypes}
+            for doctype in doctypes:
+                if sizes[doctype] > previous[doctype]:
+                    seed(doctype, previous[doctype], sizes[doctype], seed_value, ctx)
+
+            results = {
+                label: time_endpoint(func, kwargs, before, repeat)
+                for label, (func, kwargs, before) in endpoints().items()
+            }
+            report["scales"][str(scale)] = {"sizes": sizes, "endpoints": results}
+    finally:
+        restore_features()
+        if not keep:
+            cleanup(doctypes)
+
+    if output:
+        with open(output, "w") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+    print(json.dumps(report, indent=2, sort_keys=True))
+    return report
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "p50_ms",
+) -> list[dict[str, Any]]:
+    """Return the endpoints that regressed between two reports.
+
+    An endpoint regresses when ``metric`` grew by more than ``threshold`` (a
+    fraction) or when it issues more queries. Only scales and endpoints
+    present in both reports are compared.
+    """
+    regressions = []
+    for scale, base_scale in sorted(baseline.get("scales", {}).items()):
+        current_endpoints = current.get("scales", {}).get(scale, {}).get("endpoints", {})
+        for endpoint, before in sorted(base_scale.get("endpoints", {}).items()):
+            after = current_endpoints.get(endpoint)
+            if not after:
+                continue
+            if before[metric] and after[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    {
+                        "scale": scale,
+                        "endpoint": endpoint,
+                        "metric": metric,
+                        "before": before[metric],
+                        "after": after[metric],
+                        "change": round(after[metric] / before[metric] - 1, 4),
+                    }
+                )
+            if after.get("queries", 0) > before.get("queries", 0):
+                regressions.append(
+                    {
+                        "scale": scale,
+                        "endpoint": endpoint,
+                        "metric": "queries",
+                        "before": before["queries"],
+                        "after": after["queries"],
+                        "change": after["queries"] - before["queries"],
+                    }
+                )
+    return regressions
+
+
+def _enable_all_features() -> Callable[[], None]:
+    """Switch every ``enable_*`` flag on and return a function restoring the old values."""
+    from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
+        get_settings_doc,
+    )
+
+    settings = get_settings_doc()
+    previous = {
+        field.fieldname: settings.get(field.fieldname)
+        for field in settings.meta.fields
+        if field.fieldtype == "Check" and field.fieldname.startswith("enable_")
+    }
+    # The search index and instrumentation change what is measured; leave them as configured.
+    toggles = {
+        fieldname: 1
+        for fieldname in previous
+        if fieldname not in ("enable_search_index", "enable_api_instrumentation")
+    }
+
+    def apply(values: dict[str, Any]) -> None:
+        doc = get_settings_doc()
+        doc.update(values)
+        doc.flags.ignore_permissions = True
+        doc.save()
+
+    apply(toggles)
+    return lambda: apply(previous)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff two navbar benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--metric", default="p50_ms", choices=("p50_ms", "p95_ms", "mean_ms"))
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.current) as handle:
+        current = json.load(handle)
+
+    regressions = compare(baseline, current, args.threshold, args.metric)
+    for row in regressions:
+        print(
+            f"{row['endpoint']} @ scale {row['scale']}: {row['metric']} "
+            f"{row['before']} -> {row['after']} ({row['change']:+})"
+        )
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
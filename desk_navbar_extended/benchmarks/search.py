@@ -0,0 +1,185 @@
+"""Latency and recall benchmark for navbar search.
+
+Two entry points:
+
+* ``python -m desk_navbar_extended.benchmarks.search`` times the trigram
+  vocabulary index and the palette's fuzzy scorer on a synthetic corpus
+  without needing a site.
+* ``bench --site <site> execute desk_navbar_extended.benchmarks.search.run``
+  seeds synthetic Notes and compares ``search_link`` with the navbar search
+  index on clean and misspelt queries. Seeded rows are removed afterwards.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from typing import Any
+
+from desk_navbar_extended.search.fuzzy import FuzzyIndex
+from desk_navbar_extended.search.trigram import TrigramIndex
+
+PREFIXES = ["Customer", "Supplier", "Project", "Invoice", "Order", "Lead", "Contract", "Ticket"]
+SUFFIXES = ["Ltd", "Inc", "GmbH", "Holdings", "Group", "Services", "Traders", "Labs"]
+SYLLABLES = ["ac", "me", "ro", "ta", "li", "ven", "dor", "sa", "ki", "mon", "pel", "tri", "zu", "qua"]
+BENCH_NAME_PREFIX = "DNXBENCH-"
+
+
+def generate_titles(size: int, seed: int = 42, pool_size: int = 50_000) -> list[str]:
+    """Return ``size`` synthetic document titles drawn from a Zipf-like word pool."""
+    rng = random.Random(seed)
+    pool = [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        for _ in range(pool_size)
+    ]
+    weights = [1 / (rank + 1) for rank in range(pool_size)]
+    words = rng.choices(pool, weights=weights, k=size)
+    return [
+        f"{rng.choice(PREFIXES)} {word} {rng.choice(SUFFIXES)}"
+        for word in words
+    ]
+
+
+def misspell(term: str, rng: random.Random) -> str:
+    """Drop or transpose one inner character of ``term``."""
+    if len(term) < 4:
+        return term
+    idx = rng.randint(1, len(term) - 2)
+    if rng.random() < 0.5:
+        return term[:idx] + term[idx + 1 :]
+    return term[:idx] + term[idx + 1] + term[idx] + term[idx + 2 :]
+
+
+def summarize(samples_ms: list[float], hits: int, total: int) -> dict[str, float]:
+    ordered = sorted(samples_ms) or [0.0]
+
+    def pick(pct: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(pct * len(ordered)))], 3)
+
+    return {
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "max_ms": round(ordered[-1], 3),
+        "recall": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def benchmark_vocabulary(size: int = 1_000_000, queries: int = 200, seed: int = 42) -> dict[str, Any]:
+    """Time typo-tolerant term lookups against the vocabulary of ``size`` documents."""
+    rng = random.Random(seed)
+    titles = generate_titles(size, seed)
+    vocabulary = {token for title in titles for token in title.lower().split()}
+
+    started = time.perf_counter()
+    index = TrigramIndex(vocabulary)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    samples: list[float] = []
+    hits = 0
+    targets = rng.sample(sorted(vocabulary), min(queries, len(vocabulary)))
+    for target in targets:
+        query = misspell(target, rng)
+        started = time.perf_counter()
+        found = index.search(query)
+        samples.append((time.perf_counter() - started) * 1000)
+        hits += any(term == target for _score, term in found)
+
+    return {
+        "documents": size,
+        "vocabulary": len(index),
+        "build_ms": round(build_ms, 1),
+        "misspelt_terms": summarize(samples, hits, len(targets)),
+    }
+
+
+def benchmark_fuzzy(size: int = 20_000, queries: int = 200, seed: int = 42) -> dict[str, Any]:
+    """Time palette lookups for every keystroke of typing ``queries`` titles."""
+    rng = random.Random(seed)
+    titles = generate_titles(size, seed)
+
+    started = time.perf_counter()
+    index = FuzzyIndex(titles)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    samples: list[float] = []
+    hits = 0
+    for pick in rng.sample(range(size), min(queries, size)):
+        words = titles[pick].split()
+        typed = f"{words[0]} {words[1]}".lower()
+        for end in range(1, len(typed) + 1):
+            started = time.perf_counter()
+            found = index.search(typed[:end], k=20)
+            samples.append((time.perf_counter() - started) * 1000)
+        hits += any(titles[idx].lower().startswith(typed) for _score, idx in found)
+
+    return {
+        "items": size,
+        "build_ms": round(build_ms, 1),
+        "keystrokes": summarize(samples, hits, min(queries, size)),
+    }
+
+
+def run(size: int = 10_000, queries: int = 100, seed: int = 42, limit: int = 10) -> dict[str, Any]:
+    """Compare ``search_link`` with the navbar index on seeded Notes in the current site."""
+    import frappe
+    from frappe.desk.search import search_link
+    from frappe.utils import now_datetime
+
+    from desk_navbar_extended.search import index as search_index_module
+
+    size, queries, seed, limit = int(size), int(queries), int(seed), int(limit)
+    rng = random.Random(seed)
+    titles = generate_titles(size, seed)
+    now = now_datetime()
+    user = frappe.session.user
+    names = [f"{BENCH_NAME_PREFIX}{idx:08d}" for idx in range(size)]
+
+    try:
+        frappe.db.bulk_insert(
+            "Note",
+            ["name", "creation", "modified", "owner", "modified_by", "title", "public"],
+            [(name, now, now, user, user, title, 1) for name, title in zip(names, titles)],
+        )
+        frappe.db.commit()
+        search_index_module.rebuild_search_index(["Note"])
+
+        report: dict[str, Any] = {"documents": size, "queries": queries, "limit": limit}
+        picks = rng.sample(range(size), min(queries, size))
+        for label, typo in (("clean", False), ("misspelt", True)):
+            link_ms, index_ms = [], []
+            link_hits = index_hits = 0
+            for pick in picks:
+                words = titles[pick].split()
+                query = " ".join(
+                    misspell(word, rng) if typo else word for word in words[1:2] + words[:1]
+                )
+
+                started = time.perf_counter()
+                link_results = search_link(doctype="Note", txt=query, page_length=limit)
+                link_ms.append((time.perf_counter() - started) * 1000)
+                link_hits += any(row.get("value") == names[pick] for row in link_results or [])
+
+                started = time.perf_counter()
+                index_results = search_index_module.search_index(query, ["Note"], limit=limit)
+                index_ms.append((time.perf_counter() - started) * 1000)
+                index_hits += any(row["value"] == names[pick] for row in index_results)
+
+            report[label] = {
+                "search_link": summarize(link_ms, link_hits, len(picks)),
+                "search_index": summarize(index_ms, index_hits, len(picks)),
+            }
+    finally:
+        frappe.db.delete("Note", {"name": ["like", f"{BENCH_NAME_PREFIX}%"]})
+        frappe.db.delete(
+            search_index_module.INDEX_DOCTYPE,
+            {"reference_name": ["like", f"{BENCH_NAME_PREFIX}%"]},
+        )
+        frappe.db.commit()
+
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    print(json.dumps({"vocabulary": benchmark_vocabulary(), "fuzzy": benchmark_fuzzy()}, indent=2))
@@ -0,0 +1,20 @@
+"""Boot session hooks for Desk Navbar Extended."""
+
+from __future__ import annotations
+
+import frappe
+
+from desk_navbar_extended.root_api import get_settings
+
+
+def boot_session(bootinfo: frappe._dict) -> None:
+    """Embed the navbar settings payload so desk can initialise without an RPC."""
+
+    if frappe.session.user == "Guest":
+        return
+
+    settings = get_settings()
+    # Leave the fallback out, so the client asks again over RPC.
+    if settings.get("degraded"):
+        return
+    bootinfo.desk_navbar_extended = settings
@@ -0,0 +1,92 @@
+"""Process-local and Redis-backed caching helpers for Desk Navbar Extended."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+import frappe
+
+VERSION_KEY_PREFIX = "desk_navbar_extended:version:"
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry past ``maxsize``."""
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+def _local_versions() -> dict[str, str]:
+    versions = getattr(frappe.local, "desk_navbar_cache_versions", None)
+    if versions is None:
+        versions = {}
+        frappe.local.desk_navbar_cache_versions = versions
+    return versions
+
+
+def get_cache_version(name: str) -> str:
+    """Return the invalidation token for ``name``, creating one if Redis has none.
+
+    Tokens are random rather than incrementing so that a Redis flush can never
+    resurrect an old token that process-local caches still hold entries for.
+    The token is memoised on ``frappe.local`` for the rest of the request.
+    """
+
+    versions = _local_versions()
+    version = versions.get(name)
+    if version:
+        return version
+
+    cache = frappe.cache()
+    version = cache.get_value(VERSION_KEY_PREFIX + name)
+    if not version:
+        version = frappe.generate_hash(length=12)
+        cache.set_value(VERSION_KEY_PREFIX + name, version)
+    versions[name] = version
+    return version
+
+
+def bump_cache_version(name: str) -> str:
+    """Replace the invalidation token for ``name`` so every dependent entry misses."""
+
+    version = frappe.generate_hash(length=12)
+    frappe.cache().set_value(VERSION_KEY_PREFIX + name, version)
+    _local_versions()[name] = version
+    return version
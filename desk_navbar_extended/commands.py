@@ -0,0 +1,36 @@
+"""Bench commands for Desk Navbar Extended."""
+
+from __future__ import annotations
+
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-navbar-search-index")
+@click.option(
+    "--doctype",
+    "doctypes",
+    multiple=True,
+    help="Only rebuild these DocTypes (repeatable). Defaults to every indexed DocType.",
+)
+@click.option("--chunk-size", default=1000, show_default=True, help="Documents per batch.")
+@pass_context
+def rebuild_navbar_search_index(context, doctypes, chunk_size):
+    """Rebuild the Desk Navbar Search Index from scratch."""
+    import frappe
+
+    from desk_navbar_extended.search.index import rebuild_search_index
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        counts = rebuild_search_index(doctypes or None, chunk_size=chunk_size)
+    finally:
+        frappe.destroy()
+
+    for doctype, count in counts.items():
+        click.echo(f"{doctype}: {count} documents indexed")
+
+
+commands = [rebuild_navbar_search_index]
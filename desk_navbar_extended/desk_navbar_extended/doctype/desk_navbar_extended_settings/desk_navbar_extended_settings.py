@@ -2,14 +2,50 @@
 
 from __future__ import annotations
 
+from hashlib import sha1
+
 import frappe
 from frappe.model.document import Document
 
+from desk_navbar_extended.cache import LRUCache, bump_cache_version, get_cache_version
+from desk_navbar_extended.metrics import registry
+
+SETTINGS_CACHE_VERSION = "settings"
+FEATURE_CACHE_KEY = "desk_navbar_extended:features"
+SETTINGS_SNAPSHOT_KEY = "desk_navbar_extended:settings_snapshot"
+
+# Resolved feature maps keyed by (site, settings version, sorted role tuple).
+_feature_cache = LRUCache(maxsize=512)
+# Settings snapshots keyed by (site, settings version).
+_settings_snapshot_cache = LRUCache(maxsize=64)
+
 
 class DeskNavbarExtendedSettings(Document):
     """Desk Navbar Extended Settings doctype."""
 
-    pass
+    def on_update(self) -> None:
+        clear_feature_cache()
+        # The settings payload is embedded in every user's cached boot info.
+        frappe.cache().delete_key("bootinfo")
+
+        if not (
+            self.has_value_changed("enable_search_index")
+            or self.has_value_changed("search_doctypes")
+        ):
+            return
+
+        # Drop rows of doctypes that left the index (all of them when it is disabled).
+        frappe.enqueue(
+            "desk_navbar_extended.search.index.prune_search_index",
+            queue="long",
+            enqueue_after_commit=True,
+        )
+        if self.enable_search_index:
+            frappe.enqueue(
+                "desk_navbar_extended.search.index.rebuild_search_index",
+                queue="long",
+                enqueue_after_commit=True,
+            )
 
 
 def get_settings_doc() -> frappe.model.document.Document:
@@ -23,11 +59,69 @@ def get_settings_doc() -> frappe.model.document.Document:
         return doc
 
 
+def get_cached_settings() -> frappe._dict:
+    """Return a snapshot of the settings cached per settings version.
+
+    Meant for hot paths such as document hooks; treat the result as read-only.
+    """
+
+    version = get_cache_version(SETTINGS_CACHE_VERSION)
+    local_key = (frappe.local.site, version)
+
+    snapshot = _settings_snapshot_cache.get(local_key)
+    if snapshot is None:
+        cache = frappe.cache()
+        snapshot = cache.hget(SETTINGS_SNAPSHOT_KEY, version)
+        if snapshot is None:
+            snapshot = get_settings_doc().as_dict(no_default_fields=True)
+            cache.hset(SETTINGS_SNAPSHOT_KEY, version, snapshot)
+        _settings_snapshot_cache.set(local_key, snapshot)
+
+    return snapshot
+
+
+def clear_feature_cache() -> None:
+    """Invalidate settings snapshots and resolved feature maps in every worker."""
+
+    bump_cache_version(SETTINGS_CACHE_VERSION)
+    frappe.cache().delete_value([FEATURE_CACHE_KEY, SETTINGS_SNAPSHOT_KEY])
+    _feature_cache.clear()
+    _settings_snapshot_cache.clear()
+
+
 def get_enabled_features_for_user(user: str | None = None) -> dict[str, bool]:
-    """Return a map of enabled features for the given user respecting role overrides."""
+    """Return a map of enabled features for the given user respecting role overrides.
+
+    Results are cached per distinct role set, first in process and then in Redis,
+    so the settings singleton is only loaded when the settings version changes.
+    """
 
     user = user or frappe.session.user
-    settings = get_settings_doc()
+    roles = tuple(sorted(set(frappe.get_roles(user))))
+    version = get_cache_version(SETTINGS_CACHE_VERSION)
+    local_key = (frappe.local.site, version, roles)
+
+    features = _feature_cache.get(local_key)
+    result = "hit"
+    if features is None:
+        cache = frappe.cache()
+        roles_digest = sha1("\n".join(roles).encode()).hexdigest()
+        field = f"{version}:{roles_digest}"
+        features = cache.hget(FEATURE_CACHE_KEY, field)
+        if features is None:
+            result = "miss"
+            features = _resolve_features(get_settings_doc(), set(roles))
+            cache.hset(FEATURE_CACHE_KEY, field, features)
+        _feature_cache.set(local_key, features)
+
+    if get_cached_settings().get("enable_api_instrumentation"):
+        registry.inc("cache_lookups", {"cache": "feature_flags", "result": result})
+    return dict(features)
+
+
+def _resolve_features(settings: Document, user_roles: set[str]) -> dict[str, bool]:
+    """Evaluate every feature flag against ``settings`` for a set of roles."""
+
     role_overrides = {}
 
     if settings.enable_role_toggles:
@@ -44,7 +138,6 @@ def get_enabled_features_for_user(user: str | None = None) -> dict[str, bool]:
         overrides = role_overrides.get(fieldname.replace("enable_", ""), set())
         if not overrides:
             return enabled
-        user_roles = set(frappe.get_roles(user))
         return bool(user_roles.intersection(overrides)) and enabled
 
     return {
@@ -63,4 +156,5 @@ def get_enabled_features_for_user(user: str | None = None) -> dict[str, bool]:
         "kpi_widgets": is_enabled("enable_kpi_widgets"),
         "help_search": is_enabled("enable_help_search"),
         "usage_analytics": bool(settings.enable_usage_analytics),
+        "search_index": bool(settings.enable_search_index),
     }
@@ -0,0 +1 @@
+"""Desk Navbar Recent Document DocType."""
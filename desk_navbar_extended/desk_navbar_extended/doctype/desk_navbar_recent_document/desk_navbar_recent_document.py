@@ -0,0 +1,19 @@
+"""Server logic for Desk Navbar Recent Document."""
+
+from __future__ import annotations
+
+import frappe
+from frappe.model.document import Document
+
+
+class DeskNavbarRecentDocument(Document):
+    """Persisted copy of one entry of a user's recent documents buffer."""
+
+    pass
+
+
+def on_doctype_update() -> None:
+    """Add the indexes used to reload a user's buffer and to forget deleted documents."""
+
+    frappe.db.add_index("Desk Navbar Recent Document", ["user", "last_seen"])
+    frappe.db.add_index("Desk Navbar Recent Document", ["reference_doctype", "reference_name"])
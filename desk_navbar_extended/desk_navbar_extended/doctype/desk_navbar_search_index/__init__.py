@@ -0,0 +1 @@
+"""Desk Navbar Search Index DocType."""
@@ -0,0 +1,19 @@
+"""Server logic for Desk Navbar Search Index."""
+
+from __future__ import annotations
+
+import frappe
+from frappe.model.document import Document
+
+
+class DeskNavbarSearchIndex(Document):
+    """One token of a document indexed for global navbar search."""
+
+    pass
+
+
+def on_doctype_update() -> None:
+    """Add the composite indexes used by lookups and per-document rewrites."""
+
+    frappe.db.add_index("Desk Navbar Search Index", ["token", "reference_doctype"])
+    frappe.db.add_index("Desk Navbar Search Index", ["reference_doctype", "reference_name"])
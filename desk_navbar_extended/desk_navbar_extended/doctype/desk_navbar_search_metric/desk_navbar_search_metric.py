@@ -18,3 +18,9 @@ class DeskNavbarSearchMetric(Document):
             self.error_message = self.error_message[:140]
         actor = frappe.session.user or "Guest"
         self.actor_hash = sha256(actor.encode()).hexdigest()
+
+
+def on_doctype_update() -> None:
+    """Index insertion order, which rollups and pruning scan in keyset chunks."""
+
+    frappe.db.add_index("Desk Navbar Search Metric", ["creation"])
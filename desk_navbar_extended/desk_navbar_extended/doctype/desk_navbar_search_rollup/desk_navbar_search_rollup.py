@@ -0,0 +1,18 @@
+"""Server logic for Desk Navbar Search Rollup."""
+
+from __future__ import annotations
+
+import frappe
+from frappe.model.document import Document
+
+
+class DeskNavbarSearchRollup(Document):
+    """Search counts and a latency sketch for one minute or hour."""
+
+    pass
+
+
+def on_doctype_update() -> None:
+    """Add the index used to look up buckets by period and time range."""
+
+    frappe.db.add_index("Desk Navbar Search Rollup", ["period", "bucket_start"])
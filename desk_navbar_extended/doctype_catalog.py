@@ -0,0 +1,114 @@
+"""Permitted DocType catalog for the command palette, cached per role set.
+
+Whether a user may read a DocType at list level only depends on their roles,
+so the catalog is built once per distinct role combination and language and
+kept in process and in Redis, together with a fuzzy index over its labels for
+server-side palette search. DocType, Custom DocPerm and Role changes replace
+the version token through doc_events, which makes every cached catalog miss,
+and drop the Redis hash so catalogs of old versions do not linger.
+
+DocTypes a user can only reach through documents shared with them are left
+out on purpose: listing them would make the catalog per user instead of per
+role set, and the shared documents themselves still reach the palette through
+recent history and search.
+"""
+
+from __future__ import annotations
+
+from hashlib import sha1
+from typing import Any
+
+import frappe
+import frappe.permissions
+from frappe import _
+
+from desk_navbar_extended.cache import LRUCache, bump_cache_version, get_cache_version
+from desk_navbar_extended.search.fuzzy import FuzzyIndex
+
+CATALOG_CACHE_VERSION = "doctype_catalog"
+CATALOG_CACHE_KEY = "desk_navbar_extended:doctype_catalog"
+# Bounds the hash of a role set that stops being used between version bumps.
+CATALOG_CACHE_TTL = 24 * 3600
+DEFAULT_ICON = "octicon octicon-file"
+
+_catalog_cache = LRUCache(maxsize=128)
+# id(catalog) -> (catalog, index); the catalog is kept to rule out a reused id.
+_index_cache = LRUCache(maxsize=32)
+
+
+def get_permitted_doctypes(user: str | None = None) -> list[dict[str, Any]]:
+    """Return palette entries for every DocType ``user`` can read.
+
+    The result is shared between callers; treat it as read-only.
+    """
+
+    user = user or frappe.session.user
+    roles = tuple(sorted(set(frappe.get_roles(user))))
+    version = get_cache_version(CATALOG_CACHE_VERSION)
+    lang = frappe.local.lang
+    local_key = (frappe.local.site, version, lang, roles)
+
+    catalog = _catalog_cache.get(local_key)
+    if catalog is None:
+        cache = frappe.cache()
+        roles_digest = sha1("\n".join(roles).encode()).hexdigest()
+        field = f"{version}:{lang}:{roles_digest}"
+        catalog = cache.hget(CATALOG_CACHE_KEY, field)
+        if catalog is None:
+            catalog = _build_catalog(user)
+            cache.hset(CATALOG_CACHE_KEY, field, catalog)
+            cache.expire(cache.make_key(CATALOG_CACHE_KEY), CATALOG_CACHE_TTL)
+        _catalog_cache.set(local_key, catalog)
+
+    return catalog
+
+
+def get_catalog_index(user: str | None = None) -> tuple[list[dict[str, Any]], FuzzyIndex]:
+    """Return the permitted DocType catalog of ``user`` with a fuzzy index over its labels."""
+    catalog = get_permitted_doctypes(user)
+    cached = _index_cache.get(id(catalog))
+    if cached is None or cached[0] is not catalog:
+        cached = (catalog, FuzzyIndex(entry["label"] for entry in catalog))
+        _index_cache.set(id(catalog), cached)
+    return catalog, cached[1]
+
+
+def _build_catalog(user: str) -> list[dict[str, Any]]:
+    doctypes = frappe.get_all(
+        "DocType",
+        filters={"istable": 0, "issingle": 0},
+        fields=["name", "icon"],
+        order_by="name asc",
+    )
+    if user != "Administrator":
+        # Custom DocPerm rows replace DocPerm rows per doctype, as in has_permission.
+        readable = {
+            perm.parent for perm in frappe.permissions.get_valid_perms(user=user) if perm.read
+        }
+        doctypes = [dt for dt in doctypes if dt.name in readable]
+
+    return [
+        {
+            "type": "doctype",
+            "label": _(dt.name),
+            "value": dt.name,
+            "icon": dt.icon or DEFAULT_ICON,
+            "route": f"/app/{frappe.scrub(dt.name)}",
+            "description": f"Open {_(dt.name)} list",
+        }
+        for dt in doctypes
+    ]
+
+
+def on_permission_change(doc: Any, method: str | None = None, *args: Any, **kwargs: Any) -> None:
+    """doc_events hook: drop cached catalogs when DocTypes, permissions or roles change."""
+    bump_cache_version(CATALOG_CACHE_VERSION)
+    frappe.cache().delete_value(CATALOG_CACHE_KEY)
+
+
+def clear_catalog_cache() -> None:
+    """Invalidate cached catalogs in every worker."""
+    bump_cache_version(CATALOG_CACHE_VERSION)
+    frappe.cache().delete_value(CATALOG_CACHE_KEY)
+    _catalog_cache.clear()
+    _index_cache.clear()
@@ -0,0 +1,181 @@
+"""Per-user frecency of desk routes: how often and how recently each one is opened.
+
+A visit at time ``t`` adds ``exp(DECAY * (t - EPOCH))`` to the route's field in
+one Redis hash per user, where ``DECAY = ln 2 / HALF_LIFE_SECONDS``. Recording
+is a blind HINCRBYFLOAT, atomic and without a read, yet since every field
+decays by the same factor, comparing raw fields compares frecency at any
+moment. Dividing by ``exp(DECAY * (now - EPOCH))`` gives the current value: a
+visit right now counts 1 and half as much every ``HALF_LIFE_SECONDS``. The
+raw values stay finite for about 39 years after ``EPOCH``.
+
+Routes are keyed by :func:`route_key`, so palette entries, pins, recent
+documents and search results all resolve to the same field as the page the
+browser recorded.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Iterable
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+import frappe
+
+KEY_PREFIX = "desk_navbar_extended:frecency:"
+HALF_LIFE_SECONDS = 14 * 24 * 3600
+DECAY = math.log(2) / HALF_LIFE_SECONDS
+EPOCH = 1_704_067_200  # 2024-01-01 UTC
+# Hashes are trimmed back to MAX_ENTRIES once they grow TRIM_SLACK past it.
+MAX_ENTRIES = 256
+TRIM_SLACK = 64
+# Users who stop visiting anything drop out of Redis entirely.
+TTL_SECONDS = 180 * 24 * 3600
+# Client timestamps older than this (or in the future) are clamped.
+MAX_VISIT_AGE_SECONDS = 24 * 3600
+MAX_VISIT_BATCH = 100
+MAX_KEY_LENGTH = 200
+# boost = BOOST_WEIGHT * log1p(frecency), capped so habits never drown a clearly
+# better text match: one fresh visit is worth ~2.8, a daily habit ~12.
+BOOST_WEIGHT = 4.0
+MAX_BOOST = 16.0
+
+
+def route_key(route: str | None) -> str | None:
+    """Return the frecency key of a desk route, or None when it names no page.
+
+    ``/app/sales_order``, ``/app/sales-order/view/report`` and ``sales-order``
+    share one key; documents keep their name, and unsaved ones (``new-...``)
+    count towards the ``/new`` route that creates them.
+    """
+    path = urlsplit(route or "").path
+    parts = [unquote(part) for part in path.split("/") if part]
+    if parts and parts[0] == "app":
+        parts = parts[1:]
+    if not parts:
+        return None
+
+    parts[0] = _slug(parts[0])
+    if len(parts) > 1 and parts[1] == "view":
+        parts = parts[:1]
+    elif len(parts) > 1 and (parts[1] == "new" or parts[1].startswith("new-")):
+        parts[1] = "new"
+    key = "/".join(parts[:2])
+    return key if len(key) <= MAX_KEY_LENGTH else None
+
+
+def doc_key(doctype: str, name: str | None = None) -> str:
+    """Return the frecency key of a DocType list, or of one of its documents."""
+    slug = _slug(doctype)
+    return f"{slug}/{name}" if name else slug
+
+
+def _slug(value: str) -> str:
+    return value.strip().lower().replace("_", "-").replace(" ", "-")
+
+
+def record_visits(visits: Iterable[tuple[str, float | None]], user: str | None = None) -> int:
+    """Count visits to ``(route, timestamp)`` pairs for ``user`` in one round trip.
+
+    Timestamps are Unix seconds; None means now. Routes without a key are
+    skipped. Returns the number of visits recorded.
+    """
+    user = user or frappe.session.user
+    now = time.time()
+    increments: dict[str, float] = {}
+    recorded = 0
+    for route, ts in visits:
+        key = route_key(route)
+        if not key:
+            continue
+        ts = float(ts) if ts else now
+        if not math.isfinite(ts):
+            continue
+        ts = min(max(ts, now - MAX_VISIT_AGE_SECONDS), now)
+        increments[key] = increments.get(key, 0.0) + math.exp(DECAY * (ts - EPOCH))
+        recorded += 1
+    if not recorded:
+        return 0
+
+    cache = frappe.cache()
+    hash_key = cache.make_key(KEY_PREFIX + user)
+    pipe = cache.pipeline(transaction=False)
+    for key, increment in increments.items():
+        pipe.hincrbyfloat(hash_key, key, increment)
+    pipe.hlen(hash_key)
+    pipe.expire(hash_key, TTL_SECONDS)
+    size = pipe.execute()[-2]
+    if size > MAX_ENTRIES + TRIM_SLACK:
+        _trim(cache, hash_key)
+
+    _local_scores().pop(user, None)
+    return recorded
+
+
+def _trim(cache: Any, hash_key: str) -> None:
+    # Raw pipeline commands: the wrapper's hash helpers pickle values.
+    raw = cache.pipeline(transaction=False).hgetall(hash_key).execute()[0] or {}
+    stale = sorted(raw, key=lambda field: float(raw[field]))[: len(raw) - MAX_ENTRIES]
+    if stale:
+        cache.pipeline(transaction=False).hdel(hash_key, *stale).execute()
+
+
+def get_scores(user: str | None = None) -> dict[str, float]:
+    """Return the current frecency of every route ``user`` visited.
+
+    Memoised on ``frappe.local`` for the rest of the request.
+    """
+    user = user or frappe.session.user
+    scores = _local_scores().get(user)
+    if scores is not None:
+        return scores
+
+    cache = frappe.cache()
+    try:
+        pipe = cache.pipeline(transaction=False)
+        raw = pipe.hgetall(cache.make_key(KEY_PREFIX + user)).execute()[0] or {}
+    except Exception:  # noqa: BLE001
+        frappe.logger("desk_navbar_extended").warning("Failed to read frecency", exc_info=True)
+        raw = {}
+
+    scale = math.exp(-DECAY * (time.time() - EPOCH))
+    scores = {
+        (field.decode() if isinstance(field, bytes) else field): float(value) * scale
+        for field, value in raw.items()
+    }
+    _local_scores()[user] = scores
+    return scores
+
+
+def _local_scores() -> dict[str, dict[str, float]]:
+    scores = getattr(frappe.local, "desk_navbar_frecency", None)
+    if scores is None:
+        scores = {}
+        frappe.local.desk_navbar_frecency = scores
+    return scores
+
+
+def boost(frecency: float) -> float:
+    """Return the ranking bonus for a frecency value."""
+    return min(BOOST_WEIGHT * math.log1p(frecency), MAX_BOOST) if frecency > 0 else 0.0
+
+
+def get_boosts(keys: Iterable[str | None], user: str | None = None) -> dict[int, float]:
+    """Return ``{position: boost}`` for the visited keys among ``keys``."""
+    scores = get_scores(user)
+    if not scores:
+        return {}
+    boosts = {}
+    for idx, key in enumerate(keys):
+        value = scores.get(key) if key else None
+        if value:
+            boosts[idx] = boost(value)
+    return boosts
+
+
+def clear(user: str | None = None) -> None:
+    """Forget every visit of ``user``."""
+    user = user or frappe.session.user
+    frappe.cache().delete_value(KEY_PREFIX + user)
+    _local_scores().pop(user, None)
@@ -21,7 +21,10 @@ app_include_js = [
     "/assets/desk_navbar_extended/js/awesomebar_layout.js",
     # Phase 2 modules
     "/assets/desk_navbar_extended/js/keyboard_manager.js",
+    "/assets/desk_navbar_extended/js/fuzzy.js",
+    "/assets/desk_navbar_extended/js/virtual_list.js",
     "/assets/desk_navbar_extended/js/command_palette.js",
+    "/assets/desk_navbar_extended/js/frecency.js",
     "/assets/desk_navbar_extended/js/search_filters.js",
     "/assets/desk_navbar_extended/js/saved_searches.js",
     "/assets/desk_navbar_extended/js/pins.js",
@@ -53,6 +56,11 @@ app_include_js = [
 # doctype_tree_js = {"doctype" : "public/js/doctype_tree.js"}
 # doctype_calendar_js = {"doctype" : "public/js/doctype_calendar.js"}
 
+# Boot
+# ----
+
+boot_session = "desk_navbar_extended.boot.boot_session"
+
 # Home Pages
 # ----------
 
@@ -91,6 +99,15 @@ after_install = "desk_navbar_extended.setup.after_install"
 # before_uninstall = "desk_navbar_extended.uninstall.before_uninstall"
 after_uninstall = "desk_navbar_extended.setup.after_uninstall"
 
+# Cache
+# -----
+# Called by frappe.clear_cache() (bench clear-cache, migrate)
+
+clear_cache = [
+    "desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings.clear_feature_cache",
+    "desk_navbar_extended.doctype_catalog.clear_catalog_cache",
+]
+
 # Desk Notifications
 # ------------------
 # See frappe.core.notifications.get_notification_config
@@ -129,9 +146,46 @@ after_uninstall = "desk_navbar_extended.setup.after_uninstall"
 # 	}
 # }
 doc_events = {
+    "*": {
+        "onload": "desk_navbar_extended.recent_docs.on_document_load",
+        "on_update": [
+            "desk_navbar_extended.search.index.on_document_update",
+            "desk_navbar_extended.search.result_cache.on_document_change",
+            "desk_navbar_extended.recent_docs.on_document_update",
+            "desk_navbar_extended.title_cache.on_document_update",
+        ],
+        "on_submit": "desk_navbar_extended.search.result_cache.on_document_change",
+        "on_cancel": "desk_navbar_extended.search.result_cache.on_document_change",
+        "on_update_after_submit": "desk_navbar_extended.search.result_cache.on_document_change",
+        "on_trash": [
+            "desk_navbar_extended.search.index.on_document_trash",
+            "desk_navbar_extended.search.result_cache.on_document_change",
+            "desk_navbar_extended.recent_docs.on_document_trash",
+            "desk_navbar_extended.title_cache.on_document_trash",
+        ],
+        "after_rename": [
+            "desk_navbar_extended.search.index.on_document_rename",
+            "desk_navbar_extended.search.result_cache.on_document_change",
+            "desk_navbar_extended.title_cache.on_document_rename",
+        ],
+    },
     "User": {
         "on_login": "desk_navbar_extended.api.log_doctype_presence",
-    }
+    },
+    "DocType": {
+        "on_update": "desk_navbar_extended.doctype_catalog.on_permission_change",
+        "on_trash": "desk_navbar_extended.doctype_catalog.on_permission_change",
+        "after_rename": "desk_navbar_extended.doctype_catalog.on_permission_change",
+    },
+    "Custom DocPerm": {
+        "on_update": "desk_navbar_extended.doctype_catalog.on_permission_change",
+        "on_trash": "desk_navbar_extended.doctype_catalog.on_permission_change",
+    },
+    "Role": {
+        "on_update": "desk_navbar_extended.doctype_catalog.on_permission_change",
+        "on_trash": "desk_navbar_extended.doctype_catalog.on_permission_change",
+        "after_rename": "desk_navbar_extended.doctype_catalog.on_permission_change",
+    },
 }
 
 # Scheduled Tasks
@@ -154,6 +208,16 @@ doc_events = {
 # 		"desk_navbar_extended.tasks.monthly"
 # 	],
 # }
+scheduler_events = {
+    "cron": {
+        "* * * * *": ["desk_navbar_extended.metrics.buffer.flush_search_metrics"],
+        "*/5 * * * *": [
+            "desk_navbar_extended.metrics.rollups.rollup_search_metrics",
+            "desk_navbar_extended.recent_docs.persist_recent_docs",
+        ],
+    },
+    "daily": ["desk_navbar_extended.metrics.rollups.prune_search_metrics"],
+}
 
 # Testing
 # -------
@@ -0,0 +1 @@
+"""Search and API telemetry for Desk Navbar Extended."""
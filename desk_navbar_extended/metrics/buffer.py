@@ -0,0 +1,149 @@
+"""Redis-buffered ingestion of search metrics.
+
+Web requests only append a serialised row to a Redis list. A scheduler job
+drains the list in chunks and writes each chunk with one multi-row insert,
+keeping analytics writes off the request path and out of the way of
+interactive transactions.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from hashlib import sha256
+from typing import Any
+
+import frappe
+from frappe.utils import cint, get_datetime, now_datetime, time_diff_in_seconds
+
+METRIC_DOCTYPE = "Desk Navbar Search Metric"
+METRIC_BUFFER_KEY = "desk_navbar_extended:search_metric_buffer"
+# Oldest events are dropped past this, should the flush job stop running.
+MAX_BUFFERED_METRICS = 50_000
+# Client timestamps further than this from the server clock are replaced.
+MAX_CLOCK_SKEW_SECONDS = 3600
+FLUSH_CHUNK_SIZE = 1000
+STATUSES = ("success", "error", "cancelled")
+
+METRIC_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "owner",
+    "modified_by",
+    "event_ts",
+    "search_length",
+    "execution_ms",
+    "status",
+    "error_message",
+    "actor_hash",
+)
+
+
+def build_metric(metrics: dict[str, Any], user: str | None = None) -> dict[str, Any]:
+    """Normalise a client or server metric payload into a buffered row."""
+    status = metrics.get("status") or "success"
+    actor = user or frappe.session.user or "Guest"
+    return {
+        "event_ts": str(_event_timestamp(metrics.get("event_ts"))),
+        "search_length": cint(metrics.get("search_length")),
+        "execution_ms": float(metrics.get("execution_ms") or 0),
+        "status": status if status in STATUSES else "success",
+        "error_message": (metrics.get("error_message") or "")[:140],
+        "actor_hash": sha256(actor.encode()).hexdigest(),
+    }
+
+
+def enqueue_metric(metric: dict[str, Any]) -> None:
+    """Append one row built by :func:`build_metric` to the buffer."""
+    enqueue_metrics([metric])
+
+
+def enqueue_metrics(metrics: list[dict[str, Any]]) -> None:
+    """Append rows built by :func:`build_metric` to the buffer in one round trip."""
+    if not metrics:
+        return
+    cache = frappe.cache()
+    key = cache.make_key(METRIC_BUFFER_KEY)
+    pipe = cache.pipeline(transaction=False)
+    pipe.rpush(key, *(json.dumps(metric) for metric in metrics))
+    # A no-op unless the buffer has outgrown its cap.
+    pipe.ltrim(key, -MAX_BUFFERED_METRICS, -1)
+    pipe.execute()
+
+
+def flush_search_metrics(chunk_size: int = FLUSH_CHUNK_SIZE) -> int:
+    """Scheduler job: move buffered metrics into the metric table.
+
+    Each chunk is popped atomically and written with a single bulk insert.
+    Returns the number of rows written.
+    """
+    cache = frappe.cache()
+    key = cache.make_key(METRIC_BUFFER_KEY)
+    written = 0
+
+    while True:
+        pipe = cache.pipeline()
+        pipe.lrange(key, 0, chunk_size - 1)
+        pipe.ltrim(key, chunk_size, -1)
+        raw, _trimmed = pipe.execute()
+        if not raw:
+            break
+
+        try:
+            frappe.db.bulk_insert(METRIC_DOCTYPE, METRIC_FIELDS, _build_values(raw))
+            frappe.db.commit()
+        except Exception:  # noqa: BLE001
+            frappe.db.rollback()
+            # Put the chunk back in front so the next run retries it.
+            cache.pipeline(transaction=False).lpush(key, *reversed(raw)).execute()
+            frappe.logger("desk_navbar_extended").error(
+                "Failed to flush search metrics", exc_info=True, extra={"rows": len(raw)}
+            )
+            break
+
+        written += len(raw)
+        if len(raw) < chunk_size:
+            break
+
+    return written
+
+
+def _event_timestamp(value: Any) -> datetime:
+    """Parse a client timestamp, falling back to now when unusable or skewed."""
+    now = now_datetime()
+    if not value:
+        return now
+    try:
+        timestamp = get_datetime(value)
+    except Exception:  # noqa: BLE001
+        return now
+    if not timestamp or abs(time_diff_in_seconds(timestamp, now)) > MAX_CLOCK_SKEW_SECONDS:
+        return now
+    return timestamp
+
+
+def _build_values(raw: list[bytes | str]) -> list[tuple]:
+    now = now_datetime()
+    values = []
+    for item in raw:
+        try:
+            metric = json.loads(item)
+        except ValueError:
+            continue
+        values.append(
+            (
+                frappe.generate_hash(length=10),
+                now,
+                now,
+                "Administrator",
+                "Administrator",
+                get_datetime(metric.get("event_ts")),
+                cint(metric.get("search_length")),
+                float(metric.get("execution_ms") or 0),
+                metric.get("status") or "success",
+                metric.get("error_message") or "",
+                metric.get("actor_hash"),
+            )
+        )
+    return values
@@ -0,0 +1,130 @@
+"""Sliding-window search error-rate detector.
+
+Search outcomes are counted in 10-second Redis hash buckets that expire once
+they leave the window, so the rate over the window is read from a fixed
+number of counters whatever the traffic. The window is evaluated at most once
+per bucket per site. Alerts use hysteresis: they are raised at one threshold
+and only cleared below a lower one, and System Managers are notified on
+each transition rather than on every noisy sample.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+
+import frappe
+from frappe.utils import cint, flt
+from frappe.utils.user import get_users_with_role
+
+from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
+    get_cached_settings,
+)
+from desk_navbar_extended.metrics import registry
+
+BUCKET_SECONDS = 10
+BUCKET_KEY_PREFIX = "desk_navbar_extended:search_outcomes:"
+EVALUATED_KEY_PREFIX = "desk_navbar_extended:search_outcomes_evaluated:"
+ALERT_STATE_KEY = "desk_navbar_extended:search_error_alert"
+ERROR_RATE_EVENT = "desk_navbar_extended.error_rate"
+
+DEFAULT_WINDOW_SECONDS = 300
+DEFAULT_ALERT_THRESHOLD = 30
+DEFAULT_CLEAR_THRESHOLD = 15
+DEFAULT_MIN_SAMPLES = 20
+
+
+def get_alert_config() -> frappe._dict:
+    """Return the detector settings with thresholds as fractions."""
+    settings = get_cached_settings()
+    window = cint(settings.get("error_rate_window_seconds")) or DEFAULT_WINDOW_SECONDS
+    raise_at = flt(settings.get("error_rate_alert_threshold") or DEFAULT_ALERT_THRESHOLD) / 100
+    clear_at = flt(settings.get("error_rate_clear_threshold") or DEFAULT_CLEAR_THRESHOLD) / 100
+    return frappe._dict(
+        window=max(window, BUCKET_SECONDS),
+        raise_at=raise_at,
+        clear_at=min(clear_at, raise_at),
+        min_samples=cint(settings.get("error_rate_min_samples")) or DEFAULT_MIN_SAMPLES,
+    )
+
+
+def record_search_outcome(status: str, now: float | None = None, count: int = 1) -> None:
+    """Count search outcomes and evaluate the window on the first write of each bucket."""
+    if status not in ("success", "error") or count <= 0:
+        return
+
+    registry.inc("client_search_outcomes", {"status": status}, count)
+    now = time.time() if now is None else now
+    bucket = int(now // BUCKET_SECONDS)
+    config = get_alert_config()
+    cache = frappe.cache()
+    key = cache.make_key(f"{BUCKET_KEY_PREFIX}{bucket}")
+
+    pipe = cache.pipeline(transaction=False)
+    pipe.hincrby(key, status, count)
+    pipe.expire(key, config.window + BUCKET_SECONDS)
+    pipe.set(
+        cache.make_key(f"{EVALUATED_KEY_PREFIX}{bucket}"), 1, nx=True, ex=BUCKET_SECONDS * 2
+    )
+    first_in_bucket = pipe.execute()[-1]
+
+    if first_in_bucket:
+        evaluate_error_rate(now, config)
+
+
+def get_error_rate(window: int, now: float | None = None) -> tuple[float, int, int]:
+    """Return ``(error_rate, errors, total)`` over the last ``window`` seconds."""
+    now = time.time() if now is None else now
+    current = int(now // BUCKET_SECONDS)
+    count = math.ceil(window / BUCKET_SECONDS)
+    cache = frappe.cache()
+
+    pipe = cache.pipeline(transaction=False)
+    for bucket in range(current - count + 1, current + 1):
+        pipe.hmget(cache.make_key(f"{BUCKET_KEY_PREFIX}{bucket}"), "success", "error")
+
+    successes = errors = 0
+    for success, error in pipe.execute():
+        successes += cint(success)
+        errors += cint(error)
+
+    total = successes + errors
+    return (errors / total if total else 0.0), errors, total
+
+
+def evaluate_error_rate(
+    now: float | None = None, config: frappe._dict | None = None
+) -> str | None:
+    """Raise or clear the alert when the window crosses a threshold.
+
+    Returns ``"raised"`` or ``"cleared"`` on a transition, otherwise None.
+    """
+    config = config or get_alert_config()
+    rate, errors, total = get_error_rate(config.window, now)
+    cache = frappe.cache()
+    state_key = cache.make_key(ALERT_STATE_KEY)
+
+    transition = None
+    if total >= config.min_samples and rate >= config.raise_at:
+        # SET NX lets exactly one worker announce the alert.
+        if cache.set(state_key, 1, nx=True):
+            transition = "raised"
+    elif rate <= config.clear_at and cache.delete(state_key):
+        transition = "cleared"
+
+    if transition:
+        _notify_system_managers(
+            {
+                "state": transition,
+                "error_rate": round(rate, 4),
+                "errors": errors,
+                "total": total,
+                "window_seconds": config.window,
+            }
+        )
+    return transition
+
+
+def _notify_system_managers(message: dict) -> None:
+    for user in get_users_with_role("System Manager"):
+        frappe.publish_realtime(ERROR_RATE_EVENT, message, user=user)
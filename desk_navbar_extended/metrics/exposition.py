@@ -0,0 +1,100 @@
+"""Prometheus text exposition of a metric registry snapshot.
+
+Only formats data already aggregated by :mod:`desk_navbar_extended.metrics.registry`,
+so a scrape never touches the metric tables.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections import defaultdict
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "desk_navbar_"
+CACHE_LOOKUPS = "cache_lookups"
+
+HELP = {
+    "api_duration_ms": "Wall time of navbar API calls in milliseconds.",
+    "api_db_time_ms": "Time spent in database queries per navbar API call in milliseconds.",
+    "api_db_queries": "Database queries issued per navbar API call.",
+    "api_errors": "Navbar API calls that raised an exception.",
+    "search_latency_ms": "Server-side search_with_filters latency in milliseconds.",
+    "search_errors": "Failed search_with_filters requests.",
+    "client_search_outcomes": "Awesomebar searches reported by browsers, by status.",
+    "cache_lookups": "Cache lookups by cache and result.",
+    "cache_hit_ratio": "Share of cache lookups served from cache since the counters were reset.",
+}
+
+
+def render(snapshot: dict[str, dict[tuple, dict[str, Any]]]) -> str:
+    """Return ``snapshot`` in Prometheus text format (version 0.0.4)."""
+    lines: list[str] = []
+
+    counters = _group(snapshot["counters"])
+    for name in sorted(counters):
+        metric = f"{PREFIX}{name}_total"
+        _header(lines, metric, name, "counter")
+        for labels, data in counters[name]:
+            lines.append(f"{metric}{_labels(labels)} {_number(data['value'])}")
+
+    ratios = _cache_hit_ratios(counters.get(CACHE_LOOKUPS, []))
+    if ratios:
+        metric = f"{PREFIX}cache_hit_ratio"
+        _header(lines, metric, "cache_hit_ratio", "gauge")
+        for cache, ratio in sorted(ratios.items()):
+            lines.append(f"{metric}{_labels({'cache': cache})} {_number(ratio)}")
+
+    histograms = _group(snapshot["histograms"])
+    for name in sorted(histograms):
+        metric = f"{PREFIX}{name}"
+        _header(lines, metric, name, "histogram")
+        for labels, data in histograms[name]:
+            for le, count in data["buckets"]:
+                bucket_labels = {**labels, "le": "+Inf" if le == math.inf else f"{le:g}"}
+                lines.append(f"{metric}_bucket{_labels(bucket_labels)} {_number(count)}")
+            lines.append(f"{metric}_sum{_labels(labels)} {_number(data['sum'])}")
+            lines.append(f"{metric}_count{_labels(labels)} {_number(data['count'])}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _group(series: dict[tuple, dict[str, Any]]) -> dict[str, list[tuple[dict, dict]]]:
+    grouped: dict[str, list[tuple[dict, dict]]] = defaultdict(list)
+    for (name, labels_json), data in sorted(series.items()):
+        grouped[name].append((json.loads(labels_json), data))
+    return grouped
+
+
+def _cache_hit_ratios(lookups: list[tuple[dict, dict]]) -> dict[str, float]:
+    hits: dict[str, float] = defaultdict(float)
+    totals: dict[str, float] = defaultdict(float)
+    for labels, data in lookups:
+        cache = labels.get("cache", "")
+        totals[cache] += data["value"]
+        if labels.get("result") == "hit":
+            hits[cache] += data["value"]
+    return {cache: hits[cache] / total for cache, total in totals.items() if total}
+
+
+def _header(lines: list[str], metric: str, name: str, kind: str) -> None:
+    lines.append(f"# HELP {metric} {HELP.get(name, name)}")
+    lines.append(f"# TYPE {metric} {kind}")
+
+
+def _labels(labels: dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
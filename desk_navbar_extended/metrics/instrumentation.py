@@ -0,0 +1,127 @@
+"""Opt-in per-endpoint timing for whitelisted APIs.
+
+:func:`instrument` wraps an endpoint and, when ``enable_api_instrumentation``
+is set, records its wall time, DB query count and DB time in the metric
+registry, labelled by endpoint and feature flag. When the setting is off the
+wrapper only reads the cached settings snapshot before calling through, except
+for endpoints marked ``timed``, whose wall time is always recorded.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import time
+from collections.abc import Callable
+from typing import Any
+
+import frappe
+
+from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
+    get_cached_settings,
+)
+from desk_navbar_extended.metrics import registry
+
+DURATION_METRIC = "api_duration_ms"
+DB_TIME_METRIC = "api_db_time_ms"
+DB_QUERIES_METRIC = "api_db_queries"
+ERRORS_METRIC = "api_errors"
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+
+
+def is_enabled() -> bool:
+    """Return True when API instrumentation is switched on for the site."""
+    try:
+        return bool(get_cached_settings().get("enable_api_instrumentation"))
+    except Exception:  # noqa: BLE001
+        return False
+
+
+def instrument(feature: str | None = None, timed: bool = False) -> Callable:
+    """Decorate an endpoint so its calls are timed when instrumentation is on.
+
+    Args:
+        feature: Feature flag the endpoint belongs to (used as a label)
+        timed: Record wall time even when instrumentation is off
+    """
+
+    def decorator(func: Callable) -> Callable:
+        endpoint = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if is_enabled():
+                counter = QueryCounter()
+            elif timed:
+                counter = None
+            else:
+                return func(*args, **kwargs)
+
+            labels = {"endpoint": endpoint, "feature": feature or ""}
+            start = time.perf_counter()
+            try:
+                with counter if counter is not None else contextlib.nullcontext():
+                    return func(*args, **kwargs)
+            except Exception:
+                registry.inc(ERRORS_METRIC, labels)
+                raise
+            finally:
+                _record(labels, (time.perf_counter() - start) * 1000, counter)
+
+        return wrapper
+
+    return decorator
+
+
+class QueryCounter:
+    """Count queries and DB time issued through ``frappe.db.sql``.
+
+    The bound method is shadowed on the connection instance for the duration
+    of the block and restored afterwards, so counters nest and coexist with
+    the recorder, which patches the same attribute.
+    """
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_ms = 0.0
+        self._db = None
+        self._original = None
+
+    def __enter__(self) -> QueryCounter:
+        self._db = getattr(frappe.local, "db", None)
+        if self._db is None:
+            return self
+
+        shadowed = "sql" in vars(self._db)
+        self._original = (shadowed, self._db.sql)
+        original_sql = self._db.sql
+
+        def sql(*args: Any, **kwargs: Any):
+            start = time.perf_counter()
+            try:
+                return original_sql(*args, **kwargs)
+            finally:
+                self.queries += 1
+                self.db_ms += (time.perf_counter() - start) * 1000
+
+        self._db.sql = sql
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._db is None:
+            return
+        shadowed, original_sql = self._original
+        if shadowed:
+            self._db.sql = original_sql
+        else:
+            del self._db.sql
+
+
+def _record(labels: dict[str, str], duration_ms: float, counter: QueryCounter | None) -> None:
+    try:
+        registry.observe(DURATION_METRIC, duration_ms, labels)
+        if counter is not None:
+            registry.observe(DB_TIME_METRIC, counter.db_ms, labels)
+            registry.observe(DB_QUERIES_METRIC, counter.queries, labels, QUERY_COUNT_BUCKETS)
+    except Exception:  # noqa: BLE001
+        frappe.logger("desk_navbar_extended").warning("Failed to record API timing", exc_info=True)
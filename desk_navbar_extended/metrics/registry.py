@@ -0,0 +1,162 @@
+"""Counters and fixed-bucket histograms aggregated in memory.
+
+Recording a value only updates a per-process dict. Every few seconds the
+accumulated deltas are pushed to one Redis hash per site with
+``HINCRBYFLOAT``, so readers see the totals of every worker without any
+table scans. Histograms keep Prometheus-style ``le`` buckets.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import Any
+
+import frappe
+
+REGISTRY_KEY = "desk_navbar_extended:metric_registry"
+FLUSH_INTERVAL_SECONDS = 10
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_lock = threading.Lock()
+# Unflushed deltas per site: {site: {field: delta}}.
+_pending: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+_last_flush: dict[str, float] = {}
+
+
+def inc(name: str, labels: dict[str, Any] | None = None, amount: float = 1) -> None:
+    """Add ``amount`` to the counter ``name`` with ``labels``."""
+    _record({_field(name, labels, "total"): amount})
+
+
+def observe(
+    name: str,
+    value: float,
+    labels: dict[str, Any] | None = None,
+    buckets: Sequence[float] = LATENCY_BUCKETS_MS,
+) -> None:
+    """Record ``value`` in the histogram ``name`` with ``labels``."""
+    le = next((bound for bound in buckets if value <= bound), math.inf)
+    _record(
+        {
+            _field(name, labels, f"bucket:{_format_bound(le)}"): 1,
+            _field(name, labels, "sum"): value,
+            _field(name, labels, "count"): 1,
+        }
+    )
+
+
+def flush(force: bool = False) -> None:
+    """Push this process's pending deltas for the current site to Redis."""
+    site = frappe.local.site
+    with _lock:
+        if not force and time.monotonic() - _last_flush.get(site, 0) < FLUSH_INTERVAL_SECONDS:
+            return
+        deltas = _pending.pop(site, None)
+        _last_flush[site] = time.monotonic()
+    if not deltas:
+        return
+
+    cache = frappe.cache()
+    key = cache.make_key(REGISTRY_KEY)
+    try:
+        pipe = cache.pipeline(transaction=False)
+        for field, delta in deltas.items():
+            pipe.hincrbyfloat(key, field, delta)
+        pipe.execute()
+    except Exception:  # noqa: BLE001
+        frappe.logger("desk_navbar_extended").warning("Failed to flush metrics", exc_info=True)
+
+
+def snapshot() -> dict[str, dict[tuple, dict[str, Any]]]:
+    """Return all counters and histograms of the current site.
+
+    Counters map ``(name, labels)`` to ``{"value": n}``; histograms map it to
+    ``{"buckets": [(le, cumulative_count), ...], "sum": s, "count": n}``.
+    """
+    flush(force=True)
+    cache = frappe.cache()
+    # A raw command: the wrapper's hgetall prefixes the key again and unpickles values.
+    pipe = cache.pipeline(transaction=False)
+    raw = pipe.hgetall(cache.make_key(REGISTRY_KEY)).execute()[0] or {}
+
+    counters: dict[tuple, dict[str, Any]] = {}
+    histograms: dict[tuple, dict[str, Any]] = {}
+    for raw_field, raw_value in raw.items():
+        field = raw_field.decode() if isinstance(raw_field, bytes) else raw_field
+        name, labels_json, suffix = _split_field(field)
+        key = (name, labels_json)
+        value = float(raw_value)
+        if suffix == "total":
+            counters[key] = {"value": value}
+            continue
+
+        histogram = histograms.setdefault(key, {"buckets": {}, "sum": 0.0, "count": 0.0})
+        if suffix.startswith("bucket:"):
+            histogram["buckets"][float(suffix[len("bucket:") :])] = value
+        else:
+            histogram[suffix] = value
+
+    for histogram in histograms.values():
+        cumulative = 0.0
+        buckets = []
+        for le in sorted(histogram["buckets"]):
+            cumulative += histogram["buckets"][le]
+            buckets.append((le, cumulative))
+        if not buckets or buckets[-1][0] != math.inf:
+            buckets.append((math.inf, cumulative))
+        histogram["buckets"] = buckets
+
+    return {"counters": counters, "histograms": histograms}
+
+
+def reset() -> None:
+    """Drop every aggregate of the current site, including unflushed deltas."""
+    with _lock:
+        _pending.pop(frappe.local.site, None)
+    frappe.cache().delete_value(REGISTRY_KEY)
+
+
+def labels_of(key: tuple[str, str]) -> dict[str, Any]:
+    """Return the labels dict of a :func:`snapshot` key."""
+    return json.loads(key[1])
+
+
+def quantile_from_buckets(buckets: list[tuple[float, float]], q: float) -> float | None:
+    """Return the upper bound of the bucket holding quantile ``q``."""
+    total = buckets[-1][1] if buckets else 0
+    if not total:
+        return None
+    rank = q * total
+    for le, cumulative in buckets:
+        if cumulative >= rank:
+            return le
+    return math.inf
+
+
+def _record(deltas: dict[str, float]) -> None:
+    site = frappe.local.site
+    with _lock:
+        pending = _pending[site]
+        for field, delta in deltas.items():
+            pending[field] += delta
+    flush()
+
+
+def _field(name: str, labels: dict[str, Any] | None, suffix: str) -> str:
+    labels_json = json.dumps(labels or {}, sort_keys=True, separators=(",", ":"))
+    return f"{name}|{labels_json}|{suffix}"
+
+
+def _split_field(field: str) -> tuple[str, str, str]:
+    name, rest = field.split("|", 1)
+    labels_json, suffix = rest.rsplit("|", 1)
+    return name, labels_json, suffix
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else f"{bound:g}"
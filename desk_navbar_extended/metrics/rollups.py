@@ -0,0 +1,293 @@
+"""Per-minute and per-hour rollups of search metrics.
+
+A scheduler job walks newly flushed ``Desk Navbar Search Metric`` rows in
+``(creation, name)`` keyset order from a persisted watermark and folds them
+into ``Desk Navbar Search Rollup`` buckets holding counts and a mergeable
+latency sketch. Percentiles for any range are then answered by merging a
+handful of hour buckets plus minute buckets at the edges, without touching
+raw rows, which are pruned once past the retention window.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+import frappe
+from frappe.utils import add_days, cint, flt, get_datetime, now_datetime
+
+from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
+    get_cached_settings,
+)
+from desk_navbar_extended.metrics.buffer import METRIC_DOCTYPE
+from desk_navbar_extended.metrics.sketch import LatencySketch
+
+ROLLUP_DOCTYPE = "Desk Navbar Search Rollup"
+WATERMARK_KEY = "desk_navbar_extended_search_rollup_watermark"
+PERIODS = ("minute", "hour")
+# Rows younger than this may still be committing from the flush job.
+SETTLE_SECONDS = 120
+ROLLUP_CHUNK_SIZE = 5000
+PRUNE_CHUNK_SIZE = 5000
+DEFAULT_RETENTION_DAYS = 30
+QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+
+ROLLUP_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "owner",
+    "modified_by",
+    "period",
+    "bucket_start",
+    "search_count",
+    "error_count",
+    "total_ms",
+    "latency_sketch",
+)
+
+
+def get_bucket_start(timestamp: datetime, period: str) -> datetime:
+    """Truncate ``timestamp`` to the start of its minute or hour."""
+    if period == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_search_metrics(chunk_size: int = ROLLUP_CHUNK_SIZE) -> int:
+    """Scheduler job: fold metric rows added since the last run into rollups.
+
+    Returns the number of raw rows processed.
+    """
+    watermark = _get_watermark()
+    settled = now_datetime() - timedelta(seconds=SETTLE_SECONDS)
+    processed = 0
+
+    while True:
+        rows = _fetch_metrics_after(watermark, settled, chunk_size)
+        if not rows:
+            break
+
+        _merge_into_rollups(rows)
+        watermark = (rows[-1].creation, rows[-1].name)
+        _set_watermark(watermark)
+        frappe.db.commit()
+
+        processed += len(rows)
+        if len(rows) < chunk_size:
+            break
+
+    return processed
+
+
+def prune_search_metrics(chunk_size: int = PRUNE_CHUNK_SIZE) -> dict[str, int]:
+    """Scheduler job: delete raw rows and minute rollups past the retention window.
+
+    Only raw rows already folded into rollups are removed. Hour rollups are
+    small and kept for long-range reporting.
+    """
+    settings = get_cached_settings()
+    retention = cint(settings.get("metric_retention_days")) or DEFAULT_RETENTION_DAYS
+    cutoff = add_days(now_datetime(), -retention)
+    watermark = _get_watermark()
+    raw_cutoff = min(cutoff, get_datetime(watermark[0])) if watermark else None
+
+    return {
+        "metrics": (
+            _delete_in_chunks(METRIC_DOCTYPE, [["creation", "<", raw_cutoff]], chunk_size)
+            if raw_cutoff
+            else 0
+        ),
+        "minute_rollups": _delete_in_chunks(
+            ROLLUP_DOCTYPE,
+            [["period", "=", "minute"], ["bucket_start", "<", cutoff]],
+            chunk_size,
+        ),
+    }
+
+
+def summarize_range(start: datetime, end: datetime) -> dict[str, Any]:
+    """Merge the rollups covering ``[start, end)`` into counts and percentiles.
+
+    Whole hours are read from hour buckets and the partial hours at either
+    edge from minute buckets, so the resolution is one minute.
+    """
+    first_hour = get_bucket_start(start, "hour")
+    if first_hour < start:
+        first_hour += timedelta(hours=1)
+    last_hour = get_bucket_start(end, "hour")
+
+    if first_hour < last_hour:
+        buckets = (
+            _fetch_rollups("minute", get_bucket_start(start, "minute"), first_hour)
+            + _fetch_rollups("hour", first_hour, last_hour)
+            + _fetch_rollups("minute", last_hour, end)
+        )
+    else:
+        buckets = _fetch_rollups("minute", get_bucket_start(start, "minute"), end)
+
+    sketch = LatencySketch()
+    errors = 0
+    for bucket in buckets:
+        sketch.merge(LatencySketch.from_json(bucket.latency_sketch))
+        errors += cint(bucket.error_count)
+
+    summary: dict[str, Any] = {
+        "start": start,
+        "end": end,
+        "count": sketch.count,
+        "errors": errors,
+        "error_rate": round(errors / sketch.count, 4) if sketch.count else 0.0,
+        "mean_ms": _round(sketch.mean()),
+        "max_ms": _round(sketch.max) if sketch.count else None,
+        "buckets": len(buckets),
+    }
+    for label, q in QUANTILES.items():
+        summary[label] = _round(sketch.quantile(q))
+    return summary
+
+
+def _fetch_metrics_after(
+    watermark: tuple[str, str] | None, settled: datetime, limit: int
+) -> list[dict[str, Any]]:
+    values: dict[str, Any] = {"settled": settled, "limit": limit}
+    after = ""
+    if watermark:
+        values["creation"], values["name"] = watermark
+        after = (
+            "AND (`creation` > %(creation)s"
+            " OR (`creation` = %(creation)s AND `name` > %(name)s))"
+        )
+
+    return frappe.db.sql(
+        f"""
+        SELECT `name`, `creation`, `event_ts`, `execution_ms`, `status`
+        FROM `tabDesk Navbar Search Metric`
+        WHERE `creation` < %(settled)s {after}
+        ORDER BY `creation`, `name`
+        LIMIT %(limit)s
+        """,
+        values,
+        as_dict=True,
+    )
+
+
+def _merge_into_rollups(rows: list[dict[str, Any]]) -> None:
+    """Add ``rows`` to their minute and hour buckets, creating missing ones."""
+    aggregates: dict[tuple[str, datetime], frappe._dict] = {}
+    for row in rows:
+        timestamp = get_datetime(row.event_ts or row.creation)
+        execution_ms = flt(row.execution_ms)
+        for period in PERIODS:
+            key = (period, get_bucket_start(timestamp, period))
+            agg = aggregates.get(key)
+            if agg is None:
+                agg = aggregates[key] = frappe._dict(
+                    count=0, errors=0, total_ms=0.0, sketch=LatencySketch()
+                )
+            agg.count += 1
+            agg.errors += row.status == "error"
+            agg.total_ms += execution_ms
+            agg.sketch.add(execution_ms)
+
+    now = now_datetime()
+    new_rows = []
+    for period in PERIODS:
+        starts = [start for bucket_period, start in aggregates if bucket_period == period]
+        existing = {
+            get_datetime(row.bucket_start): row
+            for row in frappe.get_all(
+                ROLLUP_DOCTYPE,
+                filters={"period": period, "bucket_start": ["in", starts]},
+                fields=[
+                    "name",
+                    "bucket_start",
+                    "search_count",
+                    "error_count",
+                    "total_ms",
+                    "latency_sketch",
+                ],
+            )
+        }
+        for start in starts:
+            agg = aggregates[(period, start)]
+            current = existing.get(start)
+            if current is None:
+                new_rows.append(
+                    (
+                        frappe.generate_hash(length=10),
+                        now,
+                        now,
+                        "Administrator",
+                        "Administrator",
+                        period,
+                        start,
+                        agg.count,
+                        agg.errors,
+                        agg.total_ms,
+                        agg.sketch.to_json(),
+                    )
+                )
+                continue
+
+            sketch = LatencySketch.from_json(current.latency_sketch)
+            sketch.merge(agg.sketch)
+            frappe.db.set_value(
+                ROLLUP_DOCTYPE,
+                current.name,
+                {
+                    "search_count": cint(current.search_count) + agg.count,
+                    "error_count": cint(current.error_count) + agg.errors,
+                    "total_ms": flt(current.total_ms) + agg.total_ms,
+                    "latency_sketch": sketch.to_json(),
+                },
+                update_modified=False,
+            )
+
+    if new_rows:
+        frappe.db.bulk_insert(ROLLUP_DOCTYPE, ROLLUP_FIELDS, new_rows)
+
+
+def _fetch_rollups(period: str, start: datetime, end: datetime) -> list[dict[str, Any]]:
+    if start >= end:
+        return []
+    return frappe.get_all(
+        ROLLUP_DOCTYPE,
+        filters=[
+            ["period", "=", period],
+            ["bucket_start", ">=", start],
+            ["bucket_start", "<", end],
+        ],
+        fields=["error_count", "latency_sketch"],
+        limit_page_length=0,
+    )
+
+
+def _delete_in_chunks(doctype: str, filters: list[list[Any]], chunk_size: int) -> int:
+    deleted = 0
+    while True:
+        names = frappe.get_all(
+            doctype, filters=filters, pluck="name", limit_page_length=chunk_size
+        )
+        if not names:
+            break
+        frappe.db.delete(doctype, {"name": ["in", names]})
+        frappe.db.commit()
+        deleted += len(names)
+        if len(names) < chunk_size:
+            break
+    return deleted
+
+
+def _get_watermark() -> tuple[str, str] | None:
+    raw = frappe.db.get_global(WATERMARK_KEY)
+    return tuple(json.loads(raw)) if raw else None
+
+
+def _set_watermark(watermark: tuple[Any, str]) -> None:
+    frappe.db.set_global(WATERMARK_KEY, json.dumps([str(watermark[0]), watermark[1]]))
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
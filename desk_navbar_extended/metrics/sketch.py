@@ -0,0 +1,122 @@
+"""Mergeable latency sketch with bounded relative error.
+
+Values are counted in logarithmically sized buckets (the HDR histogram /
+DDSketch layout): bucket ``i`` covers ``(gamma**(i-1), gamma**i]`` with
+``gamma = (1 + a) / (1 - a)``, so any quantile is reported within relative
+accuracy ``a`` of the true value. Two sketches merge by adding bucket
+counts, which lets per-minute rollups be combined into arbitrary ranges. It
+is free of Frappe imports so it can be tested standalone.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Iterable
+from typing import Any
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Latencies at or below this (in ms) are counted in the zero bucket.
+MIN_TRACKED_VALUE = 1e-3
+
+
+class LatencySketch:
+    """Log-bucketed histogram of non-negative values."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record ``value`` ``count`` times; negative values are clamped to zero."""
+        if count <= 0:
+            return
+        value = max(float(value), 0.0)
+        if value <= MIN_TRACKED_VALUE:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: LatencySketch) -> None:
+        """Add the counts of ``other``, which must share this sketch's accuracy."""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float | None:
+        """Return the value at quantile ``q`` (0..1), or None for an empty sketch."""
+        if not self.count:
+            return None
+        q = min(max(q, 0.0), 1.0)
+        rank = q * (self.count - 1)
+
+        seen = self.zero_count
+        if rank < seen:
+            return self.min if self.min <= MIN_TRACKED_VALUE else 0.0
+
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def mean(self) -> float | None:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "a": self.relative_accuracy,
+            "n": self.count,
+            "z": self.zero_count,
+            "s": round(self.sum, 6),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "b": sorted(self.bins.items()),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LatencySketch:
+        sketch = cls(data.get("a") or DEFAULT_RELATIVE_ACCURACY)
+        sketch.bins = {int(index): int(count) for index, count in data.get("b") or []}
+        sketch.zero_count = int(data.get("z") or 0)
+        sketch.count = int(data.get("n") or 0)
+        sketch.sum = float(data.get("s") or 0)
+        if sketch.count:
+            sketch.min = float(data["min"])
+            sketch.max = float(data["max"])
+        return sketch
+
+    @classmethod
+    def from_json(cls, raw: str | None) -> LatencySketch:
+        return cls.from_dict(json.loads(raw)) if raw else cls()
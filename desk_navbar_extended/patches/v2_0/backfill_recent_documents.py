@@ -0,0 +1,64 @@
+"""Seed Desk Navbar Recent Document from Activity Log.
+
+Grouped history is served from the per-user recent documents buffer, which
+is empty right after an upgrade. Copy each user's last ``MAX_RECENT_DOCS``
+read or saved documents from Activity Log, so the first read reloads the
+buffer from the table instead of showing no history.
+"""
+
+from __future__ import annotations
+
+import frappe
+from frappe.utils import get_datetime
+
+from desk_navbar_extended import recent_docs
+
+COMMIT_EVERY = 100
+
+
+def execute() -> None:
+    """Backfill every user who has Activity Log entries but no recent documents yet."""
+
+    if not frappe.db.table_exists("Activity Log"):
+        return
+
+    users = frappe.db.sql_list(
+        """
+        SELECT DISTINCT `user`
+        FROM `tabActivity Log`
+        WHERE `status` = 'Success' AND `operation` IN ('read', 'save')
+            AND `user` IS NOT NULL AND `user` != 'Guest'
+            AND `reference_doctype` IS NOT NULL AND `reference_name` IS NOT NULL
+        """
+    )
+    done = set(frappe.get_all(recent_docs.RECENT_DOCTYPE, pluck="user", distinct=True))
+
+    for count, user in enumerate((user for user in users if user not in done), start=1):
+        rows = frappe.db.sql(
+            """
+            SELECT `reference_doctype`, `reference_name`, MAX(`creation`) AS `last_seen`
+            FROM `tabActivity Log`
+            WHERE `user` = %s AND `status` = 'Success' AND `operation` IN ('read', 'save')
+                AND `reference_doctype` IS NOT NULL AND `reference_name` IS NOT NULL
+                AND `reference_doctype` NOT IN %s
+            GROUP BY `reference_doctype`, `reference_name`
+            ORDER BY `last_seen` DESC
+            LIMIT %s
+            """,
+            (user, tuple(recent_docs.SKIPPED_DOCTYPES), recent_docs.MAX_RECENT_DOCS),
+            as_dict=True,
+        )
+        if rows:
+            recent_docs.write_entries(
+                user,
+                [
+                    {
+                        "doctype": row.reference_doctype,
+                        "name": row.reference_name,
+                        "timestamp": get_datetime(row.last_seen),
+                    }
+                    for row in rows
+                ],
+            )
+        if count % COMMIT_EVERY == 0:
+            frappe.db.commit()
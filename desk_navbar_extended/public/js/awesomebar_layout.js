@@ -8,8 +8,18 @@
     wrapped: false,
     settings: null,
     lastSearch: null,
+    queue: [],
+    flushTimer: null,
+    flushBound: false,
   };
 
+  const METRICS_METHOD = "desk_navbar_extended.api.log_search_metrics_batch";
+  // Flush once this many events are queued, or this long after the first one.
+  const METRICS_BATCH_SIZE = 20;
+  const METRICS_FLUSH_INTERVAL_MS = 10000;
+  // Matches MAX_METRIC_BATCH on the server.
+  const METRICS_MAX_BATCH = 200;
+
   function resolveAwesomebarInput() {
     const candidates = [
       "#navbar-search",
@@ -50,16 +60,60 @@
     setTimeout(() => waitForSearch(callback, attempts + 1), 150);
   }
 
+  function sampleRate() {
+    const rate = analyticsState.settings?.analytics?.sample_rate;
+    return typeof rate === "number" ? rate : 1;
+  }
+
   function logSearchMetrics(payload) {
-    frappe.call({
-      method: "desk_navbar_extended.api.log_search_metrics",
-      args: { payload: JSON.stringify(payload) },
-      freeze: false,
+    if (Math.random() >= sampleRate()) return;
+    analyticsState.queue.push({
+      ...payload,
+      event_ts: frappe.datetime.now_datetime(),
     });
+    if (analyticsState.queue.length >= METRICS_BATCH_SIZE) {
+      flushMetrics();
+    } else if (!analyticsState.flushTimer) {
+      analyticsState.flushTimer = setTimeout(flushMetrics, METRICS_FLUSH_INTERVAL_MS);
+    }
+  }
+
+  function flushMetrics({ beacon = false } = {}) {
+    clearTimeout(analyticsState.flushTimer);
+    analyticsState.flushTimer = null;
+    const events = analyticsState.queue.splice(0, METRICS_MAX_BATCH);
+    if (!events.length) return;
+
+    // sendBeacon survives page unload but cannot set headers, so the CSRF
+    // token travels in the form body, which Frappe also accepts.
+    if (beacon && navigator.sendBeacon) {
+      const body = new FormData();
+      body.append("events", JSON.stringify(events));
+      body.append("csrf_token", frappe.csrf_token);
+      if (navigator.sendBeacon(`/api/method/${METRICS_METHOD}`, body)) return;
+    }
+
+    frappe
+      .call({
+        method: METRICS_METHOD,
+        args: { events: JSON.stringify(events) },
+        freeze: false,
+      })
+      .catch(() => {});
+  }
+
+  function bindMetricsFlush() {
+    if (analyticsState.flushBound) return;
+    analyticsState.flushBound = true;
+    document.addEventListener("visibilitychange", () => {
+      if (document.visibilityState === "hidden") flushMetrics({ beacon: true });
+    });
+    window.addEventListener("pagehide", () => flushMetrics({ beacon: true }));
   }
 
   function installAnalytics() {
     if (analyticsState.wrapped) return;
+    bindMetricsFlush();
     waitForSearch(() => {
       const original = frappe.search.utils.search;
       if (original.__deskNavbarWrapped) return;
@@ -109,6 +163,9 @@
     });
   }
 
+  window.desk_navbar_extended.awesomebar.logSearchMetrics = logSearchMetrics;
+  window.desk_navbar_extended.awesomebar.flushMetrics = flushMetrics;
+
   window.desk_navbar_extended.awesomebar.init = (settings) => {
     analyticsState.settings = settings;
     applyWidth(settings.awesomebar.default_width);
@@ -4,6 +4,21 @@
 (() => {
   frappe.provide("desk_navbar_extended.command_palette");
 
+  // Sources in display order, with the feature flag each one depends on.
+  const SOURCES = [
+    ["doctypes", null],
+    ["saved_searches", "saved_searches"],
+    ["pins", "pins"],
+    ["recent", "grouped_history"],
+    ["quick_create", "quick_create"],
+    ["help", null],
+  ];
+  // The scorer doubles as a Web Worker so ranking never blocks typing.
+  const FUZZY_WORKER_URL = "/assets/desk_navbar_extended/js/fuzzy.js";
+  // Beyond this many entries the server ranks the catalog instead of the browser.
+  const SERVER_RANK_THRESHOLD = 20000;
+  const MAX_RESULTS = 50;
+
   let state = {
     isOpen: false,
     query: "",
@@ -13,6 +28,16 @@
     modal: null,
     input: null,
     list: null,
+    view: null,
+    rowOfResult: [],
+    sources: {},
+    pending: 0,
+    loadId: 0,
+    fuzzy: null,
+    boosts: {},
+    worker: null,
+    searchId: 0,
+    pendingSearch: null,
   };
 
   function init() {
@@ -20,11 +45,12 @@
       return;
     setupKeyboard();
     buildModal();
+    state.worker = createWorker();
     console.log("[Command Palette] Ready");
   }
 
   function setupKeyboard() {
-    $(document).on("keydown.cmdpal", (e) => {
+    $(document).off("keydown.cmdpal").on("keydown.cmdpal", (e) => {
       const isMac = navigator.platform.toUpperCase().includes("MAC");
       if ((isMac ? e.metaKey : e.ctrlKey) && e.key === "k") {
         e.preventDefault();
@@ -69,6 +95,13 @@
     state.modal = $(".cmd-palette");
     state.input = state.modal.find(".cmd-palette__input");
     state.list = state.modal.find(".cmd-palette__results");
+    state.view = new desk_navbar_extended.VirtualList({
+      container: state.list,
+      rowType: (row) => (row.header ? "header" : "item"),
+      rowHeights: { header: 32, item: 60 },
+      createRow: createRow,
+      renderRow: renderRow,
+    });
     bindEvents();
   }
 
@@ -88,7 +121,8 @@
       }
     });
     state.list.on("click", ".cmd-palette__item", function () {
-      selectIdx($(this).data("idx"));
+      // Rows are recycled, so read the live attribute rather than jQuery's data cache.
+      selectIdx(Number(this.dataset.idx));
     });
   }
 
@@ -112,85 +146,245 @@
     $("body").css("overflow", "");
   }
 
+  function enabledSources() {
+    const features = frappe.desk_navbar_extended?.settings?.features || {};
+    return SOURCES.filter(([, feature]) => !feature || features[feature]).map(
+      ([source]) => source,
+    );
+  }
+
   async function loadCommands() {
+    // Each source is fetched on its own; results render as they arrive.
+    const loadId = ++state.loadId;
+    const sources = enabledSources();
+    state.sources = {};
+    state.pending = sources.length;
+    state.allResults = [];
+    state.filteredResults = [];
     showLoading();
+
+    await Promise.all(
+      sources.map(async (source) => {
+        let items = [];
+        try {
+          const { message } = await frappe.call({
+            method:
+              "desk_navbar_extended.api.command_palette.get_command_palette_source",
+            type: "GET",
+            args: { source },
+            freeze: false,
+          });
+          items = message || [];
+        } catch (err) {
+          console.error(`[Command Palette] Load error (${source}):`, err);
+        }
+        if (loadId !== state.loadId) return;
+        state.pending -= 1;
+        state.sources[source] = buildResults({ [source]: items });
+        mergeSources();
+      }),
+    );
+  }
+
+  function mergeSources() {
+    // Concatenate in fixed source order so late sources never reorder earlier ones,
+    // and keep the highlighted entry highlighted while new ones come in.
+    const selected = state.filteredResults[state.selectedIdx];
+    state.allResults = SOURCES.flatMap(([source]) => state.sources[source] || []);
+    indexResults();
+    applyFilter(selected);
+  }
+
+  function createWorker() {
+    if (typeof Worker === "undefined") return null;
+    try {
+      const worker = new Worker(FUZZY_WORKER_URL);
+      worker.onmessage = ({ data }) => {
+        if (state.pendingSearch?.id !== data.id) return;
+        state.pendingSearch.done(fromRanked(data.results));
+      };
+      worker.onerror = () => {
+        // Fall back to ranking on the main thread.
+        state.worker = null;
+        indexResults();
+        if (state.isOpen) applyFilter(null);
+      };
+      return worker;
+    } catch (err) {
+      return null;
+    }
+  }
+
+  function searchText(result) {
+    return [result.title, result.description, result.category]
+      .filter(Boolean)
+      .join(" ");
+  }
+
+  function indexResults() {
+    if (state.allResults.length > SERVER_RANK_THRESHOLD) return;
+    const texts = state.allResults.map(searchText);
+    // Frecency from the server lifts the entries the user opens most.
+    state.boosts = {};
+    state.allResults.forEach((result, idx) => {
+      if (result.frecency > 0) state.boosts[idx] = result.frecency;
+    });
+    if (state.worker) {
+      state.worker.postMessage({ type: "index", texts, boosts: state.boosts });
+    } else if (window.desk_navbar_extended?.fuzzy) {
+      state.fuzzy = new desk_navbar_extended.fuzzy.FuzzyIndex(texts);
+    }
+  }
+
+  function applyFilter(selected) {
+    const id = ++state.searchId;
+    const done = (results) => {
+      if (id !== state.searchId) return;
+      state.pendingSearch = null;
+      state.filteredResults = results;
+      const idx = selected ? results.indexOf(selected) : -1;
+      state.selectedIdx = idx >= 0 ? idx : 0;
+      render();
+    };
+
+    if (!state.query) {
+      done(state.allResults);
+    } else if (state.allResults.length > SERVER_RANK_THRESHOLD) {
+      rankOnServer(done);
+    } else if (state.worker) {
+      state.pendingSearch = { id, done };
+      state.worker.postMessage({
+        type: "search",
+        id,
+        query: state.query,
+        k: MAX_RESULTS,
+      });
+    } else if (state.fuzzy) {
+      done(
+        fromRanked(state.fuzzy.search(state.query, MAX_RESULTS, state.boosts)),
+      );
+    } else {
+      done(filterResults(state.allResults));
+    }
+  }
+
+  async function rankOnServer(done) {
     try {
       const { message } = await frappe.call({
         method:
-          "desk_navbar_extended.api.command_palette.get_command_palette_sources",
+          "desk_navbar_extended.api.command_palette.search_command_palette",
+        type: "GET",
+        args: { query: state.query, limit: MAX_RESULTS },
         freeze: false,
       });
-      state.allResults = buildResults(message);
-      state.filteredResults = state.allResults;
-      state.selectedIdx = 0;
-      render();
+      done(
+        groupByCategory(
+          (message || []).map(
+            (entry) => buildResults({ [entry.source]: [entry] })[0],
+          ),
+        ),
+      );
     } catch (err) {
-      console.error("[Command Palette] Load error:", err);
-      showEmpty();
+      console.error("[Command Palette] Search error:", err);
     }
   }
 
-  function handleInput() {
-    state.query = state.input.val().toLowerCase().trim();
-    if (!state.query) {
-      state.filteredResults = state.allResults;
-      state.selectedIdx = 0;
-      render();
-      return;
-    }
-    state.filteredResults = state.allResults.filter(
+  function fromRanked(ranked) {
+    return groupByCategory(ranked.map(([, idx]) => state.allResults[idx]));
+  }
+
+  function groupByCategory(results) {
+    // Categories appear in the order of their best match, so list order matches render order.
+    const groups = new Map();
+    results.forEach((result) => {
+      const category = result.category || "Other";
+      if (!groups.has(category)) groups.set(category, []);
+      groups.get(category).push(result);
+    });
+    return [...groups.values()].flat();
+  }
+
+  function filterResults(results) {
+    if (!state.query) return results;
+    return results.filter(
       (r) =>
         (r.title || "").toLowerCase().includes(state.query) ||
         (r.description || "").toLowerCase().includes(state.query) ||
         (r.category || "").toLowerCase().includes(state.query),
     );
-    state.selectedIdx = 0;
-    render();
+  }
+
+  function handleInput() {
+    state.query = state.input.val().toLowerCase().trim();
+    applyFilter(null);
   }
 
   function render() {
-    hideLoading();
     const items = state.filteredResults;
     if (!items || items.length === 0) {
-      showEmpty();
+      if (state.pending > 0) {
+        showLoading();
+      } else {
+        hideLoading();
+        showEmpty();
+      }
       return;
     }
+    hideLoading();
     hideEmpty();
-    const grouped = items.reduce((acc, item, idx) => {
+    // Results arrive grouped by category; a header row starts each group.
+    const rows = [];
+    state.rowOfResult = [];
+    let category = null;
+    items.forEach((item, idx) => {
       const cat = item.category || "Other";
-      if (!acc[cat]) acc[cat] = [];
-      acc[cat].push({ ...item, idx });
-      return acc;
-    }, {});
-    let html = "";
-    Object.entries(grouped).forEach(([cat, catItems]) => {
-      html += `<div class="cmd-palette__category"><div class="cmd-palette__category-label">${__(
-        cat,
-      )}</div>`;
-      catItems.forEach((item) => {
-        const sel = item.idx === state.selectedIdx ? "is-selected" : "";
-        html += `<div class="cmd-palette__item ${sel}" data-idx="${
-          item.idx
-        }" role="option" aria-selected="${item.idx === state.selectedIdx}">`;
-        html += `<div class="cmd-palette__item-icon">${
-          item.icon
-            ? `<i class="${item.icon}"></i>`
-            : item.doctype
-            ? item.doctype.charAt(0)
-            : "•"
-        }</div>`;
-        html += `<div class="cmd-palette__item-content"><div class="cmd-palette__item-title">${frappe.utils.escape_html(
-          item.title || "",
-        )}</div>`;
-        if (item.description)
-          html += `<div class="cmd-palette__item-desc">${frappe.utils.escape_html(
-            item.description,
-          )}</div>`;
-        html += `</div></div>`;
-      });
-      html += `</div>`;
+      if (cat !== category) {
+        rows.push({ header: cat });
+        category = cat;
+      }
+      state.rowOfResult[idx] = rows.length;
+      rows.push({ item, idx });
     });
-    state.list.html(html);
+    state.view.setItems(rows);
+    state.view.setSelected(state.rowOfResult[state.selectedIdx] ?? -1, {
+      scroll: false,
+    });
+  }
+
+  function createRow(type) {
+    const el = document.createElement("div");
+    if (type === "header") {
+      el.className = "cmd-palette__category-label";
+    } else {
+      el.className = "cmd-palette__item";
+      el.setAttribute("role", "option");
+      el.setAttribute("aria-selected", "false");
+    }
+    return el;
+  }
+
+  function renderRow(el, row) {
+    if (row.header) {
+      el.textContent = __(row.header);
+      return;
+    }
+    const { item, idx } = row;
+    el.dataset.idx = idx;
+    const icon = item.icon
+      ? `<i class="${item.icon}"></i>`
+      : item.doctype
+      ? frappe.utils.escape_html(item.doctype.charAt(0))
+      : "•";
+    let html = `<div class="cmd-palette__item-icon">${icon}</div>`;
+    html += `<div class="cmd-palette__item-content"><div class="cmd-palette__item-title">${frappe.utils.escape_html(
+      item.title || "",
+    )}</div>`;
+    if (item.description)
+      html += `<div class="cmd-palette__item-desc">${frappe.utils.escape_html(
+        item.description,
+      )}</div>`;
+    html += `</div>`;
+    el.innerHTML = html;
   }
 
   function navigate(dir) {
@@ -200,20 +394,8 @@
   }
 
   function updateSelection() {
-    state.list.find(".cmd-palette__item").each((idx, el) => {
-      const $el = $(el);
-      const itemIdx = parseInt($el.data("idx"));
-      $el
-        .toggleClass("is-selected", itemIdx === state.selectedIdx)
-        .attr("aria-selected", itemIdx === state.selectedIdx);
-    });
-    scrollToSelected();
-  }
-
-  function scrollToSelected() {
-    const $sel = state.list.find(".is-selected");
-    if ($sel.length)
-      $sel[0].scrollIntoView({ block: "nearest", behavior: "smooth" });
+    // Only the previous and the new row are touched.
+    state.view.setSelected(state.rowOfResult[state.selectedIdx] ?? -1);
   }
 
   function select() {
@@ -47,10 +47,27 @@
     return cached.value;
   }
 
+  function readBootSettings() {
+    const booted = frappe.boot?.desk_navbar_extended;
+    if (!booted || typeof booted !== "object" || !booted.features || booted.degraded) {
+      return null;
+    }
+    return JSON.parse(JSON.stringify(booted));
+  }
+
   async function fetchSettings(force = false) {
     if (!force && state.settings) return state.settings;
 
     if (!force) {
+      // Settings are embedded in frappe.boot by the boot_session hook, which
+      // saves a blocking round trip on every full page load.
+      const booted = readBootSettings();
+      if (booted) {
+        state.settings = booted;
+        cacheWrite(SETTINGS_CACHE_KEY, booted);
+        return state.settings;
+      }
+
       const cached = cacheRead(SETTINGS_CACHE_KEY, SETTINGS_CACHE_TTL);
       if (cached) {
         state.settings = cached;
@@ -63,7 +80,8 @@
     });
     const normalized = JSON.parse(JSON.stringify(message || {}));
     state.settings = normalized;
-    cacheWrite(SETTINGS_CACHE_KEY, normalized);
+    // Fallback settings from a server error are used once, never cached.
+    if (!normalized.degraded) cacheWrite(SETTINGS_CACHE_KEY, normalized);
     return state.settings;
   }
 
@@ -0,0 +1,75 @@
+/**
+ * Frecency - Records desk page visits so the palette and search can rank by habit
+ *
+ * Visits are queued and sent in batches; the server keys them by route and
+ * keeps a decaying score per route for each user.
+ */
+(() => {
+  frappe.provide("desk_navbar_extended.frecency");
+
+  const VISITS_METHOD = "desk_navbar_extended.api.command_palette.record_visits";
+  // Flush once this many visits are queued, or this long after the first one.
+  const VISITS_BATCH_SIZE = 10;
+  const VISITS_FLUSH_INTERVAL_MS = 30000;
+  // Matches MAX_VISIT_BATCH on the server.
+  const VISITS_MAX_BATCH = 100;
+
+  let state = {
+    queue: [],
+    flushTimer: null,
+    lastRoute: null,
+    bound: false,
+  };
+
+  function init() {
+    if (!frappe.desk_navbar_extended?.settings?.features?.command_palette)
+      return;
+    if (state.bound) return;
+    state.bound = true;
+    frappe.router?.on?.("change", () => recordVisit(window.location.pathname));
+    document.addEventListener("visibilitychange", () => {
+      if (document.visibilityState === "hidden") flush({ beacon: true });
+    });
+    window.addEventListener("pagehide", () => flush({ beacon: true }));
+    recordVisit(window.location.pathname);
+    console.log("[Frecency] Ready");
+  }
+
+  function recordVisit(route) {
+    // Re-renders of the same page are not new visits.
+    if (!route || route === state.lastRoute) return;
+    state.lastRoute = route;
+    state.queue.push({ route, ts: Math.floor(Date.now() / 1000) });
+    if (state.queue.length >= VISITS_BATCH_SIZE) {
+      flush();
+    } else if (!state.flushTimer) {
+      state.flushTimer = setTimeout(flush, VISITS_FLUSH_INTERVAL_MS);
+    }
+  }
+
+  function flush({ beacon = false } = {}) {
+    clearTimeout(state.flushTimer);
+    state.flushTimer = null;
+    const visits = state.queue.splice(0, VISITS_MAX_BATCH);
+    if (!visits.length) return;
+
+    // sendBeacon cannot set headers, so the CSRF token travels in the form body.
+    if (beacon && navigator.sendBeacon) {
+      const body = new FormData();
+      body.append("visits", JSON.stringify(visits));
+      body.append("csrf_token", frappe.csrf_token);
+      if (navigator.sendBeacon(`/api/method/${VISITS_METHOD}`, body)) return;
+    }
+
+    frappe
+      .call({
+        method: VISITS_METHOD,
+        args: { visits: JSON.stringify(visits) },
+        freeze: false,
+      })
+      .catch(() => {});
+  }
+
+  frappe.desk_navbar_extended.frecency = { init, recordVisit, flush };
+  $(document).on("frappe.desk_navbar_extended.ready", init);
+})();
@@ -0,0 +1,175 @@
+/**
+ * Fuzzy - Subsequence scorer shared by the command palette and its Web Worker
+ *
+ * Mirrors desk_navbar_extended/search/fuzzy.py: query characters must appear in
+ * order; prefixes, word starts, consecutive runs and initials score higher, gaps
+ * and long texts lower. Loaded as a regular script it exposes
+ * desk_navbar_extended.fuzzy; loaded with `new Worker(url)` it answers
+ * {type: "index", texts} and {type: "search", id, query, k} messages.
+ */
+(() => {
+  const MATCH = 1;
+  const CONSECUTIVE = 4;
+  const BOUNDARY = 4;
+  const WORD_START = 8;
+  const PREFIX = 10;
+  const SUBSTRING = 6;
+  const ACRONYM = 8;
+  const GAP = 0.2;
+  const MAX_GAP_PENALTY = 3;
+  const LENGTH_PENALTY = 0.01;
+  const SEPARATORS = new Set(" -_/.:()[],");
+
+  function wordStarts(text) {
+    const starts = [];
+    let prev = "";
+    for (let idx = 0; idx < text.length; idx++) {
+      const char = text[idx];
+      const upper = char !== char.toLowerCase();
+      if (
+        !SEPARATORS.has(char) &&
+        (!prev || SEPARATORS.has(prev) || (upper && prev !== prev.toUpperCase()))
+      ) {
+        starts.push(idx);
+      }
+      prev = char;
+    }
+    return starts;
+  }
+
+  function compileText(text) {
+    text = text || "";
+    const lower = text.toLowerCase();
+    const starts = wordStarts(lower.length === text.length ? text : lower);
+    return {
+      text: lower,
+      starts,
+      boundaries: new Set(starts),
+      initials: starts.map((start) => lower[start]).join(""),
+    };
+  }
+
+  function aligned(query, item, anchor) {
+    const { text, boundaries } = item;
+    let total = MATCH;
+    if (anchor === 0) total += PREFIX;
+    else if (boundaries.has(anchor)) total += WORD_START;
+
+    if (text.startsWith(query, anchor)) {
+      return total + (query.length - 1) * (MATCH + CONSECUTIVE) + SUBSTRING;
+    }
+
+    let pos = anchor;
+    for (let i = 1; i < query.length; i++) {
+      const next = text.indexOf(query[i], pos + 1);
+      if (next < 0) return null;
+      total += MATCH;
+      if (next === pos + 1) total += CONSECUTIVE;
+      else if (boundaries.has(next)) total += BOUNDARY;
+      else total -= Math.min((next - pos - 1) * GAP, MAX_GAP_PENALTY);
+      pos = next;
+    }
+    return total;
+  }
+
+  function scoreItem(query, item) {
+    const first = query[0];
+    const plain = item.text.indexOf(first);
+    if (plain < 0) return null;
+
+    const anchors = item.starts.filter((start) => item.text[start] === first);
+    if (!item.boundaries.has(plain)) anchors.push(plain);
+    let best = null;
+    for (const anchor of anchors) {
+      const value = aligned(query, item, anchor);
+      if (value !== null && (best === null || value > best)) best = value;
+    }
+    if (best === null) return null;
+    if (item.initials.startsWith(query)) best += ACRONYM;
+    return best - LENGTH_PENALTY * item.text.length;
+  }
+
+  function isSubsequence(query, text) {
+    let pos = -1;
+    for (let i = 0; i < query.length; i++) {
+      pos = text.indexOf(query[i], pos + 1);
+      if (pos < 0) return false;
+    }
+    return true;
+  }
+
+  function score(query, text) {
+    query = (query || "").trim().toLowerCase();
+    return query ? scoreItem(query, compileText(text)) : null;
+  }
+
+  class FuzzyIndex {
+    constructor(texts) {
+      this.items = (texts || []).map(compileText);
+    }
+
+    get size() {
+      return this.items.length;
+    }
+
+    /**
+     * Return up to `k` [score, position] pairs, best first; ties keep item order.
+     * `boosts` optionally maps positions to a bonus added to their score, such as
+     * the user's frecency; an empty query then lists boosted items first.
+     */
+    search(query, k = 20, boosts = null) {
+      query = (query || "").trim().toLowerCase();
+      boosts = boosts || {};
+      if (k <= 0) return [];
+      if (!query) {
+        const ranked = Object.entries(boosts)
+          .map(([idx, value]) => [value, Number(idx)])
+          .filter(([value]) => value > 0)
+          .sort((a, b) => b[0] - a[0] || a[1] - b[1])
+          .slice(0, k);
+        for (let idx = 0; idx < this.items.length && ranked.length < k; idx++) {
+          if (!(boosts[idx] > 0)) ranked.push([0, idx]);
+        }
+        return ranked;
+      }
+
+      // Kept sorted best first; only entries that can still enter the top k are inserted.
+      const top = [];
+      this.items.forEach((item, idx) => {
+        if (!isSubsequence(query, item.text)) return;
+        let value = scoreItem(query, item);
+        if (value === null) return;
+        value += boosts[idx] || 0;
+        if (top.length === k && value <= top[k - 1][0]) return;
+        let at = top.length;
+        while (at > 0 && top[at - 1][0] < value) at--;
+        top.splice(at, 0, [value, idx]);
+        if (top.length > k) top.pop();
+      });
+      return top;
+    }
+  }
+
+  const api = { score, compileText, FuzzyIndex };
+
+  if (typeof window === "undefined" && typeof self !== "undefined") {
+    // Running as a Web Worker: one index per worker, replaced on every "index" message.
+    let index = new FuzzyIndex([]);
+    let boosts = null;
+    self.onmessage = ({ data }) => {
+      if (data.type === "index") {
+        index = new FuzzyIndex(data.texts);
+        boosts = data.boosts || null;
+      } else if (data.type === "search") {
+        self.postMessage({
+          id: data.id,
+          results: index.search(data.query, data.k, boosts),
+        });
+      }
+    };
+    return;
+  }
+
+  frappe.provide("desk_navbar_extended");
+  desk_navbar_extended.fuzzy = api;
+})();
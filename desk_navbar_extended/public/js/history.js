@@ -4,7 +4,7 @@
 (() => {
   frappe.provide("desk_navbar_extended.history");
 
-  let state = { groups: [], menu: null };
+  let state = { groups: [], menu: null, view: null };
 
   function init() {
     if (!frappe.desk_navbar_extended?.settings?.features?.grouped_history)
@@ -23,12 +23,22 @@
           </button>
           <div class="dropdown-menu dropdown-menu-right history-menu__dropdown">
             <div class="history-menu__loading">${__("Loading...")}</div>
+            <div class="history-menu__empty text-muted" hidden>${__(
+              "No recent activity",
+            )}</div>
             <div class="history-menu__groups"></div>
           </div>
         </div>
       </div>`;
     $(".navbar-right").prepend(html);
     state.menu = $(".history-menu__groups");
+    state.view = new desk_navbar_extended.VirtualList({
+      container: state.menu,
+      rowType: (row) => (row.group ? "header" : "item"),
+      rowHeights: { header: 36, item: 56 },
+      createRow: createRow,
+      renderRow: renderRow,
+    });
   }
 
   async function loadHistory() {
@@ -75,43 +85,52 @@
   function render() {
     hideLoading();
     if (!state.menu) return;
-    if (!state.groups.length) {
-      state.menu.html(
-        `<div class="history-menu__empty text-muted">${__(
-          "No recent activity",
-        )}</div>`,
-      );
-      return;
-    }
+    $(".history-menu__empty").prop("hidden", state.groups.length > 0);
 
-    let html = "";
+    // One header row per group followed by its items.
+    const rows = [];
     state.groups.forEach((group) => {
-      const icon = group.icon || "fa fa-file";
+      rows.push({ group });
+      (group.items || []).forEach((item) => rows.push({ item }));
+    });
+    state.view.setItems(rows);
+  }
+
+  function createRow(type) {
+    if (type === "header") {
+      const el = document.createElement("div");
+      el.className = "history-group__header";
+      return el;
+    }
+    const el = document.createElement("a");
+    el.className = "dropdown-item history-item";
+    return el;
+  }
+
+  function renderRow(el, row) {
+    if (row.group) {
+      const { group } = row;
       const label = frappe.utils.escape_html(
         group.label || group.doctype || "",
       );
-      html += `<div class="history-group">`;
-      html += `<div class="history-group__header"><i class="${icon}"></i> ${label} <span class="badge">${
+      el.innerHTML = `<i class="${
+        group.icon || "fa fa-file"
+      }"></i> ${label} <span class="badge">${
         group.count || group.items?.length || 0
-      }</span></div>`;
-      html += `<div class="history-group__items">`;
-      (group.items || []).forEach((item) => {
-        const title = frappe.utils.escape_html(
-          item.title || item.name || item.doc_name || "",
-        );
-        html += `<a class="dropdown-item history-item" href="${
-          item.route || "#"
-        }">`;
-        html += `<span class="history-item__name">${title}</span>`;
-        if (item.modified)
-          html += `<span class="history-item__time text-muted">${comment_when(
-            item.modified,
-          )}</span>`;
-        html += `</a>`;
-      });
-      html += `</div></div>`;
-    });
-    state.menu.html(html);
+      }</span>`;
+      return;
+    }
+    const { item } = row;
+    const title = frappe.utils.escape_html(
+      item.title || item.name || item.doc_name || "",
+    );
+    el.setAttribute("href", item.route || "#");
+    let html = `<span class="history-item__name">${title}</span>`;
+    if (item.modified)
+      html += `<span class="history-item__time text-muted">${comment_when(
+        item.modified,
+      )}</span>`;
+    el.innerHTML = html;
   }
 
   function showLoading() {
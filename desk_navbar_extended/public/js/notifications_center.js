@@ -4,7 +4,13 @@
 (() => {
   frappe.provide("desk_navbar_extended.notifications_center");
 
-  let state = { notifications: [], panel: null, badge: null, unreadCount: 0 };
+  let state = {
+    notifications: [],
+    panel: null,
+    badge: null,
+    view: null,
+    unreadCount: 0,
+  };
 
   function init() {
     if (!frappe.desk_navbar_extended?.settings?.features?.notifications_center)
@@ -30,6 +36,9 @@
               )}</button>
             </div>
             <div class="notifications-center__loading">${__("Loading...")}</div>
+            <div class="notifications-center__empty" hidden>${__(
+              "No notifications",
+            )}</div>
             <div class="notifications-center__list"></div>
           </div>
         </div>
@@ -40,6 +49,15 @@
     state.panel
       .find(".notifications-center__mark-all")
       .on("click", markAllRead);
+    state.panel.on("click", ".notification-item__mark", function () {
+      markRead(this.closest(".notification-item").dataset.name);
+    });
+    state.view = new desk_navbar_extended.VirtualList({
+      container: state.panel.find(".notifications-center__list"),
+      rowHeights: { row: 64 },
+      createRow: createRow,
+      renderRow: renderRow,
+    });
   }
 
   async function loadNotifications() {
@@ -64,34 +82,34 @@
 
   function render() {
     hideLoading();
-    let html = "";
-    if (!state.notifications.length) {
-      html = `<div class="notifications-center__empty">${__(
-        "No notifications",
-      )}</div>`;
-    } else {
-      state.notifications.forEach((notif) => {
-        const unread = notif.read ? "" : "is-unread";
-        html += `<div class="notification-item ${unread}" data-name="${notif.name}">`;
-        html += `<div class="notification-item__content">`;
-        html += `<div class="notification-item__subject">${frappe.utils.escape_html(
-          notif.subject,
-        )}</div>`;
-        html += `<div class="notification-item__time text-muted">${comment_when(
-          notif.creation,
-        )}</div>`;
-        html += `</div>`;
-        if (!notif.read)
-          html += `<button class="btn btn-xs btn-link notification-item__mark">${__(
-            "Mark read",
-          )}</button>`;
-        html += `</div>`;
-      });
-    }
-    state.panel.find(".notifications-center__list").html(html);
-    state.panel.find(".notification-item__mark").on("click", function () {
-      markRead($(this).closest(".notification-item").data("name"));
-    });
+    state.panel
+      .find(".notifications-center__empty")
+      .prop("hidden", state.notifications.length > 0);
+    state.view.setItems(state.notifications);
+  }
+
+  function createRow() {
+    const el = document.createElement("div");
+    el.className = "notification-item";
+    el.innerHTML = `<div class="notification-item__content">
+        <div class="notification-item__subject"></div>
+        <div class="notification-item__time text-muted"></div>
+      </div>
+      <button class="btn btn-xs btn-link notification-item__mark">${__(
+        "Mark read",
+      )}</button>`;
+    return el;
+  }
+
+  function renderRow(el, notif) {
+    el.dataset.name = notif.name;
+    el.classList.toggle("is-unread", !notif.read);
+    el.querySelector(".notification-item__subject").textContent =
+      notif.subject || "";
+    el.querySelector(".notification-item__time").innerHTML = comment_when(
+      notif.creation,
+    );
+    el.querySelector(".notification-item__mark").hidden = !!notif.read;
   }
 
   function updateBadge() {
@@ -8,12 +8,18 @@
     filters: { doctype: null, owner: null, date_from: null, date_to: null },
     filterBar: null,
     originalSearch: null,
+    page: { query: null, cursor: null, more: false, loading: false },
   };
 
+  // Distance from the bottom of the dropdown (px) at which the next page loads.
+  const LOAD_MORE_THRESHOLD = 48;
+  const PAGE_SIZE = 20;
+
   function init() {
     if (!frappe.desk_navbar_extended?.settings?.features?.smart_filters) return;
     buildFilterBar();
     hookIntoAwesomebar();
+    bindLazyLoad();
     console.log("[Search Filters] Ready");
   }
 
@@ -200,6 +206,11 @@
       state.filterBar.find(".search-filter__date-from").val() || null;
     state.filters.date_to =
       state.filterBar.find(".search-filter__date-to").val() || null;
+    resetPage();
+  }
+
+  function resetPage(query = null, cursor = null) {
+    state.page = { query, cursor, more: !!cursor, loading: false };
   }
 
   function clearFilters() {
@@ -235,27 +246,89 @@
     };
   }
 
+  function searchArgs(query) {
+    return {
+      query,
+      doctype: state.filters.doctype,
+      owner: state.filters.owner,
+      date_from: state.filters.date_from,
+      date_to: state.filters.date_to,
+      limit: PAGE_SIZE,
+    };
+  }
+
+  // Every page, the first included, comes from the cursor endpoint so that
+  // later pages continue exactly where the previous one stopped.
+  async function fetchPage(query, cursor = null) {
+    const { message } = await frappe.call({
+      method: "desk_navbar_extended.api.search_filters.search_with_cursor",
+      args: { ...searchArgs(query), cursor },
+      freeze: false,
+    });
+    return message || {};
+  }
+
   async function customSearch(query) {
     try {
-      const { message } = await frappe.call({
-        method: "desk_navbar_extended.api.search_filters.search_with_filters",
-        args: {
-          query,
-          doctype: state.filters.doctype,
-          owner: state.filters.owner,
-          date_from: state.filters.date_from,
-          date_to: state.filters.date_to,
-          limit: 20,
-        },
-        freeze: false,
-      });
-      return message?.results || [];
+      const first = await fetchPage(query);
+      resetPage(query, first.cursor || null);
+      return first.results || [];
     } catch (err) {
       console.error("[Search Filters] Search error:", err);
+      resetPage();
       return [];
     }
   }
 
+  // Scroll events do not bubble, so listen in the capture phase for the
+  // awesomebar dropdown instead of binding to a list that is re-rendered.
+  function bindLazyLoad() {
+    if (state.lazyLoadBound) return;
+    state.lazyLoadBound = true;
+    document.addEventListener("scroll", onDropdownScroll, true);
+  }
+
+  function onDropdownScroll(event) {
+    const list = event.target;
+    if (!(list instanceof Element) || !list.matches(".awesomplete > ul")) return;
+    if (!state.page.more || state.page.loading) return;
+    if (list.scrollTop + list.clientHeight < list.scrollHeight - LOAD_MORE_THRESHOLD) return;
+    loadNextPage($(list));
+  }
+
+  async function loadNextPage($list) {
+    const page = state.page;
+    const { query } = page;
+    if (!page.more || page.loading) return;
+    page.loading = true;
+    try {
+      const next = await fetchPage(query, page.cursor);
+      // Drop the page if the query or filters changed while it was in flight.
+      if (state.page !== page) return;
+      (next.results || []).forEach((row) => $list.append(renderResult(row)));
+      page.cursor = next.cursor || null;
+      page.more = !!page.cursor;
+    } catch (err) {
+      console.error("[Search Filters] Next page error:", err);
+      page.more = false;
+    } finally {
+      page.loading = false;
+    }
+  }
+
+  function renderResult(row) {
+    const label = frappe.utils.escape_html(row.label || row.value || row.name);
+    const description = frappe.utils.escape_html(row.description || __(row.doctype));
+    const href = frappe.utils.get_form_link(row.doctype, row.name);
+    return $(`
+      <li role="option" class="sfe-page-item">
+        <a href="${href}">
+          <span>${label}</span>
+          <span class="text-muted small">${description}</span>
+        </a>
+      </li>`);
+  }
+
   function applyFilters(search) {
     if (!state.filterBar) return;
     const filters = search.filters || {};
@@ -274,6 +347,6 @@
     updateFilters();
   }
 
-  frappe.desk_navbar_extended.search_filters = { init, applyFilters };
+  frappe.desk_navbar_extended.search_filters = { init, applyFilters, loadNextPage };
   $(document).on("frappe.desk_navbar_extended.ready", init);
 })();
@@ -0,0 +1,49 @@
+QUnit.module("Awesomebar analytics", function (hooks) {
+  hooks.beforeEach(function () {
+    this.originalCall = frappe.call;
+    this.originalBeacon = navigator.sendBeacon;
+    this.calls = [];
+    frappe.call = (opts) => {
+      this.calls.push(opts);
+      return Promise.resolve({ message: { accepted: 0 } });
+    };
+    this.awesomebar = window.desk_navbar_extended.awesomebar;
+    this.awesomebar.flushMetrics();
+    this.calls.length = 0;
+  });
+
+  hooks.afterEach(function () {
+    frappe.call = this.originalCall;
+    navigator.sendBeacon = this.originalBeacon;
+  });
+
+  QUnit.test("batches events into one bulk request", function (assert) {
+    for (let i = 0; i < 20; i++) {
+      this.awesomebar.logSearchMetrics({ status: "success", search_length: i, execution_ms: 5 });
+    }
+
+    assert.strictEqual(this.calls.length, 1, "flushes once at the batch size");
+    assert.strictEqual(
+      this.calls[0].method,
+      "desk_navbar_extended.api.log_search_metrics_batch",
+      "uses the bulk endpoint",
+    );
+    assert.strictEqual(JSON.parse(this.calls[0].args.events).length, 20, "sends every event");
+  });
+
+  QUnit.test("flushes with sendBeacon when the page is hidden", function (assert) {
+    const beacons = [];
+    navigator.sendBeacon = (url, body) => {
+      beacons.push({ url, body });
+      return true;
+    };
+
+    this.awesomebar.logSearchMetrics({ status: "error", search_length: 3, execution_ms: 9 });
+    this.awesomebar.flushMetrics({ beacon: true });
+
+    assert.strictEqual(beacons.length, 1, "beacon sent");
+    assert.ok(beacons[0].url.endsWith("log_search_metrics_batch"), "targets the bulk endpoint");
+    assert.strictEqual(JSON.parse(beacons[0].body.get("events")).length, 1, "carries the event");
+    assert.strictEqual(this.calls.length, 0, "no XHR fallback needed");
+  });
+});
@@ -2,7 +2,7 @@ QUnit.module("Command Palette", function (hooks) {
   hooks.beforeEach(function () {
     this.originalCall = frappe.call;
     frappe.desk_navbar_extended = {
-      settings: { features: { command_palette: true } },
+      settings: { features: { command_palette: true, saved_searches: true } },
       command_palette: frappe.desk_navbar_extended.command_palette,
       saved_searches: {
         applySearch: function (name) {
@@ -40,7 +40,7 @@ QUnit.module("Command Palette", function (hooks) {
       ],
     };
 
-    frappe.call = () => Promise.resolve({ message: response });
+    frappe.call = (opts) => Promise.resolve({ message: response[opts.args.source] || [] });
 
     frappe.desk_navbar_extended.command_palette.init();
     $(document).trigger($.Event("keydown", { ctrlKey: true, key: "k" }));
@@ -67,4 +67,45 @@ QUnit.module("Command Palette", function (hooks) {
       }, 50);
     }, 50);
   });
+
+  QUnit.test("renders sources as they arrive in a stable order", function (assert) {
+    const done = assert.async();
+    const resolvers = {};
+    const requested = [];
+    frappe.call = (opts) => {
+      requested.push(opts.args.source);
+      return new Promise((resolve) => {
+        resolvers[opts.args.source] = resolve;
+      });
+    };
+    const categories = () =>
+      $(".cmd-palette__category-label")
+        .map((_, el) => $(el).text().trim())
+        .get();
+
+    frappe.desk_navbar_extended.command_palette.init();
+    $(document).trigger($.Event("keydown", { ctrlKey: true, key: "k" }));
+
+    assert.deepEqual(requested, ["doctypes", "saved_searches", "help"], "fetched in parallel");
+
+    resolvers.saved_searches({
+      message: [{ type: "saved_search", label: "My Search", value: "SEARCH-1" }],
+    });
+    setTimeout(() => {
+      assert.deepEqual(categories(), [__("Saved Searches")], "first source rendered");
+
+      resolvers.doctypes({
+        message: [{ type: "doctype", label: "Task", value: "Task", route: "/app/task" }],
+      });
+      resolvers.help({ message: [] });
+      setTimeout(() => {
+        assert.deepEqual(
+          categories(),
+          [__("Doctypes"), __("Saved Searches")],
+          "late source keeps display order",
+        );
+        done();
+      }, 20);
+    }, 20);
+  });
 });
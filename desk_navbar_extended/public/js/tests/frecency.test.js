@@ -0,0 +1,47 @@
+QUnit.module("Frecency", function (hooks) {
+  hooks.beforeEach(function () {
+    this.originalCall = frappe.call;
+    this.originalBeacon = navigator.sendBeacon;
+    this.calls = [];
+    frappe.call = (opts) => {
+      this.calls.push(opts);
+      return Promise.resolve({ message: { accepted: 0 } });
+    };
+    this.frecency = frappe.desk_navbar_extended.frecency;
+    this.frecency.flush();
+    this.calls.length = 0;
+  });
+
+  hooks.afterEach(function () {
+    frappe.call = this.originalCall;
+    navigator.sendBeacon = this.originalBeacon;
+  });
+
+  QUnit.test("batches visits and skips repeated routes", function (assert) {
+    for (let i = 0; i < 10; i++) {
+      this.frecency.recordVisit(`/app/doctype-${i}`);
+      this.frecency.recordVisit(`/app/doctype-${i}`);
+    }
+
+    assert.strictEqual(this.calls.length, 1, "flushes once at the batch size");
+    assert.ok(this.calls[0].method.endsWith("record_visits"), "uses the batch endpoint");
+    const visits = JSON.parse(this.calls[0].args.visits);
+    assert.strictEqual(visits.length, 10, "one visit per route change");
+    assert.strictEqual(visits[0].route, "/app/doctype-0", "sends the route");
+  });
+
+  QUnit.test("flushes with sendBeacon when the page is hidden", function (assert) {
+    const beacons = [];
+    navigator.sendBeacon = (url, body) => {
+      beacons.push({ url, body });
+      return true;
+    };
+
+    this.frecency.recordVisit("/app/todo");
+    this.frecency.flush({ beacon: true });
+
+    assert.strictEqual(beacons.length, 1, "beacon sent");
+    assert.strictEqual(JSON.parse(beacons[0].body.get("visits")).length, 1, "carries the visit");
+    assert.strictEqual(this.calls.length, 0, "no XHR fallback needed");
+  });
+});
@@ -0,0 +1,36 @@
+QUnit.module("Fuzzy", function () {
+  const labels = ["Sales Order", "Sales Invoice", "Supplier", "Stock Entry", "Purchase Order"];
+
+  QUnit.test("ranks initials and prefixes first", function (assert) {
+    const index = new desk_navbar_extended.fuzzy.FuzzyIndex(labels);
+    const ranked = index.search("so").map(([, idx]) => labels[idx]);
+
+    assert.strictEqual(ranked[0], "Sales Order", "initials win");
+    assert.strictEqual(index.search("stock")[0][1], 3, "prefix match first");
+    assert.deepEqual(index.search("zzz"), [], "non-matches are dropped");
+  });
+
+  QUnit.test("keeps the top k in score order", function (assert) {
+    const index = new desk_navbar_extended.fuzzy.FuzzyIndex(labels);
+    const results = index.search("s", 2);
+    assert.strictEqual(results.length, 2, "limited to k");
+    assert.ok(results[0][0] >= results[1][0], "best first");
+  });
+
+  QUnit.test("requires query characters in order", function (assert) {
+    const { score } = desk_navbar_extended.fuzzy;
+    assert.strictEqual(score("ors", "Sales Order"), null, "out of order");
+    assert.ok(score("slsord", "Sales Order") > 0, "in order with gaps");
+    assert.ok(score("ord", "Order Item") > score("ord", "Sales Order"), "prefix wins");
+  });
+
+  QUnit.test("adds frecency boosts to the score", function (assert) {
+    const index = new desk_navbar_extended.fuzzy.FuzzyIndex(labels);
+    assert.strictEqual(index.search("s", 1, { 2: 20 })[0][1], 2, "boosted item first");
+    assert.deepEqual(
+      index.search("", 2, { 4: 3 }).map(([, idx]) => idx),
+      [4, 0],
+      "empty query lists boosted items first",
+    );
+  });
+});
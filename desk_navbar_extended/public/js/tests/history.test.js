@@ -42,9 +42,13 @@ QUnit.module("History", function (hooks) {
     frappe.desk_navbar_extended.history.init();
 
     setTimeout(() => {
-      const groups = $(".history-group");
-      assert.equal(groups.length, 1, "history group rendered");
-      assert.ok(groups.find(".history-item").length, "history items rendered");
+      assert.equal($(".history-group__header").length, 1, "history group rendered");
+      assert.equal($(".history-item").length, 1, "history items rendered");
+      assert.equal(
+        $(".history-item").attr("href"),
+        "/app/todo/TODO-0001",
+        "item links to the document",
+      );
       done();
     }, 50);
   });
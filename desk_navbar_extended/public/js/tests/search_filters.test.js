@@ -55,4 +55,50 @@ QUnit.module("Search Filters", function (hooks) {
         });
     }, 50);
   });
+
+  QUnit.test("loads further pages from the cursor", function (assert) {
+    const done = assert.async();
+    const calls = [];
+    const pages = {
+      "": { results: [{ name: "TASK-0", doctype: "Task" }], cursor: "second" },
+      second: { results: [{ name: "TASK-1", doctype: "Task" }], cursor: "third" },
+      third: { results: [{ name: "TASK-2", doctype: "Task" }], cursor: null },
+    };
+    frappe.call = ({ method, args }) => {
+      calls.push({ method, args });
+      return Promise.resolve({ message: pages[args.cursor || ""] });
+    };
+
+    frappe.desk_navbar_extended.search_filters.init();
+    const $list = $("<ul></ul>").appendTo("body");
+    const { loadNextPage } = frappe.desk_navbar_extended.search_filters;
+
+    setTimeout(() => {
+      $(".search-filter--doctype select").val("Task").trigger("change");
+      frappe.search.utils
+        .search("plan")
+        .then(() => loadNextPage($list))
+        .then(() => loadNextPage($list))
+        .then(() => loadNextPage($list))
+        .then(() => {
+          assert.ok(
+            calls.every(({ method }) => method.endsWith("search_with_cursor")),
+            "every page uses the cursor search",
+          );
+          assert.deepEqual(
+            calls.map(({ args }) => args.cursor),
+            [null, "second", "third"],
+            "each page continues from the previous cursor, and stops when exhausted",
+          );
+          assert.strictEqual($list.children().length, 2, "appends the later pages");
+          $list.remove();
+          done();
+        })
+        .catch((err) => {
+          assert.ok(false, err);
+          $list.remove();
+          done();
+        });
+    }, 50);
+  });
 });
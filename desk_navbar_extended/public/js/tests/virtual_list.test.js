@@ -0,0 +1,82 @@
+QUnit.module("Virtual List", function (hooks) {
+  hooks.beforeEach(function () {
+    this.$container = $('<div style="height: 100px; overflow-y: auto"></div>').appendTo("body");
+    this.created = 0;
+    this.list = new desk_navbar_extended.VirtualList({
+      container: this.$container,
+      rowHeights: { row: 20 },
+      overscan: 2,
+      createRow: () => {
+        this.created++;
+        const el = document.createElement("div");
+        el.style.height = "20px";
+        return el;
+      },
+      renderRow: (el, item, index) => {
+        el.textContent = item;
+        el.dataset.index = index;
+      },
+    });
+    this.items = Array.from({ length: 1000 }, (_, i) => `Row ${i}`);
+  });
+
+  hooks.afterEach(function () {
+    this.list.destroy();
+    this.$container.remove();
+  });
+
+  QUnit.test("materializes only the visible window", function (assert) {
+    this.list.setItems(this.items);
+    const rows = this.$container.find(".dne-virtual-list__row");
+
+    assert.ok(rows.length <= 10, `rendered ${rows.length} of 1000 rows`);
+    assert.strictEqual(rows.first().text(), "Row 0", "starts at the top");
+    assert.strictEqual(
+      this.$container.find(".dne-virtual-list__content").height(),
+      20000,
+      "spacer keeps the full scroll height",
+    );
+  });
+
+  QUnit.test("recycles row nodes while scrolling", function (assert) {
+    this.list.setItems(this.items);
+    this.$container[0].scrollTop = 2000;
+    this.list.update();
+    const created = this.created;
+
+    this.$container[0].scrollTop = 10000;
+    this.list.update();
+
+    const texts = this.$container
+      .find(".dne-virtual-list__row")
+      .map((_, el) => el.textContent)
+      .get();
+    assert.ok(texts.includes("Row 500"), "scrolled rows rendered");
+    assert.notOk(texts.includes("Row 0"), "rows above the window released");
+    assert.strictEqual(this.created, created, "no new nodes created");
+  });
+
+  QUnit.test("moves the selection without re-rendering", function (assert) {
+    this.list.setItems(this.items);
+    this.list.setSelected(1);
+    const before = this.$container.find(".dne-virtual-list__row").get();
+
+    this.list.setSelected(2);
+
+    const selected = this.$container.find(".is-selected");
+    assert.strictEqual(selected.length, 1, "one row selected");
+    assert.strictEqual(selected.text(), "Row 2", "selection moved");
+    assert.deepEqual(
+      this.$container.find(".dne-virtual-list__row").get(),
+      before,
+      "same nodes kept",
+    );
+  });
+
+  QUnit.test("scrolls the selected row into view", function (assert) {
+    this.list.setItems(this.items);
+    this.list.setSelected(200);
+
+    assert.strictEqual(this.$container.find(".is-selected").text(), "Row 200");
+  });
+});
@@ -0,0 +1,214 @@
+/**
+ * Virtual List - Windowed row renderer shared by the palette and navbar dropdowns
+ *
+ * Only the rows inside the scroll viewport, plus a few rows of overscan, exist
+ * in the DOM. Rows that scroll out go back to a per-type pool and are refilled
+ * for the rows scrolling in, and moving the selection touches at most two nodes.
+ */
+(() => {
+  frappe.provide("desk_navbar_extended");
+
+  // Used while the container is not laid out yet (e.g. a closed dropdown).
+  const DEFAULT_VIEWPORT = 420;
+
+  class VirtualList {
+    /**
+     * @param {Object} opts
+     * @param {HTMLElement|jQuery} opts.container - Scrollable element the list takes over
+     * @param {Function} opts.createRow - (type) => new empty row element
+     * @param {Function} opts.renderRow - (el, item, index) => fill a new or recycled row
+     * @param {Function} [opts.rowType] - (item) => row type, "row" by default
+     * @param {Object} [opts.rowHeights] - Estimated height per row type, corrected
+     *   from the first rendered row of each type
+     * @param {number} [opts.overscan] - Rows rendered above and below the viewport
+     * @param {string} [opts.selectedClass] - Class of the selected row
+     */
+    constructor(opts) {
+      this.opts = {
+        rowType: () => "row",
+        rowHeights: {},
+        overscan: 4,
+        selectedClass: "is-selected",
+        ...opts,
+      };
+      this.heights = { row: 32, ...this.opts.rowHeights };
+      this.measured = new Set();
+      this.items = [];
+      this.types = [];
+      this.offsets = [0];
+      this.visible = new Map(); // row index -> element
+      this.pools = {}; // row type -> detached elements
+      this.rowTypes = new WeakMap();
+      this.selected = -1;
+      this.frame = null;
+
+      this.scroller = $(this.opts.container)[0];
+      this.scroller.classList.add("dne-virtual-list");
+      this.content = document.createElement("div");
+      this.content.className = "dne-virtual-list__content";
+      this.scroller.replaceChildren(this.content);
+      this.onScroll = () => this.schedule();
+      this.scroller.addEventListener("scroll", this.onScroll, { passive: true });
+    }
+
+    get length() {
+      return this.items.length;
+    }
+
+    setItems(items) {
+      this.items = items || [];
+      this.types = this.items.map((item) => this.opts.rowType(item));
+      this.selected = -1;
+      this.releaseAll();
+      this.layout();
+      this.update();
+    }
+
+    /** Re-render the materialized rows, e.g. after their items changed in place. */
+    refresh() {
+      this.releaseAll();
+      this.update();
+    }
+
+    setSelected(index, { scroll = true } = {}) {
+      const previous = this.visible.get(this.selected);
+      if (previous) this.mark(previous, false);
+      this.selected = index;
+      const current = this.visible.get(index);
+      if (current) this.mark(current, true);
+      if (scroll) this.scrollToIndex(index);
+    }
+
+    scrollToIndex(index) {
+      if (index < 0 || index >= this.items.length) return;
+      const top = this.offsets[index];
+      const bottom = this.offsets[index + 1];
+      const viewTop = this.scroller.scrollTop;
+      const viewHeight = this.viewportHeight();
+      if (top < viewTop) this.scroller.scrollTop = top;
+      else if (bottom > viewTop + viewHeight)
+        this.scroller.scrollTop = bottom - viewHeight;
+      else return;
+      this.update();
+    }
+
+    destroy() {
+      this.scroller.removeEventListener("scroll", this.onScroll);
+      if (this.frame) cancelAnimationFrame(this.frame);
+      this.releaseAll();
+      this.pools = {};
+      this.content.remove();
+    }
+
+    schedule() {
+      if (this.frame) return;
+      this.frame = requestAnimationFrame(() => {
+        this.frame = null;
+        this.update();
+      });
+    }
+
+    viewportHeight() {
+      return this.scroller.clientHeight || DEFAULT_VIEWPORT;
+    }
+
+    layout() {
+      const count = this.items.length;
+      const offsets = new Array(count + 1);
+      offsets[0] = 0;
+      for (let i = 0; i < count; i++) {
+        offsets[i + 1] = offsets[i] + (this.heights[this.types[i]] ?? this.heights.row);
+      }
+      this.offsets = offsets;
+      this.content.style.height = `${offsets[count]}px`;
+    }
+
+    indexAt(y) {
+      // Last row starting at or above y.
+      let low = 0;
+      let high = this.items.length - 1;
+      while (low < high) {
+        const mid = (low + high + 1) >> 1;
+        if (this.offsets[mid] <= y) low = mid;
+        else high = mid - 1;
+      }
+      return low;
+    }
+
+    update() {
+      const count = this.items.length;
+      const { overscan } = this.opts;
+      const top = this.scroller.scrollTop;
+      const start = count ? Math.max(0, this.indexAt(top) - overscan) : 0;
+      const end = count
+        ? Math.min(count, this.indexAt(top + this.viewportHeight()) + 1 + overscan)
+        : 0;
+
+      this.visible.forEach((el, index) => {
+        if (index < start || index >= end) this.release(index, el);
+      });
+
+      // Keep DOM order equal to visual order for keyboard and screen reader users.
+      let cursor = this.content.firstChild;
+      for (let index = start; index < end; index++) {
+        let el = this.visible.get(index);
+        if (!el) {
+          el = this.acquire(this.types[index]);
+          this.opts.renderRow(el, this.items[index], index);
+          this.mark(el, index === this.selected);
+          this.visible.set(index, el);
+        }
+        el.style.transform = `translateY(${this.offsets[index]}px)`;
+        if (el === cursor) cursor = cursor.nextSibling;
+        else this.content.insertBefore(el, cursor);
+      }
+
+      if (this.measure()) {
+        this.layout();
+        this.update();
+      }
+    }
+
+    measure() {
+      // Replace the estimate of each row type with its real height, once.
+      let changed = false;
+      this.visible.forEach((el) => {
+        const type = this.rowTypes.get(el);
+        if (this.measured.has(type)) return;
+        const height = el.offsetHeight;
+        if (!height) return;
+        this.measured.add(type);
+        if (height !== this.heights[type]) {
+          this.heights[type] = height;
+          changed = true;
+        }
+      });
+      return changed;
+    }
+
+    mark(el, selected) {
+      el.classList.toggle(this.opts.selectedClass, selected);
+      if (el.hasAttribute("aria-selected")) el.setAttribute("aria-selected", selected);
+    }
+
+    acquire(type) {
+      const el = this.pools[type]?.pop() || this.opts.createRow(type);
+      el.classList.add("dne-virtual-list__row");
+      this.rowTypes.set(el, type);
+      return el;
+    }
+
+    release(index, el) {
+      this.visible.delete(index);
+      el.remove();
+      const type = this.rowTypes.get(el);
+      (this.pools[type] = this.pools[type] || []).push(el);
+    }
+
+    releaseAll() {
+      this.visible.forEach((el, index) => this.release(index, el));
+    }
+  }
+
+  desk_navbar_extended.VirtualList = VirtualList;
+})();
@@ -0,0 +1,279 @@
+"""Bounded per-user buffer of recently opened and saved documents.
+
+Each user has a Redis sorted set of ``doctype::name`` members scored by the
+time they were last opened or saved, trimmed to ``MAX_RECENT_DOCS``. Opening a
+form (the ``onload`` doc event) or saving a document in a web request moves it
+to the front in one round trip, and reading the newest ``limit`` entries costs
+O(log n + limit) without touching Activity Log. Titles are not kept here;
+readers take them from :mod:`desk_navbar_extended.title_cache`.
+
+Users touched since the last run are marked dirty, and a scheduler job copies
+their buffers into ``Desk Navbar Recent Document``. When Redis has lost a
+buffer, the next read reloads it from that table. Deleting a document removes
+it from both.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+import frappe
+from frappe.utils import get_datetime, now_datetime
+
+RECENT_DOCTYPE = "Desk Navbar Recent Document"
+DOCS_KEY_PREFIX = "desk_navbar_extended:recent_docs:"
+DIRTY_KEY = "desk_navbar_extended:recent_docs_dirty"
+MAX_RECENT_DOCS = 100
+# Buffers are trimmed back to MAX_RECENT_DOCS once they grow TRIM_SLACK past it.
+TRIM_SLACK = 32
+# Idle buffers leave Redis; the table still holds them.
+TTL_SECONDS = 30 * 24 * 3600
+PERSIST_BATCH_SIZE = 100
+
+# Logs, internals and this app's own bookkeeping are not worth revisiting.
+SKIPPED_DOCTYPES = frozenset(
+    (
+        "Access Log",
+        "Activity Log",
+        "Comment",
+        "Deleted Document",
+        "Error Log",
+        "Notification Log",
+        "Route History",
+        "Version",
+        "View Log",
+        RECENT_DOCTYPE,
+        "Desk Navbar Search Index",
+        "Desk Navbar Search Metric",
+        "Desk Navbar Search Rollup",
+    )
+)
+
+RECENT_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "owner",
+    "modified_by",
+    "user",
+    "reference_doctype",
+    "reference_name",
+    "last_seen",
+)
+
+
+def on_document_load(doc: Any, method: str | None = None) -> None:
+    """doc_events hook: a form was opened."""
+    if _is_tracked(doc):
+        record(doc.doctype, doc.name)
+
+
+def on_document_update(doc: Any, method: str | None = None) -> None:
+    """doc_events hook: a document was inserted or saved."""
+    if _is_tracked(doc):
+        record(doc.doctype, doc.name)
+
+
+def on_document_trash(doc: Any, method: str | None = None) -> None:
+    """doc_events hook: forget a deleted document in every buffer and the table.
+
+    Buffers not yet persisted belong to users marked dirty, so those, the
+    users with table rows and the current user cover every buffer holding it.
+    """
+    if frappe.flags.in_install or doc.doctype in SKIPPED_DOCTYPES:
+        return
+    if doc.meta.istable or doc.meta.issingle:
+        return
+
+    filters = {"reference_doctype": doc.doctype, "reference_name": doc.name}
+    cache = frappe.cache()
+    dirty = cache.pipeline(transaction=False).smembers(cache.make_key(DIRTY_KEY)).execute()[0]
+    users = set(frappe.get_all(RECENT_DOCTYPE, filters=filters, pluck="user"))
+    users.update(_decode(user) for user in dirty)
+    users.add(frappe.session.user)
+
+    pipe = cache.pipeline(transaction=False)
+    for user in users:
+        pipe.zrem(_key(cache, user), f"{doc.doctype}::{doc.name}")
+    pipe.execute()
+    frappe.db.delete(RECENT_DOCTYPE, filters)
+
+
+def _is_tracked(doc: Any) -> bool:
+    flags = frappe.flags
+    if flags.in_install or flags.in_migrate or flags.in_import or flags.in_patch:
+        return False
+    # Scheduler and queued jobs would fill Administrator's buffer.
+    if flags.in_scheduler or getattr(frappe.local, "request", None) is None:
+        return False
+    if frappe.session.user == "Guest" or doc.doctype in SKIPPED_DOCTYPES:
+        return False
+    return not (doc.meta.istable or doc.meta.issingle)
+
+
+def record(
+    doctype: str,
+    name: str,
+    user: str | None = None,
+    timestamp: float | None = None,
+) -> None:
+    """Move ``doctype``/``name`` to the front of the buffer of ``user``."""
+    user = user or frappe.session.user
+    timestamp = timestamp or now_datetime().timestamp()
+
+    cache = frappe.cache()
+    docs_key = _key(cache, user)
+    pipe = cache.pipeline(transaction=False)
+    pipe.zadd(docs_key, {f"{doctype}::{name}": timestamp})
+    pipe.zcard(docs_key)
+    pipe.sadd(cache.make_key(DIRTY_KEY), user)
+    pipe.expire(docs_key, TTL_SECONDS)
+    size = pipe.execute()[1]
+    if size > MAX_RECENT_DOCS + TRIM_SLACK:
+        # Keep only the newest MAX_RECENT_DOCS members.
+        pipe = cache.pipeline(transaction=False)
+        pipe.zremrangebyrank(docs_key, 0, -MAX_RECENT_DOCS - 1).execute()
+
+
+def get_recent(limit: int = 20, user: str | None = None) -> list[dict[str, Any]]:
+    """Return up to ``limit`` of the documents ``user`` opened or saved last, newest first.
+
+    Each entry has ``doctype``, ``name`` and ``timestamp`` (a datetime).
+    Entries are not checked for permission or existence.
+    """
+    user = user or frappe.session.user
+    limit = max(0, min(limit, MAX_RECENT_DOCS))
+    if not limit:
+        return []
+
+    cache = frappe.cache()
+    entries = _read(cache, user, limit)
+    if not entries:
+        entries = _load(cache, user)[:limit]
+    return entries
+
+
+def _read(cache: Any, user: str, limit: int) -> list[dict[str, Any]]:
+    members = (
+        cache.pipeline(transaction=False)
+        .zrevrange(_key(cache, user), 0, limit - 1, withscores=True)
+        .execute()[0]
+    )
+    entries = []
+    for member, score in members:
+        doctype, _sep, name = _decode(member).partition("::")
+        entries.append(
+            {"doctype": doctype, "name": name, "timestamp": datetime.fromtimestamp(score)}
+        )
+    return entries
+
+
+def _load(cache: Any, user: str) -> list[dict[str, Any]]:
+    """Rebuild the Redis buffer of ``user`` from the table and return its entries."""
+    rows = frappe.get_all(
+        RECENT_DOCTYPE,
+        filters={"user": user},
+        fields=["reference_doctype", "reference_name", "last_seen"],
+        order_by="last_seen desc",
+        limit=MAX_RECENT_DOCS,
+    )
+    if not rows:
+        return []
+
+    docs_key = _key(cache, user)
+    scores = {
+        f"{row.reference_doctype}::{row.reference_name}": get_datetime(row.last_seen).timestamp()
+        for row in rows
+    }
+    pipe = cache.pipeline(transaction=False)
+    pipe.zadd(docs_key, scores)
+    pipe.expire(docs_key, TTL_SECONDS)
+    pipe.execute()
+
+    return [
+        {
+            "doctype": row.reference_doctype,
+            "name": row.reference_name,
+            "timestamp": get_datetime(row.last_seen),
+        }
+        for row in rows
+    ]
+
+
+def persist_recent_docs(batch_size: int = PERSIST_BATCH_SIZE) -> int:
+    """Scheduler job: copy the buffers of users active since the last run into the table.
+
+    Each user's rows are replaced by their current buffer. Returns the number
+    of users processed.
+    """
+    cache = frappe.cache()
+    dirty_key = cache.make_key(DIRTY_KEY)
+    written = 0
+
+    while True:
+        users = cache.pipeline(transaction=False).spop(dirty_key, batch_size).execute()[0]
+        if not users:
+            break
+        users = [_decode(user) for user in users]
+
+        try:
+            for user in users:
+                entries = _read(cache, user, MAX_RECENT_DOCS)
+                # An expired buffer leaves the table as the only copy.
+                if not entries:
+                    continue
+                frappe.db.delete(RECENT_DOCTYPE, {"user": user})
+                write_entries(user, entries)
+            frappe.db.commit()
+        except Exception:  # noqa: BLE001
+            frappe.db.rollback()
+            # Mark them dirty again so the next run retries.
+            cache.pipeline(transaction=False).sadd(dirty_key, *users).execute()
+            frappe.logger("desk_navbar_extended").error(
+                "Failed to persist recent documents", exc_info=True, extra={"users": len(users)}
+            )
+            break
+
+        written += len(users)
+        if len(users) < batch_size:
+            break
+
+    return written
+
+
+def write_entries(user: str, entries: list[dict[str, Any]]) -> None:
+    """Insert table rows for ``entries`` of ``user`` with one statement."""
+    now = now_datetime()
+    frappe.db.bulk_insert(
+        RECENT_DOCTYPE,
+        RECENT_FIELDS,
+        [
+            (
+                frappe.generate_hash(length=12),
+                now,
+                now,
+                user,
+                user,
+                user,
+                entry["doctype"],
+                entry["name"],
+                entry["timestamp"],
+            )
+            for entry in entries
+        ],
+    )
+
+
+def clear_buffer(user: str | None = None) -> None:
+    """Drop the Redis buffer of ``user``; the next read reloads it from the table."""
+    user = user or frappe.session.user
+    frappe.cache().delete_value(DOCS_KEY_PREFIX + user)
+
+
+def _key(cache: Any, user: str) -> str:
+    return cache.make_key(DOCS_KEY_PREFIX + user)
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value or ""
@@ -9,16 +9,23 @@ from hashlib import sha256
 from typing import Any
 
 import frappe
-from frappe.utils import cint, get_fullname, now_datetime
+from frappe.utils import cint, flt, get_fullname, now_datetime
 from pytz import timezone as pytz_timezone
 
 from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
     get_enabled_features_for_user,
     get_settings_doc,
 )
+from desk_navbar_extended.metrics.buffer import build_metric, enqueue_metric, enqueue_metrics
+from desk_navbar_extended.metrics.error_rate import record_search_outcome
+from desk_navbar_extended.metrics.instrumentation import instrument
+
+# Upper bound on events accepted by one log_search_metrics_batch call.
+MAX_METRIC_BATCH = 200
 
 
 @frappe.whitelist()
+@instrument()
 def get_settings() -> dict[str, Any]:
     """Return sanitized settings for the current session."""
 
@@ -29,8 +36,10 @@ def get_settings() -> dict[str, Any]:
         frappe.logger("desk_navbar_extended").error(
             "Failed to fetch settings", extra={"error": str(e), "user": frappe.session.user}
         )
-        # Return minimal safe defaults to prevent total failure
+        # Return minimal safe defaults to prevent total failure. ``degraded``
+        # keeps them out of boot info and the client cache, so the next load retries.
         return {
+            "degraded": True,
             "features": {"clock": False, "usage_analytics": False},
             "clock": {
                 "time_format": "12h",
@@ -41,6 +50,7 @@ def get_settings() -> dict[str, Any]:
             "awesomebar": {"default_width": 560, "mobile_collapse": True},
             "quick_create": {"doctypes": ""},
             "kpi": {"refresh_interval": 300},
+            "analytics": {"sample_rate": 1.0},
         }
 
     timezones = [
@@ -69,10 +79,16 @@ def get_settings() -> dict[str, Any]:
         "kpi": {
             "refresh_interval": cint(doc.kpi_refresh_interval) or 300,
         },
+        "analytics": {
+            "sample_rate": (
+                1.0 if doc.metric_sample_rate is None else flt(doc.metric_sample_rate) / 100
+            ),
+        },
     }
 
 
 @frappe.whitelist()
+@instrument("clock")
 def get_timezone_overview() -> dict[str, Any]:
     """Return current times across configured zones plus upcoming calendar entries."""
 
@@ -160,6 +176,7 @@ def get_timezone_overview() -> dict[str, Any]:
 
 
 @frappe.whitelist(allow_guest=False)
+@instrument("voice_search")
 def transcribe_audio(audio: str, filename: str | None = None) -> dict[str, Any]:
     """Queue audio for background transcription and log consent."""
 
@@ -186,6 +203,7 @@ def transcribe_audio(audio: str, filename: str | None = None) -> dict[str, Any]:
 
 
 @frappe.whitelist(allow_guest=False)
+@instrument("voice_search")
 def process_transcription(audio: str, filename: str | None, user: str) -> None:
     """Placeholder background job that stores audio for later processing."""
 
@@ -209,42 +227,51 @@ def process_transcription(audio: str, filename: str | None, user: str) -> None:
 
 
 @frappe.whitelist(allow_guest=False)
+@instrument("usage_analytics")
 def log_search_metrics(payload: str | dict[str, Any]) -> None:
-    """Persist anonymized search analytics and raise alerts on error spikes."""
+    """Buffer anonymized search analytics and raise alerts on error spikes.
+
+    Rows are written to the metric table by the ``flush_search_metrics``
+    scheduler job; this only appends to a Redis list and bumps the
+    error-rate counters.
+    """
 
     if isinstance(payload, str):
         metrics = json.loads(payload)
     else:
         metrics = payload
 
-    doc = frappe.get_doc(
-        {
-            "doctype": "Desk Navbar Search Metric",
-            "event_ts": metrics.get("event_ts") or now_datetime(),
-            "search_length": cint(metrics.get("search_length")),
-            "execution_ms": float(metrics.get("execution_ms") or 0),
-            "status": metrics.get("status") or "success",
-            "error_message": (metrics.get("error_message") or "")[:140],
-        }
-    )
-    doc.insert(ignore_permissions=True)
+    metric = build_metric(metrics)
+    enqueue_metric(metric)
+    record_search_outcome(metric["status"])
 
-    recent = frappe.get_all(
-        "Desk Navbar Search Metric",
-        fields=["status"],
-        order_by="creation desc",
-        limit=20,
-    )
-    if not recent:
-        return
 
-    error_count = sum(1 for row in recent if row.status == "error")
-    if error_count / len(recent) >= 0.3:
-        frappe.publish_realtime(
-            "desk_navbar_extended.error_rate",
-            {"error_rate": error_count / len(recent)},
-            user=frappe.session.user,
-        )
+@frappe.whitelist(allow_guest=False, methods=["POST"])
+@instrument("usage_analytics")
+def log_search_metrics_batch(events: str | list[dict[str, Any]]) -> dict[str, int]:
+    """Buffer a batch of client search metrics sent in one request.
+
+    Malformed events are skipped rather than failing the batch; at most
+    ``MAX_METRIC_BATCH`` events are accepted per call.
+    """
+
+    if isinstance(events, str):
+        events = json.loads(events)
+    if not isinstance(events, list):
+        frappe.throw("Events must be a list.")
+
+    metrics = []
+    for event in events[:MAX_METRIC_BATCH]:
+        try:
+            metrics.append(build_metric(event))
+        except (AttributeError, TypeError, ValueError):
+            continue
+
+    enqueue_metrics(metrics)
+    for status in ("success", "error"):
+        record_search_outcome(status, count=sum(1 for m in metrics if m["status"] == status))
+
+    return {"accepted": len(metrics), "rejected": len(events) - len(metrics)}
 
 
 def log_doctype_presence() -> None:
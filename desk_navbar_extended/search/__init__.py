@@ -0,0 +1 @@
+"""Search backends for Desk Navbar Extended."""
@@ -0,0 +1,127 @@
+"""Deadline-bounded concurrent execution of per-doctype searches.
+
+Each task runs on a shared, bounded thread pool inside its own Frappe context
+and database connection, as the calling user. Whatever has not finished when
+the request deadline passes is reported as timed out and left out of the
+results, so one slow doctype no longer holds up the others.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import frappe
+
+DEFAULT_DEADLINE_MS = 1500
+DEFAULT_MAX_WORKERS = 4
+MAX_WORKERS_CAP = 16
+
+_executor: ThreadPoolExecutor | None = None
+_executor_size = 0
+_executor_lock = threading.Lock()
+
+
+def get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Return the process-wide pool, resizing it when the configured size changes."""
+    global _executor, _executor_size
+
+    max_workers = max(1, min(max_workers, MAX_WORKERS_CAP))
+    with _executor_lock:
+        if _executor is None or _executor_size != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="desk-navbar-search"
+            )
+            _executor_size = max_workers
+        return _executor
+
+
+def fan_out(
+    func: Callable[..., list[dict[str, Any]]],
+    doctypes: Iterable[str],
+    *args: Any,
+    deadline_ms: int = DEFAULT_DEADLINE_MS,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    **kwargs: Any,
+) -> tuple[dict[str, list[dict[str, Any]]], dict[str, dict[str, Any]]]:
+    """Call ``func(doctype, *args, **kwargs)`` for every doctype concurrently.
+
+    Returns the results of the doctypes that finished in time, and a breakdown
+    with ``ms``, ``timed_out``, ``count`` and ``error`` for every doctype.
+    """
+    context = {
+        "site": frappe.local.site,
+        "sites_path": frappe.local.sites_path,
+        "user": frappe.session.user,
+        "lang": frappe.local.lang,
+        "statement_timeout": max(deadline_ms, 1) / 1000,
+    }
+    executor = get_executor(max_workers)
+    started = time.monotonic()
+    futures: dict[Future, str] = {
+        executor.submit(_run_in_context, context, func, doctype, *args, **kwargs): doctype
+        for doctype in dict.fromkeys(doctypes)
+    }
+    wait(futures, timeout=max(deadline_ms, 0) / 1000)
+
+    results: dict[str, list[dict[str, Any]]] = {}
+    breakdown: dict[str, dict[str, Any]] = {}
+    for future, doctype in futures.items():
+        if not future.done():
+            # Queued tasks are dropped; running ones finish in the background.
+            future.cancel()
+            breakdown[doctype] = {
+                "ms": round((time.monotonic() - started) * 1000, 2),
+                "timed_out": True,
+                "count": 0,
+                "error": None,
+            }
+            continue
+
+        rows, elapsed_ms, error = future.result()
+        results[doctype] = rows
+        breakdown[doctype] = {
+            "ms": round(elapsed_ms, 2),
+            "timed_out": False,
+            "count": len(rows),
+            "error": error,
+        }
+    return results, breakdown
+
+
+def _run_in_context(
+    context: dict[str, Any],
+    func: Callable[..., list[dict[str, Any]]],
+    doctype: str,
+    *args: Any,
+    **kwargs: Any,
+) -> tuple[list[dict[str, Any]], float, str | None]:
+    started = time.monotonic()
+    try:
+        frappe.init(site=context["site"], sites_path=context["sites_path"])
+        frappe.connect(set_admin_as_user=False)
+        frappe.set_user(context["user"])
+        frappe.local.lang = context["lang"]
+        _limit_statement_time(context["statement_timeout"])
+        rows = func(doctype, *args, **kwargs)
+        return rows, (time.monotonic() - started) * 1000, None
+    except Exception as exc:  # noqa: BLE001
+        frappe.logger("desk_navbar_extended").warning(
+            "Search fan-out task failed", extra={"doctype": doctype, "error": str(exc)}
+        )
+        return [], (time.monotonic() - started) * 1000, str(exc)[:140]
+    finally:
+        frappe.destroy()
+
+
+def _limit_statement_time(seconds: float) -> None:
+    """Stop the database from working on a result nobody will wait for."""
+    if frappe.conf.db_type in (None, "mariadb"):
+        frappe.db.sql("SET SESSION max_statement_time = %s", seconds)
+    elif frappe.conf.db_type == "postgres":
+        frappe.db.sql("SET statement_timeout = %s", int(seconds * 1000))
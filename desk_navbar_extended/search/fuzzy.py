@@ -0,0 +1,235 @@
+"""Fuzzy subsequence scorer for command palette lookups.
+
+Every query character has to appear in the item text, in order. A match scores
+higher when it starts the text or a word, runs over consecutive characters,
+lands on later word starts or spells the item's initials, and lower for gaps
+and long texts.
+
+:class:`FuzzyIndex` precompiles lowercase texts, word starts and initials, and
+for every character keeps three lists of items, shortest first: texts starting
+with it, texts with a later word starting with it, and texts merely containing
+it. Each list has a score ceiling for a given query, so a lookup walks the
+lists best first and stops as soon as no remaining item can enter the top
+``k``. Per-item bonuses, such as the user's frecency, are scored ahead of the
+lists so their ceilings stay tight. It is free of Frappe imports;
+``public/js/fuzzy.js`` mirrors the scorer for the browser.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from collections.abc import Iterable
+
+MATCH = 1.0
+CONSECUTIVE = 4.0
+BOUNDARY = 4.0
+WORD_START = 8.0
+PREFIX = 10.0
+SUBSTRING = 6.0
+ACRONYM = 8.0
+GAP = 0.2
+MAX_GAP_PENALTY = 3.0
+LENGTH_PENALTY = 0.01
+SEPARATORS = frozenset(" -_/.:()[],")
+
+
+def word_starts(text: str) -> tuple[int, ...]:
+    """Return the positions in ``text`` that start a word, including camelCase humps."""
+    starts = []
+    prev = ""
+    for idx, char in enumerate(text):
+        if char not in SEPARATORS and (
+            not prev or prev in SEPARATORS or (prev.islower() and char.isupper())
+        ):
+            starts.append(idx)
+        prev = char
+    return tuple(starts)
+
+
+def subsequence_pattern(query: str) -> re.Pattern[str]:
+    """Compile a regex that finds ``query`` as a subsequence without backtracking."""
+    parts = [re.escape(query[0])]
+    for char in query[1:]:
+        char = re.escape(char)
+        parts.append(f"[^{char}]*{char}")
+    return re.compile("".join(parts))
+
+
+def compile_text(text: str) -> tuple[str, tuple[int, ...], str]:
+    """Return the lowercase text, its word starts and its initials."""
+    lower = (text or "").lower()
+    # Lowercasing a few characters (such as a dotted capital I) changes the length.
+    starts = word_starts(text if len(lower) == len(text or "") else lower)
+    return lower, starts, "".join(lower[start] for start in starts)
+
+
+def score(query: str, text: str) -> float | None:
+    """Score ``query`` against ``text``; None when it is not a subsequence."""
+    query = (query or "").strip().lower()
+    if not query:
+        return None
+    lower, starts, initials = compile_text(text)
+    return _score(query, lower, starts, frozenset(starts), initials)
+
+
+def _score(
+    query: str, text: str, starts: tuple[int, ...], boundaries: frozenset[int], initials: str
+) -> float | None:
+    first = query[0]
+    plain = text.find(first)
+    if plain < 0:
+        return None
+
+    best = None
+    anchors = [start for start in starts if text[start] == first]
+    if plain not in boundaries:
+        anchors.append(plain)
+    for anchor in anchors:
+        value = _aligned(query, text, anchor, boundaries)
+        if value is not None and (best is None or value > best):
+            best = value
+    if best is None:
+        return None
+    if initials.startswith(query):
+        best += ACRONYM
+    return best - LENGTH_PENALTY * len(text)
+
+
+def _aligned(query: str, text: str, anchor: int, boundaries: frozenset[int]) -> float | None:
+    """Score the greedy match of ``query`` whose first character sits at ``anchor``."""
+    total = MATCH
+    if anchor == 0:
+        total += PREFIX
+    elif anchor in boundaries:
+        total += WORD_START
+
+    if text.startswith(query, anchor):
+        return total + (len(query) - 1) * (MATCH + CONSECUTIVE) + SUBSTRING
+
+    find = text.find
+    pos = anchor
+    for char in query[1:]:
+        nxt = find(char, pos + 1)
+        if nxt < 0:
+            return None
+        total += MATCH
+        if nxt == pos + 1:
+            total += CONSECUTIVE
+        elif nxt in boundaries:
+            total += BOUNDARY
+        else:
+            total -= min((nxt - pos - 1) * GAP, MAX_GAP_PENALTY)
+        pos = nxt
+    return total
+
+
+class FuzzyIndex:
+    """Precompiled item texts answering top-k fuzzy lookups."""
+
+    def __init__(self, texts: Iterable[str]) -> None:
+        self.texts: list[str] = []
+        self._starts: list[tuple[int, ...]] = []
+        self._boundaries: list[frozenset[int]] = []
+        self._initials: list[str] = []
+        for text in texts:
+            lower, starts, initials = compile_text(text)
+            self.texts.append(lower)
+            self._starts.append(starts)
+            self._boundaries.append(frozenset(starts))
+            self._initials.append(initials)
+
+        # char -> (texts starting with it, with a later word starting with it,
+        # only containing it), each shortest first.
+        self._tiers: dict[str, tuple[list[int], list[int], list[int]]] = {}
+        for idx in sorted(range(len(self.texts)), key=lambda idx: len(self.texts[idx])):
+            text, initials = self.texts[idx], self._initials[idx]
+            for char in set(text):
+                tiers = self._tiers.get(char)
+                if tiers is None:
+                    tiers = self._tiers[char] = ([], [], [])
+                if text[0] == char:
+                    tiers[0].append(idx)
+                elif char in initials:
+                    tiers[1].append(idx)
+                else:
+                    tiers[2].append(idx)
+
+        self._texts_blob = "\n" + "\n".join(self.texts)
+        self._initials_blob = "\n" + "\n".join(self._initials)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def search(
+        self, query: str, k: int = 20, boosts: dict[int, float] | None = None
+    ) -> list[tuple[float, int]]:
+        """Return up to ``k`` ``(score, position)`` pairs, best first.
+
+        ``boosts`` maps positions to a bonus added to their score, such as the
+        user's frecency. Ties keep the original item order. An empty query
+        returns the boosted items by bonus, then the remaining ones in order.
+        """
+        query = (query or "").strip().lower()
+        boosts = boosts or {}
+        if k <= 0:
+            return []
+        if not query:
+            ranked = sorted(boosts.items(), key=lambda pair: (-pair[1], pair[0]))[:k]
+            ranked = [(value, idx) for idx, value in ranked]
+            for idx in range(len(self.texts)):
+                if len(ranked) >= k:
+                    break
+                if idx not in boosts:
+                    ranked.append((0.0, idx))
+            return ranked
+
+        tiers = self._tiers.get(query[0])
+        if tiers is None:
+            return []
+
+        texts, starts, boundaries, initials = (
+            self.texts,
+            self._starts,
+            self._boundaries,
+            self._initials,
+        )
+        # Rejecting non-matches in C keeps sparse queries as cheap as dense ones.
+        is_match = subsequence_pattern(query).search
+        heap: list[tuple[float, int]] = []
+
+        def offer(value: float, idx: int) -> None:
+            if len(heap) < k:
+                heapq.heappush(heap, (value, -idx))
+            elif (value, -idx) > heap[0]:
+                heapq.heapreplace(heap, (value, -idx))
+
+        # Boosted items are few and scored up front, so the tier ceilings below
+        # stay those of unboosted items and keep pruning as tightly.
+        for idx, extra in boosts.items():
+            text = texts[idx]
+            if is_match(text):
+                value = _score(query, text, starts[idx], boundaries[idx], initials[idx])
+                if value is not None:
+                    offer(value + extra, idx)
+
+        for ceiling, items in zip(self._ceilings(query), tiers):
+            for idx in items:
+                text = texts[idx]
+                if len(heap) == k and ceiling - LENGTH_PENALTY * len(text) < heap[0][0]:
+                    break
+                if idx in boosts or not is_match(text):
+                    continue
+                value = _score(query, text, starts[idx], boundaries[idx], initials[idx])
+                if value is not None:
+                    offer(value, idx)
+
+        return [(value, -neg_idx) for value, neg_idx in sorted(heap, reverse=True)]
+
+    def _ceilings(self, query: str) -> tuple[float, float, float]:
+        """Return the best score reachable in each tier before the length penalty."""
+        base = len(query) * MATCH + (len(query) - 1) * max(CONSECUTIVE, BOUNDARY)
+        if query in self._texts_blob:
+            base += SUBSTRING
+        acronym = ACRONYM if "\n" + query in self._initials_blob else 0.0
+        return base + PREFIX + acronym, base + WORD_START, base
@@ -0,0 +1,429 @@
+"""Token index for global navbar search.
+
+Every indexed document is stored as one ``Desk Navbar Search Index`` row per
+distinct token of its name, title and search fields. Prefix lookups on the
+``(token, reference_doctype)`` index replace per-doctype ``LIKE`` scans, and a
+single grouped query ranks matches across doctypes.
+
+Query terms are also expanded through a per-process trigram index of the
+token vocabulary, so misspelt terms still match their closest known tokens.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+
+import frappe
+from frappe import _
+from frappe.model import no_value_fields, table_fields
+from frappe.utils import cstr, now_datetime, strip_html_tags
+
+from desk_navbar_extended.cache import LRUCache, bump_cache_version, get_cache_version
+from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
+    get_cached_settings,
+)
+from desk_navbar_extended.search.trigram import TrigramIndex
+
+INDEX_DOCTYPE = "Desk Navbar Search Index"
+DEFAULT_SEARCH_DOCTYPES = ("User", "Note", "ToDo", "Event", "Task")
+
+MAX_TOKENS_PER_DOCUMENT = 32
+MAX_QUERY_TERMS = 8
+MAX_TOKEN_LENGTH = 140
+# Over-fetch so row-level permission filtering can still fill a page.
+CANDIDATE_FACTOR = 3
+
+INDEX_CACHE_VERSION = "search_index"
+FUZZY_EXPANSIONS = 6
+FUZZY_MIN_SIMILARITY = 0.45
+FUZZY_MIN_TERM_LENGTH = 3
+# Tokens added since the last load are still found by prefix matching.
+VOCABULARY_TTL = 30 * 60
+
+INDEX_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "owner",
+    "modified_by",
+    "token",
+    "reference_doctype",
+    "reference_name",
+    "title",
+    "document_owner",
+    "document_creation",
+    "document_modified",
+)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Token vocabularies keyed by site: (index version, loaded at, TrigramIndex).
+_vocabularies = LRUCache(maxsize=8)
+# Sites whose vocabulary is being reloaded in the background.
+_reloading: set[str] = set()
+_reloading_lock = threading.Lock()
+
+
+def tokenize(text: str | None, limit: int = MAX_TOKENS_PER_DOCUMENT) -> list[str]:
+    """Split ``text`` into distinct lower-case word tokens, in order of appearance."""
+    tokens: list[str] = []
+    seen: set[str] = set()
+    for match in _TOKEN_RE.finditer((text or "").lower()):
+        token = match.group()[:MAX_TOKEN_LENGTH]
+        if token in seen:
+            continue
+        seen.add(token)
+        tokens.append(token)
+        if len(tokens) >= limit:
+            break
+    return tokens
+
+
+def get_search_columns(meta: Any) -> list[str]:
+    """Return the name, title and search fields of ``meta`` that are real columns."""
+    columns: list[str] = []
+    for fieldname in ["name", meta.get_title_field(), *meta.get_search_fields()]:
+        if not fieldname or fieldname in columns:
+            continue
+        if fieldname != "name":
+            df = meta.get_field(fieldname)
+            if (
+                not df
+                or df.fieldtype in no_value_fields
+                or df.fieldtype in table_fields
+                or df.get("is_virtual")
+            ):
+                continue
+        columns.append(fieldname)
+    return columns
+
+
+def get_search_doctypes() -> tuple[str, ...]:
+    """Return the doctypes covered by global search, as configured in settings."""
+    configured = get_cached_settings().get("search_doctypes") or ""
+    doctypes = tuple(dict.fromkeys(dt.strip() for dt in configured.split(",") if dt.strip()))
+    return doctypes or DEFAULT_SEARCH_DOCTYPES
+
+
+def is_indexed(doctype: str) -> bool:
+    """Return True when saves of ``doctype`` must be reflected in the index."""
+    if frappe.flags.in_install:
+        return False
+    settings = get_cached_settings()
+    return bool(settings.get("enable_search_index")) and doctype in get_search_doctypes()
+
+
+def on_document_update(doc: Any, method: str | None = None) -> None:
+    """doc_events hook: re-index a document after insert or update."""
+    if is_indexed(doc.doctype):
+        index_document(doc)
+
+
+def on_document_trash(doc: Any, method: str | None = None) -> None:
+    """doc_events hook: drop a deleted document from the index.
+
+    Runs for every configured doctype, even with the index switched off, so no
+    rows outlive their document before :func:`prune_search_index` catches up.
+    """
+    if not frappe.flags.in_install and doc.doctype in get_search_doctypes():
+        remove_document(doc.doctype, doc.name)
+
+
+def on_document_rename(
+    doc: Any,
+    method: str | None = None,
+    old_name: str | None = None,
+    new_name: str | None = None,
+    merge: bool = False,
+) -> None:
+    """doc_events hook: move index rows to the document's new name."""
+    if not is_indexed(doc.doctype):
+        return
+    if old_name:
+        remove_document(doc.doctype, old_name)
+    index_document(doc)
+
+
+def index_document(doc: Any) -> None:
+    """Replace the index rows of a single document."""
+    meta = frappe.get_meta(doc.doctype)
+    row = frappe._dict(
+        name=doc.name, owner=doc.owner, creation=doc.creation, modified=doc.modified
+    )
+    for column in get_search_columns(meta):
+        row[column] = doc.get(column)
+
+    remove_document(doc.doctype, doc.name)
+    values = _build_index_values(doc.doctype, meta, [row])
+    if values:
+        frappe.db.bulk_insert(INDEX_DOCTYPE, INDEX_FIELDS, values)
+
+
+def remove_document(doctype: str, name: str) -> None:
+    """Delete every index row of a document."""
+    frappe.db.delete(INDEX_DOCTYPE, {"reference_doctype": doctype, "reference_name": name})
+
+
+def prune_search_index() -> None:
+    """Delete index rows of doctypes that are no longer indexed.
+
+    Drops every row while the index is disabled.
+    """
+    if get_cached_settings().get("enable_search_index"):
+        filters = {"reference_doctype": ["not in", get_search_doctypes()]}
+    else:
+        filters = {}
+    frappe.db.delete(INDEX_DOCTYPE, filters)
+    bump_cache_version(INDEX_CACHE_VERSION)
+
+
+def rebuild_search_index(
+    doctypes: list[str] | tuple[str, ...] | None = None, chunk_size: int = 1000
+) -> dict[str, int]:
+    """Rebuild the index for ``doctypes`` in keyset-ordered chunks.
+
+    Returns the number of documents indexed per doctype.
+    """
+    counts: dict[str, int] = {}
+    for doctype in doctypes or get_search_doctypes():
+        if not frappe.db.exists("DocType", doctype):
+            continue
+
+        meta = frappe.get_meta(doctype)
+        fields = list(
+            dict.fromkeys(["name", "owner", "creation", "modified", *get_search_columns(meta)])
+        )
+        frappe.db.delete(INDEX_DOCTYPE, {"reference_doctype": doctype})
+
+        last_name = None
+        counts[doctype] = 0
+        while True:
+            rows = frappe.get_all(
+                doctype,
+                fields=fields,
+                filters={"name": [">", last_name]} if last_name else {},
+                order_by="name asc",
+                limit_page_length=chunk_size,
+            )
+            if not rows:
+                break
+
+            values = _build_index_values(doctype, meta, rows)
+            if values:
+                frappe.db.bulk_insert(INDEX_DOCTYPE, INDEX_FIELDS, values)
+            frappe.db.commit()
+
+            counts[doctype] += len(rows)
+            last_name = rows[-1].name
+
+        frappe.logger("desk_navbar_extended").info(
+            "Rebuilt navbar search index", extra={"doctype": doctype, "count": counts[doctype]}
+        )
+
+    bump_cache_version(INDEX_CACHE_VERSION)
+    return counts
+
+
+def get_vocabulary() -> TrigramIndex:
+    """Return the trigram index over all indexed tokens.
+
+    Only the first search of a process loads it inline. Once stale, the old
+    copy keeps being served while a single background thread reloads it.
+    """
+    site = frappe.local.site
+    version = get_cache_version(INDEX_CACHE_VERSION)
+    entry = _vocabularies.get(site)
+    if entry is None:
+        vocabulary = _load_vocabulary()
+        _vocabularies.set(site, (version, time.monotonic(), vocabulary))
+        return vocabulary
+
+    if entry[0] != version or time.monotonic() - entry[1] >= VOCABULARY_TTL:
+        _reload_vocabulary_in_background(site, version)
+    return entry[2]
+
+
+def _load_vocabulary() -> TrigramIndex:
+    return TrigramIndex(
+        frappe.db.sql_list("SELECT DISTINCT `token` FROM `tabDesk Navbar Search Index`")
+    )
+
+
+def _reload_vocabulary_in_background(site: str, version: str) -> None:
+    with _reloading_lock:
+        if site in _reloading:
+            return
+        _reloading.add(site)
+    threading.Thread(
+        target=_reload_vocabulary,
+        args=(site, frappe.local.sites_path, version),
+        name="desk-navbar-vocabulary",
+        daemon=True,
+    ).start()
+
+
+def _reload_vocabulary(site: str, sites_path: str, version: str) -> None:
+    try:
+        frappe.init(site=site, sites_path=sites_path)
+        frappe.connect()
+        _vocabularies.set(site, (version, time.monotonic(), _load_vocabulary()))
+    except Exception:  # noqa: BLE001
+        frappe.logger("desk_navbar_extended").warning(
+            "Failed to reload the search vocabulary", exc_info=True
+        )
+    finally:
+        frappe.destroy()
+        with _reloading_lock:
+            _reloading.discard(site)
+
+
+def search_index(
+    query: str,
+    doctypes: list[str] | tuple[str, ...],
+    owner: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    limit: int = 20,
+    fuzzy: bool = True,
+) -> list[dict[str, Any]]:
+    """Return up to ``limit`` permitted documents matching ``query`` across ``doctypes``.
+
+    A term scores 1 when it is a prefix of one of the document's tokens. With
+    ``fuzzy`` it otherwise scores the trigram similarity of the closest token.
+    Documents are ranked by the sum over terms, then by modification time.
+    """
+    terms = tokenize(query, limit=MAX_QUERY_TERMS)
+    if not terms or not doctypes or limit <= 0:
+        return []
+
+    vocabulary = get_vocabulary() if fuzzy else None
+    values: dict[str, Any] = {
+        "doctypes": tuple(doctypes),
+        "candidates": limit * CANDIDATE_FACTOR,
+    }
+    matches = []
+    term_scores = []
+    fuzzy_keys = []
+    for idx, term in enumerate(terms):
+        prefix_key = f"prefix_{idx}"
+        values[prefix_key] = escape_like(term) + "%"
+        matches.append(f"`token` LIKE %({prefix_key})s")
+        whens = [f"WHEN `token` LIKE %({prefix_key})s THEN 1"]
+
+        if vocabulary is not None and len(term) >= FUZZY_MIN_TERM_LENGTH:
+            expansions = vocabulary.search(term, FUZZY_EXPANSIONS, FUZZY_MIN_SIMILARITY)
+            for jdx, (similarity, token) in enumerate(expansions):
+                if token.startswith(term):
+                    continue
+                key = f"fuzzy_{idx}_{jdx}"
+                values[key] = token
+                values[f"{key}_score"] = similarity
+                whens.append(f"WHEN `token` = %({key})s THEN %({key}_score)s")
+                fuzzy_keys.append(key)
+
+        term_scores.append(f"MAX(CASE {' '.join(whens)} ELSE 0 END)")
+
+    if fuzzy_keys:
+        matches.append(f"`token` IN ({', '.join(f'%({key})s' for key in fuzzy_keys)})")
+
+    conditions = ["`reference_doctype` IN %(doctypes)s", f"({' OR '.join(matches)})"]
+    if owner:
+        conditions.append("`document_owner` = %(owner)s")
+        values["owner"] = owner
+    if created_from:
+        conditions.append("`document_creation` >= %(created_from)s")
+        values["created_from"] = created_from
+    if created_to:
+        conditions.append("`document_creation` <= %(created_to)s")
+        values["created_to"] = created_to
+
+    rows = frappe.db.sql(
+        f"""
+        SELECT `reference_doctype`, `reference_name`, MAX(`title`) AS `title`,
+            ({" + ".join(term_scores)}) AS `score`,
+            MAX(`document_modified`) AS `document_modified`
+        FROM `tabDesk Navbar Search Index`
+        WHERE {" AND ".join(conditions)}
+        GROUP BY `reference_doctype`, `reference_name`
+        ORDER BY `score` DESC, `document_modified` DESC
+        LIMIT %(candidates)s
+        """,
+        values,
+        as_dict=True,
+    )
+    return _filter_permitted(rows, limit)
+
+
+def _filter_permitted(rows: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    """Drop candidates the user cannot read, with one query per doctype."""
+    names_by_doctype: dict[str, list[str]] = defaultdict(list)
+    for row in rows:
+        names_by_doctype[row.reference_doctype].append(row.reference_name)
+
+    permitted: set[tuple[str, str]] = set()
+    for doctype, names in names_by_doctype.items():
+        for name in frappe.get_list(
+            doctype, filters={"name": ["in", names]}, pluck="name", limit_page_length=0
+        ):
+            permitted.add((doctype, name))
+
+    results: list[dict[str, Any]] = []
+    for row in rows:
+        if (row.reference_doctype, row.reference_name) not in permitted:
+            continue
+        results.append(
+            {
+                "value": row.reference_name,
+                "label": row.title,
+                "description": _(row.reference_doctype),
+                "doctype": row.reference_doctype,
+                "score": round(float(row.score or 0), 4),
+            }
+        )
+        if len(results) >= limit:
+            break
+    return results
+
+
+def _build_index_values(doctype: str, meta: Any, rows: list[dict[str, Any]]) -> list[tuple]:
+    title_field = meta.get_title_field()
+    columns = get_search_columns(meta)
+    now = now_datetime()
+    user = frappe.session.user
+
+    values = []
+    for row in rows:
+        title = strip_html_tags(cstr(row.get(title_field) or row.name))[:MAX_TOKEN_LENGTH]
+        text = " ".join(
+            strip_html_tags(value)
+            for value in (row.get(column) for column in columns)
+            if isinstance(value, str) and value
+        )
+        for token in tokenize(text):
+            values.append(
+                (
+                    frappe.generate_hash(length=12),
+                    now,
+                    now,
+                    user,
+                    user,
+                    token,
+                    doctype,
+                    row.name,
+                    title,
+                    row.owner,
+                    row.creation,
+                    row.modified,
+                )
+            )
+    return values
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so ``%`` and ``_`` in ``value`` match literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -0,0 +1,121 @@
+"""Short-lived cache of ``search_with_filters`` results.
+
+Keys combine the normalised request, a permission fingerprint of the caller
+and the version token of every doctype in scope. Any write to one of those
+doctypes replaces its token through doc_events, so stale pages stop matching
+without having to enumerate and delete them. Only searches confined to the
+configured global search doctypes are cached, so writes to any other doctype
+leave the tokens alone.
+"""
+
+from __future__ import annotations
+
+import json
+from hashlib import sha1
+from typing import Any
+
+import frappe
+import frappe.permissions
+
+from desk_navbar_extended.cache import bump_cache_version, get_cache_version
+from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings.desk_navbar_extended_settings import (
+    SETTINGS_CACHE_VERSION,
+)
+from desk_navbar_extended.metrics import registry
+from desk_navbar_extended.search.index import get_search_doctypes
+
+RESULT_CACHE_PREFIX = "desk_navbar_extended:search_results:"
+RESULT_CACHE_TTL = 30
+
+
+def doctype_version_name(doctype: str) -> str:
+    return f"search:{doctype}"
+
+
+def is_cacheable(scope: list[str]) -> bool:
+    """Return True when every doctype in ``scope`` invalidates cached searches on write."""
+    search_doctypes = get_search_doctypes()
+    return all(doctype in search_doctypes for doctype in scope)
+
+
+def get_permission_fingerprint(doctypes: list[str], user: str | None = None) -> str:
+    """Hash everything besides the query that decides which rows ``user`` can see.
+
+    Roles and user permissions are shared by many users, and so is the empty
+    set of documents shared with them. Doctypes with a
+    ``permission_query_conditions`` hook or owner-only read access produce
+    per-user results, so the user id is folded in for those.
+    """
+    user = user or frappe.session.user
+    hooked = frappe.get_hooks("permission_query_conditions") or {}
+    user_scoped = any(
+        doctype in hooked
+        or frappe.permissions.get_role_permissions(doctype, user=user).get("if_owner")
+        for doctype in doctypes
+    )
+    payload = [
+        sorted(frappe.get_roles(user)),
+        frappe.permissions.get_user_permissions(user),
+        user if user_scoped else None,
+        _shared_documents(doctypes, user),
+    ]
+    return sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _shared_documents(doctypes: list[str], user: str) -> list[tuple[str, str]]:
+    """Return the documents of ``doctypes`` shared with ``user``, which get_list also returns."""
+    if not doctypes:
+        return []
+    shares = frappe.get_all(
+        "DocShare",
+        filters={"user": user, "share_doctype": ["in", doctypes], "read": 1},
+        fields=["share_doctype", "share_name"],
+        as_list=True,
+    )
+    return sorted((doctype, name) for doctype, name in shares)
+
+
+def make_key(
+    query: str,
+    doctype: str | None,
+    scope: list[str],
+    owner: str | None,
+    date_from: str | None,
+    date_to: str | None,
+    limit: int,
+) -> str:
+    """Return the cache key for a search request over the doctypes in ``scope``."""
+    payload = [
+        query.lower(),
+        doctype,
+        owner,
+        date_from,
+        date_to,
+        limit,
+        get_permission_fingerprint(scope),
+        get_cache_version(SETTINGS_CACHE_VERSION),
+        [(dt, get_cache_version(doctype_version_name(dt))) for dt in scope],
+    ]
+    digest = sha1(json.dumps(payload, default=str).encode()).hexdigest()
+    return RESULT_CACHE_PREFIX + digest
+
+
+def get(key: str) -> list[dict[str, Any]] | None:
+    results = frappe.cache().get_value(key)
+    registry.inc(
+        "cache_lookups", {"cache": "search_results", "result": "miss" if results is None else "hit"}
+    )
+    return results
+
+
+def set(key: str, results: list[dict[str, Any]]) -> None:
+    frappe.cache().set_value(key, results, expires_in_sec=RESULT_CACHE_TTL)
+
+
+def on_document_change(doc: Any, method: str | None = None, *args: Any, **kwargs: Any) -> None:
+    """doc_events hook: invalidate cached searches that may include ``doc.doctype``."""
+    if frappe.flags.in_install or frappe.flags.in_migrate:
+        return
+    if doc.doctype not in get_search_doctypes():
+        return
+    bump_cache_version(doctype_version_name(doc.doctype))
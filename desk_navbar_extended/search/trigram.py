@@ -0,0 +1,108 @@
+"""Trigram posting-list index for typo-tolerant term matching.
+
+The index holds a vocabulary of terms. Each padded trigram maps to a compact
+posting list of term ids. A lookup counts how many of the query's trigrams each
+term shares, scores the candidates and keeps the best ``k`` with a heap. It is
+free of Frappe imports so it can be benchmarked and tested standalone.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import Counter
+from collections.abc import Iterable
+
+
+def trigrams(term: str, pad_end: bool = True) -> list[str]:
+    """Return the distinct padded trigrams of ``term``.
+
+    The term is padded with two leading blanks and one trailing blank so that
+    prefixes are weighted. ``pad_end=False`` drops the trailing trigram, which
+    lets an unfinished query such as ``custo`` score as a prefix of ``customer``.
+    """
+    padded = f"  {term} " if pad_end else f"  {term}"
+    seen: dict[str, None] = {}
+    for idx in range(len(padded) - 2):
+        seen.setdefault(padded[idx : idx + 3])
+    return list(seen)
+
+
+class TrigramIndex:
+    """In-memory vocabulary index answering "which known terms look like this?"."""
+
+    # Weight of the candidate's unmatched trigrams in the similarity denominator;
+    # below 1 so that a short prefix still scores well against a long term.
+    EXTRA_TRIGRAM_WEIGHT = 0.25
+
+    def __init__(self, terms: Iterable[str] = ()) -> None:
+        self._terms: list[str] = []
+        self._sizes = array("H")
+        self._ids: dict[str, int] = {}
+        self._postings: dict[str, array] = {}
+        for term in terms:
+            self.add(term)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._ids
+
+    def add(self, term: str) -> None:
+        """Add ``term`` to the vocabulary; adding a known term is a no-op."""
+        if not term or term in self._ids:
+            return
+        term_id = len(self._terms)
+        grams = trigrams(term)
+        self._ids[term] = term_id
+        self._terms.append(term)
+        self._sizes.append(min(len(grams), 0xFFFF))
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(term_id)
+
+    def search(
+        self, query: str, k: int = 8, min_similarity: float = 0.45
+    ) -> list[tuple[float, str]]:
+        """Return up to ``k`` ``(similarity, term)`` pairs, best first.
+
+        Similarity is ``shared / (query_trigrams + w * unmatched_term_trigrams)``,
+        where ``w`` is :attr:`EXTRA_TRIGRAM_WEIGHT`, so an exact match scores 1.0.
+        """
+        query = (query or "").strip().lower()
+        if not query or k <= 0:
+            return []
+
+        grams = trigrams(query, pad_end=False)
+        counts: Counter[int] = Counter()
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting:
+                counts.update(posting)
+        if not counts:
+            return []
+
+        query_size = len(grams)
+        # Candidates sharing fewer trigrams than this cannot reach min_similarity.
+        min_shared = max(1, int(min_similarity * query_size))
+        weight = self.EXTRA_TRIGRAM_WEIGHT
+        sizes = self._sizes
+        exact_id = self._ids.get(query)
+
+        def scored():
+            for term_id, shared in counts.items():
+                if shared < min_shared:
+                    continue
+                if term_id == exact_id:
+                    yield 1.0, term_id
+                    continue
+                extra = max(sizes[term_id] - shared, 0)
+                score = shared / (query_size + weight * extra)
+                if score >= min_similarity:
+                    yield score, term_id
+
+        best = heapq.nlargest(k, scored())
+        return [(round(score, 4), self._terms[term_id]) for score, term_id in best]
@@ -60,6 +60,15 @@ def seed_default_settings() -> None:
         "awesomebar_mobile_collapse": 1,
         "enable_usage_analytics": 0,
         "kpi_refresh_interval": 300,
+        "search_deadline_ms": 1500,
+        "search_max_workers": 4,
+        "error_rate_window_seconds": 300,
+        "error_rate_min_samples": 20,
+        "error_rate_alert_threshold": 30,
+        "error_rate_clear_threshold": 15,
+        "metric_retention_days": 30,
+        "metric_sample_rate": 100,
+        "enable_api_instrumentation": 0,
     }
 
     # Update values only if they're not already set
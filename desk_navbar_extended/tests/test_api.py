@@ -6,6 +6,8 @@ from unittest.mock import patch
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from desk_navbar_extended.metrics.buffer import METRIC_BUFFER_KEY, flush_search_metrics
+
 
 class TestDeskNavbarExtendedAPI(FrappeTestCase):
     def test_get_settings_includes_feature_flags(self):
@@ -14,7 +16,8 @@ class TestDeskNavbarExtendedAPI(FrappeTestCase):
         self.assertIn("clock", settings)
         self.assertIn("awesomebar", settings)
 
-    def test_log_search_metrics_persists_document(self):
+    def test_log_search_metrics_is_buffered_until_flush(self):
+        frappe.cache().delete_value(METRIC_BUFFER_KEY)
         before = frappe.db.count("Desk Navbar Search Metric")
         frappe.call(
             "desk_navbar_extended.api.log_search_metrics",
@@ -24,9 +27,28 @@ class TestDeskNavbarExtendedAPI(FrappeTestCase):
                 "execution_ms": 42,
             },
         )
+        self.assertEqual(frappe.db.count("Desk Navbar Search Metric"), before)
+
+        flush_search_metrics()
         after = frappe.db.count("Desk Navbar Search Metric")
         self.assertEqual(after, before + 1)
 
+    def test_log_search_metrics_batch_buffers_valid_events(self):
+        frappe.cache().delete_value(METRIC_BUFFER_KEY)
+        before = frappe.db.count("Desk Navbar Search Metric")
+        response = frappe.call(
+            "desk_navbar_extended.api.log_search_metrics_batch",
+            events=[
+                {"status": "success", "search_length": 3, "execution_ms": 12},
+                {"status": "error", "search_length": 4, "execution_ms": "oops"},
+                {"status": "error", "search_length": 5, "execution_ms": 30, "event_ts": "junk"},
+            ],
+        )
+        self.assertEqual(response, {"accepted": 2, "rejected": 1})
+
+        flush_search_metrics()
+        self.assertEqual(frappe.db.count("Desk Navbar Search Metric"), before + 2)
+
     def test_transcribe_audio_enqueues_background_job(self):
         payload = base64.b64encode(b"demo").decode()
         with patch("frappe.enqueue") as enqueue_mock:
@@ -39,3 +61,26 @@ class TestDeskNavbarExtendedAPI(FrappeTestCase):
     def test_transcribe_audio_rejects_invalid_payload(self):
         with self.assertRaises((frappe.ValidationError, TypeError, ValueError)):
             frappe.call("desk_navbar_extended.api.transcribe_audio", audio="not-base64==")
+
+    def test_boot_session_embeds_settings(self):
+        from desk_navbar_extended.boot import boot_session
+
+        bootinfo = frappe._dict()
+        boot_session(bootinfo)
+
+        self.assertEqual(
+            bootinfo.desk_navbar_extended,
+            frappe.call("desk_navbar_extended.api.get_settings"),
+        )
+
+    def test_boot_session_skips_fallback_settings(self):
+        from desk_navbar_extended.boot import boot_session
+
+        bootinfo = frappe._dict()
+        with patch(
+            "desk_navbar_extended.root_api.get_enabled_features_for_user",
+            side_effect=frappe.ValidationError,
+        ):
+            boot_session(bootinfo)
+
+        self.assertNotIn("desk_navbar_extended", bootinfo)
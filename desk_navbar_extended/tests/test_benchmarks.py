@@ -0,0 +1,33 @@
+"""Tests for diffing endpoint benchmark reports."""
+
+from __future__ import annotations
+
+import unittest
+
+from desk_navbar_extended.benchmarks.api import bench_name, compare
+
+
+def report(p50_ms, queries):
+    endpoint = {"p50_ms": p50_ms, "queries": queries}
+    return {"scales": {"0.1": {"endpoints": {"get_recent_activity": endpoint}}}}
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+    def test_within_threshold_is_not_a_regression(self):
+        self.assertEqual(compare(report(10.0, 5), report(11.9, 5), threshold=0.2), [])
+
+    def test_slower_endpoint_is_reported(self):
+        (regression,) = compare(report(10.0, 5), report(13.0, 5), threshold=0.2)
+        self.assertEqual(regression["endpoint"], "get_recent_activity")
+        self.assertEqual(regression["metric"], "p50_ms")
+        self.assertAlmostEqual(regression["change"], 0.3)
+
+    def test_extra_queries_are_reported(self):
+        (regression,) = compare(report(10.0, 5), report(10.0, 25))
+        self.assertEqual((regression["metric"], regression["change"]), ("queries", 20))
+
+    def test_missing_scales_are_ignored(self):
+        self.assertEqual(compare(report(10.0, 5), {"scales": {}}), [])
+
+    def test_seeded_names_are_deterministic(self):
+        self.assertEqual(bench_name("Activity Log", 7), "DNXBENCH-AL-00000007")
@@ -0,0 +1,58 @@
+"""Tests for command palette sources."""
+
+from __future__ import annotations
+
+import json
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from desk_navbar_extended.api import command_palette
+
+
+class TestCommandPalette(FrappeTestCase):
+    def setUp(self):
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.enable_command_palette = 1
+        settings.enable_pins = 0
+        settings.flags.ignore_permissions = True
+        settings.save()
+
+    def tearDown(self):
+        frappe.local.request = None
+
+    def test_all_sources_keep_their_keys(self):
+        """The combined endpoint still returns every source, empty when disabled."""
+        sources = command_palette.get_command_palette_sources()
+
+        self.assertEqual(list(sources), list(command_palette.SOURCE_FEATURES))
+        self.assertEqual(sources["pins"], [])
+        self.assertTrue(sources["doctypes"])
+
+    def test_single_source_has_cache_headers(self):
+        """Each source is served with its own Cache-Control and an ETag."""
+        response = command_palette.get_command_palette_source("doctypes")
+
+        self.assertEqual(response.headers["Cache-Control"], "private, max-age=300")
+        self.assertTrue(json.loads(response.get_data())["message"])
+
+        frappe.local.request = Request(
+            EnvironBuilder(headers={"If-None-Match": response.headers["ETag"]}).get_environ()
+        )
+        self.assertEqual(command_palette.get_command_palette_source("doctypes").status_code, 304)
+
+    def test_disabled_source_is_rejected(self):
+        with self.assertRaises(frappe.PermissionError):
+            command_palette.get_command_palette_source("pins")
+
+    def test_server_search_ranks_catalog(self):
+        """Fuzzy palette search ranks initials and prefixes first and honours the limit."""
+        results = command_palette.search_command_palette("todo", limit=5)
+
+        self.assertLessEqual(len(results), 5)
+        self.assertEqual(results[0]["value"], "ToDo")
+        self.assertEqual(results[0]["source"], "doctypes")
+        scores = [row["score"] for row in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
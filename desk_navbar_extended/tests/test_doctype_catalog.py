@@ -0,0 +1,52 @@
+"""Tests for the role-keyed DocType catalog of the command palette."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended import doctype_catalog
+from desk_navbar_extended.tests.utils import count_queries
+
+
+class TestDocTypeCatalog(FrappeTestCase):
+    def setUp(self):
+        doctype_catalog.clear_catalog_cache()
+
+    def test_catalog_is_not_capped(self):
+        """Every readable DocType is listed, not just the first hundred."""
+        expected = frappe.db.count("DocType", {"istable": 0, "issingle": 0})
+        catalog = doctype_catalog.get_permitted_doctypes("Administrator")
+
+        self.assertEqual(len(catalog), expected)
+        self.assertGreater(len(catalog), 100)
+
+    def test_catalog_respects_read_permission(self):
+        """Users only see DocTypes one of their roles can read."""
+        catalog = {row["value"] for row in doctype_catalog.get_permitted_doctypes("Guest")}
+
+        self.assertNotIn("User", catalog)
+        self.assertTrue(all(frappe.has_permission(dt, "read", user="Guest") for dt in catalog))
+
+    def test_cached_catalog_runs_no_queries(self):
+        """A warm catalog is served without touching the database."""
+        doctype_catalog.get_permitted_doctypes()
+
+        with count_queries() as counter:
+            doctype_catalog.get_permitted_doctypes()
+
+        self.assertEqual(counter.queries, 0)
+
+    def test_permission_change_rebuilds_catalog(self):
+        """DocType, Custom DocPerm and Role hooks invalidate every cached catalog."""
+        doctype_catalog.get_permitted_doctypes()
+
+        with patch.object(doctype_catalog, "_build_catalog", return_value=[]) as build:
+            doctype_catalog.get_permitted_doctypes()
+            build.assert_not_called()
+
+            doctype_catalog.on_permission_change(frappe.get_doc("Role", "System Manager"))
+            self.assertEqual(doctype_catalog.get_permitted_doctypes(), [])
+            build.assert_called_once()
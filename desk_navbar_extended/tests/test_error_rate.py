@@ -0,0 +1,77 @@
+"""Tests for the sliding-window search error-rate detector."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended.metrics import error_rate
+
+
+class TestErrorRate(FrappeTestCase):
+    def setUp(self):
+        # A fresh, far-away window keeps runs independent of live traffic.
+        self.now = time.time() + 10**7
+        self.config = frappe._dict(window=60, raise_at=0.3, clear_at=0.15, min_samples=20)
+        frappe.cache().delete(frappe.cache().make_key(error_rate.ALERT_STATE_KEY))
+
+    def record(self, successes, errors):
+        with patch.object(error_rate, "evaluate_error_rate"):
+            for _ in range(successes):
+                error_rate.record_search_outcome("success", now=self.now)
+            for _ in range(errors):
+                error_rate.record_search_outcome("error", now=self.now)
+
+    def evaluate(self):
+        return error_rate.evaluate_error_rate(self.now, self.config)
+
+    def test_rate_is_read_from_window_buckets(self):
+        """Outcomes recorded in the window are summed across buckets."""
+        self.record(6, 2)
+        self.now += error_rate.BUCKET_SECONDS
+        self.record(1, 1)
+
+        rate, errors, total = error_rate.get_error_rate(60, self.now)
+
+        self.assertEqual((errors, total), (3, 10))
+        self.assertAlmostEqual(rate, 0.3)
+
+    def test_alert_is_raised_once_and_sent_to_system_managers(self):
+        """Crossing the threshold notifies System Managers a single time."""
+        self.record(15, 10)
+
+        with patch.object(frappe, "publish_realtime") as publish:
+            self.assertEqual(self.evaluate(), "raised")
+            self.assertIsNone(self.evaluate())
+
+        users = {call.kwargs["user"] for call in publish.call_args_list}
+        self.assertIn("Administrator", users)
+        self.assertEqual(publish.call_args.args[1]["state"], "raised")
+
+    def test_alert_does_not_flap_between_thresholds(self):
+        """A rate between the clear and alert thresholds keeps the current state."""
+        self.record(15, 10)
+        with patch.object(frappe, "publish_realtime"):
+            self.evaluate()
+
+        # 10 / 40 = 0.25: below the alert threshold, above the clear threshold.
+        self.record(15, 0)
+        with patch.object(frappe, "publish_realtime") as publish:
+            self.assertIsNone(self.evaluate())
+        publish.assert_not_called()
+
+        # 10 / 70 ~= 0.14: clears.
+        self.record(30, 0)
+        with patch.object(frappe, "publish_realtime"):
+            self.assertEqual(self.evaluate(), "cleared")
+
+    def test_too_few_samples_do_not_alert(self):
+        """A handful of failures below the minimum sample size is ignored."""
+        self.record(1, 4)
+
+        with patch.object(frappe, "publish_realtime") as publish:
+            self.assertIsNone(self.evaluate())
+        publish.assert_not_called()
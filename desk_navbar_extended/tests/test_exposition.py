@@ -0,0 +1,55 @@
+"""Tests for the Prometheus text exposition format."""
+
+from __future__ import annotations
+
+import math
+import unittest
+
+from desk_navbar_extended.metrics.exposition import render
+
+SNAPSHOT = {
+    "counters": {
+        ("cache_lookups", '{"cache":"search_results","result":"hit"}'): {"value": 3.0},
+        ("cache_lookups", '{"cache":"search_results","result":"miss"}'): {"value": 1.0},
+        ("search_errors", "{}"): {"value": 2.0},
+    },
+    "histograms": {
+        ("search_latency_ms", '{"status":"success"}'): {
+            "buckets": [(5.0, 1.0), (10.0, 3.0), (math.inf, 4.0)],
+            "sum": 42.5,
+            "count": 4.0,
+        },
+    },
+}
+
+
+class TestExposition(unittest.TestCase):
+    def setUp(self):
+        self.lines = render(SNAPSHOT).splitlines()
+
+    def test_counters_have_total_suffix_and_type(self):
+        self.assertIn("# TYPE desk_navbar_search_errors_total counter", self.lines)
+        self.assertIn("desk_navbar_search_errors_total 2", self.lines)
+        self.assertIn(
+            'desk_navbar_cache_lookups_total{cache="search_results",result="hit"} 3', self.lines
+        )
+
+    def test_histograms_are_cumulative_with_inf_bucket(self):
+        self.assertIn("# TYPE desk_navbar_search_latency_ms histogram", self.lines)
+        self.assertIn(
+            'desk_navbar_search_latency_ms_bucket{status="success",le="10"} 3', self.lines
+        )
+        self.assertIn(
+            'desk_navbar_search_latency_ms_bucket{status="success",le="+Inf"} 4', self.lines
+        )
+        self.assertIn('desk_navbar_search_latency_ms_sum{status="success"} 42.5', self.lines)
+        self.assertIn('desk_navbar_search_latency_ms_count{status="success"} 4', self.lines)
+
+    def test_cache_hit_ratio_gauge(self):
+        self.assertIn("# TYPE desk_navbar_cache_hit_ratio gauge", self.lines)
+        self.assertIn('desk_navbar_cache_hit_ratio{cache="search_results"} 0.75', self.lines)
+
+    def test_label_values_are_escaped(self):
+        counters = {("api_errors", '{"endpoint":"a\\"b\\\\c"}'): {"value": 1}}
+        text = render({"counters": counters, "histograms": {}})
+        self.assertIn('desk_navbar_api_errors_total{endpoint="a\\"b\\\\c"} 1', text)
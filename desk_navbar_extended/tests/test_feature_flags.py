@@ -0,0 +1,63 @@
+"""Tests for cached feature flag resolution."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended.desk_navbar_extended.doctype.desk_navbar_extended_settings import (
+    desk_navbar_extended_settings as settings_module,
+)
+
+
+class TestFeatureFlags(FrappeTestCase):
+    def setUp(self):
+        self.settings = frappe.get_single("Desk Navbar Extended Settings")
+        self.settings.enable_pins = 1
+        self.settings.enable_role_toggles = 1
+        self.settings.set("feature_roles", [])
+        self.settings.flags.ignore_permissions = True
+        self.settings.save()
+
+    def test_second_lookup_skips_settings_load(self):
+        """A warm cache must not reload the settings singleton."""
+        settings_module.get_enabled_features_for_user()
+
+        with patch.object(settings_module, "get_settings_doc") as get_settings_doc:
+            features = settings_module.get_enabled_features_for_user()
+
+        get_settings_doc.assert_not_called()
+        self.assertTrue(features["pins"])
+
+    def test_settings_update_invalidates_cache(self):
+        """Saving the settings must be visible on the next lookup."""
+        self.assertTrue(settings_module.get_enabled_features_for_user()["pins"])
+
+        self.settings.enable_pins = 0
+        self.settings.save()
+
+        self.assertFalse(settings_module.get_enabled_features_for_user()["pins"])
+
+    def test_role_override_is_keyed_by_role_set(self):
+        """Users with different role sets get separately resolved maps."""
+        self.settings.append("feature_roles", {"feature": "pins", "role": "System Manager"})
+        self.settings.save()
+
+        self.assertTrue(settings_module.get_enabled_features_for_user("Administrator")["pins"])
+        self.assertFalse(settings_module.get_enabled_features_for_user("Guest")["pins"])
+
+    def test_returned_map_is_a_copy(self):
+        """Callers mutating the result must not poison the cache."""
+        features = settings_module.get_enabled_features_for_user()
+        features["pins"] = False
+
+        self.assertTrue(settings_module.get_enabled_features_for_user()["pins"])
+
+    def tearDown(self):
+        self.settings.reload()
+        self.settings.set("feature_roles", [])
+        self.settings.enable_pins = 1
+        self.settings.flags.ignore_permissions = True
+        self.settings.save()
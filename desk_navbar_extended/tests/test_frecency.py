@@ -0,0 +1,91 @@
+"""Tests for the per-user frecency store."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended import frecency
+from desk_navbar_extended.api import command_palette, search_filters
+
+DAY = 24 * 3600
+
+
+class TestFrecency(FrappeTestCase):
+    def setUp(self):
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.enable_command_palette = 1
+        settings.flags.ignore_permissions = True
+        settings.save()
+        frecency.clear()
+
+    def tearDown(self):
+        frecency.clear()
+
+    def test_route_keys_match_across_sources(self):
+        """Catalog, pin and browser spellings of a route share one key."""
+        self.assertEqual(frecency.route_key("/app/sales_order"), "sales-order")
+        self.assertEqual(frecency.route_key("/app/sales-order/view/report?x=1"), "sales-order")
+        self.assertEqual(
+            frecency.route_key("/app/sales-order/new-sales-order-abc"), "sales-order/new"
+        )
+        self.assertEqual(frecency.route_key("/app/todo/a%2Fb"), frecency.doc_key("ToDo", "a/b"))
+        self.assertIsNone(frecency.route_key("/app"))
+
+    def test_scores_decay_with_half_life(self):
+        """Two visits four weeks ago count less than one visit now."""
+        start = 1_800_000_000
+        with patch.object(frecency, "time") as clock:
+            clock.time.return_value = start
+            frecency.record_visits([("/app/sales-order", None), ("/app/sales-order", None)])
+            clock.time.return_value = start + 28 * DAY
+            frecency.record_visits([("/app/todo", None)])
+            scores = frecency.get_scores()
+
+        self.assertAlmostEqual(scores["todo"], 1.0, places=6)
+        self.assertAlmostEqual(scores["sales-order"], 0.5, places=6)
+
+    def test_hash_is_trimmed_to_most_used(self):
+        """Past the slack, the least used routes are dropped."""
+        hour_ago = time.time() - 3600
+        with patch.multiple(frecency, MAX_ENTRIES=3, TRIM_SLACK=1):
+            frecency.record_visits((f"/app/doctype-{idx}", hour_ago + idx) for idx in range(4))
+            self.assertEqual(len(frecency.get_scores()), 4)
+            frecency.record_visits([("/app/doctype-4", None)])
+
+        self.assertEqual(set(frecency.get_scores()), {"doctype-2", "doctype-3", "doctype-4"})
+
+    def test_batch_endpoint_skips_malformed_visits(self):
+        result = command_palette.record_visits(
+            frappe.as_json([{"route": "/app/todo"}, {"path": "x"}, "todo", {"route": "/app"}])
+        )
+
+        self.assertEqual(result, {"accepted": 1, "rejected": 3})
+        self.assertIn("todo", frecency.get_scores())
+
+    def test_palette_puts_frequent_entries_first(self):
+        command_palette.record_visits([{"route": "/app/todo"}] * 3)
+
+        doctypes = command_palette.get_command_palette_sources()["doctypes"]
+        self.assertEqual(doctypes[0]["value"], "ToDo")
+        self.assertGreater(doctypes[0]["frecency"], 0)
+        self.assertEqual(command_palette.search_command_palette("t")[0]["value"], "ToDo")
+
+    def test_cursor_search_puts_frequent_documents_first(self):
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.enable_smart_filters = 1
+        settings.save()
+        for idx in range(3):
+            frappe.get_doc({"doctype": "ToDo", "description": f"Frecprobe {idx}"}).insert(
+                ignore_permissions=True
+            )
+        page = search_filters.search_with_cursor(query="Frecprobe", doctype="ToDo")
+        oldest = page["results"][-1]["name"]
+
+        command_palette.record_visits([{"route": f"/app/todo/{oldest}"}] * 3)
+
+        page = search_filters.search_with_cursor(query="Frecprobe", doctype="ToDo")
+        self.assertEqual(page["results"][0]["name"], oldest)
@@ -0,0 +1,92 @@
+"""Tests for the fuzzy subsequence scorer."""
+
+from __future__ import annotations
+
+import random
+import unittest
+
+from desk_navbar_extended.benchmarks.search import generate_titles
+from desk_navbar_extended.search.fuzzy import FuzzyIndex, score, word_starts
+
+
+class TestFuzzyScore(unittest.TestCase):
+    def test_word_starts_include_camel_case(self):
+        self.assertEqual(word_starts("Sales Order"), (0, 6))
+        self.assertEqual(word_starts("salesOrder-item"), (0, 5, 11))
+
+    def test_non_subsequence_does_not_match(self):
+        self.assertIsNone(score("ors", "Sales Order"))
+        self.assertIsNotNone(score("slsord", "Sales Order"))
+
+    def test_prefix_beats_inner_substring(self):
+        self.assertGreater(score("ord", "Order Item"), score("ord", "Sales Order"))
+        self.assertGreater(score("ord", "Sales Order"), score("ord", "Border"))
+
+    def test_initials_beat_scattered_letters(self):
+        """``so`` prefers Sales Order over a text that merely contains s and o."""
+        self.assertGreater(score("so", "Sales Order"), score("so", "Sobriety Log"))
+        self.assertGreater(score("si", "Sales Invoice"), score("si", "Asset Item"))
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        self.labels = ["Sales Order", "Sales Invoice", "Supplier", "Stock Entry", "Purchase Order"]
+        self.index = FuzzyIndex(self.labels)
+
+    def test_results_are_ranked(self):
+        results = self.index.search("so")
+        self.assertEqual(self.labels[results[0][1]], "Sales Order")
+        scores = [value for value, _idx in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_limit_and_empty_query(self):
+        self.assertEqual(len(self.index.search("s", k=2)), 2)
+        self.assertEqual([idx for _value, idx in self.index.search("", k=3)], [0, 1, 2])
+        self.assertEqual(self.index.search("zzz"), [])
+
+    def test_pruned_search_matches_exhaustive_ranking(self):
+        """Stopping early never changes the top k compared with scoring every item."""
+        titles = generate_titles(2000, seed=7) + self.labels
+        index = FuzzyIndex(titles)
+        rng = random.Random(7)
+        for _ in range(100):
+            title = rng.choice(titles)
+            start = rng.randrange(len(title))
+            query = title[start : start + rng.randint(1, 6)].strip() or "a"
+            expected = sorted(
+                (
+                    (value, -idx)
+                    for idx, title in enumerate(titles)
+                    if (value := score(query, title)) is not None
+                ),
+                reverse=True,
+            )[:10]
+            self.assertEqual(
+                index.search(query, k=10), [(value, -neg) for value, neg in expected], query
+            )
+
+    def test_boosts_lift_items_without_changing_pruning(self):
+        titles = generate_titles(2000, seed=11) + self.labels
+        index = FuzzyIndex(titles)
+        rng = random.Random(11)
+        boosts = {rng.randrange(len(titles)): rng.uniform(0, 16) for _ in range(50)}
+        for _ in range(50):
+            title = rng.choice(titles)
+            query = title[: rng.randint(1, 4)].strip() or "a"
+            expected = sorted(
+                (
+                    (value + boosts.get(idx, 0.0), -idx)
+                    for idx, title in enumerate(titles)
+                    if (value := score(query, title)) is not None
+                ),
+                reverse=True,
+            )[:10]
+            self.assertEqual(
+                index.search(query, k=10, boosts=boosts),
+                [(value, -neg) for value, neg in expected],
+                query,
+            )
+
+    def test_empty_query_lists_boosted_items_first(self):
+        ranked = self.index.search("", k=3, boosts={3: 2.0, 1: 5.0})
+        self.assertEqual([idx for _value, idx in ranked], [1, 3, 0])
@@ -0,0 +1,70 @@
+"""Tests for grouped recent activity."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended import recent_docs
+from desk_navbar_extended.api import history
+
+TEST_USER = "dne-history@example.com"
+
+
+class TestHistory(FrappeTestCase):
+    def setUp(self):
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.enable_grouped_history = 1
+        settings.flags.ignore_permissions = True
+        settings.save()
+        if not frappe.db.exists("User", TEST_USER):
+            frappe.get_doc(
+                {
+                    "doctype": "User",
+                    "email": TEST_USER,
+                    "first_name": "History",
+                    "send_welcome_email": 0,
+                }
+            ).insert(ignore_permissions=True)
+
+        recent_docs.clear_buffer(TEST_USER)
+
+    def tearDown(self):
+        frappe.set_user("Administrator")
+
+    def log_reads(self, user, doctype, names):
+        for name in names:
+            recent_docs.record(doctype, name, user=user)
+
+    def test_rows_the_user_cannot_read_are_dropped(self):
+        """Row-level permissions apply, and deleted documents disappear."""
+        own = frappe.get_doc(
+            {"doctype": "ToDo", "description": "Mine", "allocated_to": TEST_USER}
+        ).insert()
+        other = frappe.get_doc({"doctype": "ToDo", "description": "Not mine"}).insert()
+        self.log_reads(TEST_USER, "ToDo", [own.name, other.name, "missing-todo"])
+
+        frappe.set_user(TEST_USER)
+        names = [item["name"] for item in history.get_recent_activity()["items"]]
+
+        self.assertIn(own.name, names)
+        self.assertNotIn(other.name, names)
+        self.assertNotIn("missing-todo", names)
+
+    def test_permission_checks_do_not_grow_with_rows(self):
+        """Permission is checked per doctype, not per Activity Log row."""
+
+        def count_checks(size):
+            todos = [
+                frappe.get_doc({"doctype": "ToDo", "description": f"T{idx}"}).insert()
+                for idx in range(size)
+            ]
+            self.log_reads("Administrator", "ToDo", [todo.name for todo in todos])
+            with patch.object(frappe, "has_permission", wraps=frappe.has_permission) as check:
+                history.get_recent_activity()
+            return check.call_count
+
+        single = count_checks(1)
+        self.assertLessEqual(count_checks(5), single)
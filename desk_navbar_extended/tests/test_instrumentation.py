@@ -0,0 +1,91 @@
+"""Tests for per-endpoint API instrumentation."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended.api import metrics as metrics_api
+from desk_navbar_extended.metrics import instrumentation, registry
+
+
+@instrumentation.instrument("pins")
+def _three_queries():
+    for _ in range(3):
+        frappe.db.sql("select 1")
+    return "done"
+
+
+@instrumentation.instrument("pins")
+def _failing():
+    raise ValueError("boom")
+
+
+ENDPOINT = f"{__name__}._three_queries"
+
+
+class TestInstrumentation(FrappeTestCase):
+    def setUp(self):
+        registry.reset()
+
+    def tearDown(self):
+        registry.reset()
+
+    def stats_for(self, endpoint):
+        return next(row for row in metrics_api.get_api_stats() if row["endpoint"] == endpoint)
+
+    def test_disabled_records_nothing(self):
+        """With the setting off the endpoint runs without touching the registry."""
+        with patch.object(instrumentation, "is_enabled", return_value=False), patch.object(
+            registry, "observe"
+        ) as observe:
+            self.assertEqual(_three_queries(), "done")
+        observe.assert_not_called()
+
+    def test_records_time_and_queries(self):
+        """Calls, query counts and DB time are aggregated per endpoint."""
+        with patch.object(instrumentation, "is_enabled", return_value=True):
+            _three_queries()
+            _three_queries()
+
+        row = self.stats_for(ENDPOINT)
+        self.assertEqual(row["feature"], "pins")
+        self.assertEqual(row["calls"], 2)
+        self.assertEqual(row["errors"], 0)
+        self.assertEqual(row["mean_queries"], 3)
+        self.assertGreaterEqual(row["mean_ms"], row["mean_db_ms"])
+
+    def test_errors_are_counted_and_sql_restored(self):
+        """A failing call is counted and leaves frappe.db.sql unpatched."""
+        with patch.object(instrumentation, "is_enabled", return_value=True):
+            with self.assertRaises(ValueError):
+                _failing()
+
+        self.assertNotIn("sql", vars(frappe.db))
+        self.assertEqual(self.stats_for(f"{__name__}._failing")["errors"], 1)
+
+    def test_stats_are_admin_only(self):
+        frappe.set_user("Guest")
+        try:
+            with self.assertRaises(frappe.PermissionError):
+                metrics_api.get_api_stats()
+        finally:
+            frappe.set_user("Administrator")
+
+    def test_prometheus_endpoint_requires_token(self):
+        """The exposition endpoint rejects missing or wrong tokens."""
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.metrics_token = "scrape-secret"
+        settings.flags.ignore_permissions = True
+        settings.save()
+
+        registry.inc("search_errors")
+        response = metrics_api.get_prometheus_metrics(token="scrape-secret")
+        self.assertIn(b"desk_navbar_search_errors_total 1", response.get_data())
+
+        with self.assertRaises(frappe.AuthenticationError):
+            metrics_api.get_prometheus_metrics(token="wrong")
+        with self.assertRaises(frappe.AuthenticationError):
+            metrics_api.get_prometheus_metrics()
@@ -0,0 +1,90 @@
+"""Tests for search metric rollups and latency percentiles."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from desk_navbar_extended.api import metrics as metrics_api
+from desk_navbar_extended.metrics import rollups
+
+RANGE_START = datetime(2001, 1, 1, 10, 0)
+RANGE_END = datetime(2001, 1, 1, 12, 0)
+
+
+class TestMetricRollups(FrappeTestCase):
+    def setUp(self):
+        frappe.db.delete(
+            rollups.ROLLUP_DOCTYPE, {"bucket_start": ["between", [RANGE_START, RANGE_END]]}
+        )
+        frappe.db.delete(
+            "Desk Navbar Search Metric", {"event_ts": ["between", [RANGE_START, RANGE_END]]}
+        )
+
+        # Old enough to be settled and past the default retention window.
+        created = add_days(now_datetime(), -60)
+        rollups._set_watermark((created - timedelta(seconds=1), ""))
+        for idx in range(100):
+            doc = frappe.get_doc(
+                {
+                    "doctype": "Desk Navbar Search Metric",
+                    "event_ts": RANGE_START + timedelta(minutes=idx),
+                    "search_length": 4,
+                    "execution_ms": idx + 1,
+                    "status": "error" if idx % 10 == 0 else "success",
+                }
+            ).insert(ignore_permissions=True)
+            frappe.db.set_value(doc.doctype, doc.name, "creation", created, update_modified=False)
+
+        rollups.rollup_search_metrics()
+
+    def test_percentiles_merge_hour_and_minute_buckets(self):
+        """Whole hours and partial-hour edges add up to the raw rows."""
+        summary = rollups.summarize_range(RANGE_START, RANGE_END)
+
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["errors"], 10)
+        self.assertAlmostEqual(summary["p50"], 50, delta=1)
+        self.assertAlmostEqual(summary["p99"], 99, delta=2)
+
+        edges = rollups.summarize_range(
+            RANGE_START + timedelta(minutes=30), RANGE_START + timedelta(minutes=70)
+        )
+        self.assertEqual(edges["count"], 40)
+
+    def test_rollup_is_incremental(self):
+        """A second run without new rows leaves the buckets unchanged."""
+        self.assertEqual(rollups.rollup_search_metrics(), 0)
+        self.assertEqual(rollups.summarize_range(RANGE_START, RANGE_END)["count"], 100)
+
+    def test_prune_keeps_hour_rollups(self):
+        """Raw rows and minute buckets past retention are deleted; hours remain."""
+        rollups.prune_search_metrics(chunk_size=30)
+
+        self.assertFalse(
+            frappe.db.exists(
+                "Desk Navbar Search Metric", {"event_ts": ["between", [RANGE_START, RANGE_END]]}
+            )
+        )
+        self.assertFalse(
+            frappe.db.exists(
+                rollups.ROLLUP_DOCTYPE,
+                {"period": "minute", "bucket_start": ["between", [RANGE_START, RANGE_END]]},
+            )
+        )
+        hours = rollups._fetch_rollups("hour", RANGE_START, RANGE_END)
+        self.assertEqual(sum(frappe.parse_json(row.latency_sketch)["n"] for row in hours), 100)
+
+    def test_latency_endpoint_is_admin_only(self):
+        summary = metrics_api.get_search_latency(str(RANGE_START), str(RANGE_END))
+        self.assertEqual(summary["count"], 100)
+
+        frappe.set_user("Guest")
+        try:
+            with self.assertRaises(frappe.PermissionError):
+                metrics_api.get_search_latency(str(RANGE_START), str(RANGE_END))
+        finally:
+            frappe.set_user("Administrator")
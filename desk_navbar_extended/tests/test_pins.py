@@ -78,6 +78,47 @@ class TestPins(FrappeTestCase):
         # Verify order changed
         updated_pin2 = frappe.get_doc("Desk Navbar Pin", pin2["name"])
         self.assertEqual(updated_pin2.sequence, 1)
+        self.assertEqual(result["count"], 2)
+        self.assertEqual(result["rejected"], [])
+
+    def test_reorder_pins_rejects_foreign_pins(self):
+        """Test that pins of other users are reported and left untouched."""
+        own = pins.create_pin({"label": "Test Reorder Own", "route": "/app/1"})
+        foreign = pins.create_pin({"label": "Test Reorder Foreign", "route": "/app/2"})
+        frappe.db.set_value("Desk Navbar Pin", foreign["name"], "owner", "Guest")
+
+        result = pins.reorder_pins(
+            {
+                "pins": [
+                    {"name": own["name"], "sequence": 5},
+                    {"name": foreign["name"], "sequence": 6},
+                    {"name": "DNP-missing", "sequence": 7},
+                ]
+            }
+        )
+
+        self.assertEqual(result["count"], 1)
+        self.assertEqual(result["rejected"], [foreign["name"], "DNP-missing"])
+        self.assertEqual(frappe.db.get_value("Desk Navbar Pin", own["name"], "sequence"), 5)
+        self.assertEqual(
+            frappe.db.get_value("Desk Navbar Pin", foreign["name"], "sequence"),
+            foreign["sequence"],
+        )
+
+    def test_reorder_pins_rejects_duplicate_sequences(self):
+        """Test that two pins cannot share a sequence."""
+        pin1 = pins.create_pin({"label": "Test Reorder 1", "route": "/app/1"})
+        pin2 = pins.create_pin({"label": "Test Reorder 2", "route": "/app/2"})
+
+        with self.assertRaises(frappe.ValidationError):
+            pins.reorder_pins(
+                {
+                    "pins": [
+                        {"name": pin1["name"], "sequence": 3},
+                        {"name": pin2["name"], "sequence": 3},
+                    ]
+                }
+            )
 
     def test_pin_ownership(self):
         """Test that users can only delete their own pins."""
@@ -0,0 +1,89 @@
+"""Query-count regression guards for navbar endpoints."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended.api import command_palette, history, notifications, pins
+from desk_navbar_extended.benchmarks.api import bench_name, cleanup, seed, seed_context
+from desk_navbar_extended.tests.utils import QueryCountGuardMixin
+
+SEEDED_DOCTYPES = [
+    "Desk Navbar Pin",
+    "Desk Navbar Saved Search",
+    "Activity Log",
+    "Desk Navbar Recent Document",
+    "Notification Log",
+]
+FEATURES = ["pins", "saved_searches", "grouped_history", "command_palette", "notifications_center"]
+
+
+class TestQueryCounts(QueryCountGuardMixin, FrappeTestCase):
+    def setUp(self):
+        # The benchmark seeder commits; keep every test inside its rollback.
+        commit = patch.object(frappe.db, "commit")
+        commit.start()
+        self.addCleanup(commit.stop)
+
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        for feature in FEATURES:
+            settings.set(f"enable_{feature}", 1)
+        settings.flags.ignore_permissions = True
+        settings.save()
+
+    def tearDown(self):
+        cleanup(SEEDED_DOCTYPES)
+
+    def seed(self, size, doctypes):
+        """Replace seeded rows with ``size`` rows of each doctype in ``doctypes``."""
+        cleanup(SEEDED_DOCTYPES)
+        ctx = seed_context(dict.fromkeys(SEEDED_DOCTYPES, size))
+        for doctype in doctypes:
+            seed(doctype, 0, size, 42, ctx)
+        return [bench_name(doctype, idx) for doctype in doctypes for idx in range(size)]
+
+    def test_recent_activity(self):
+        """Titles are resolved per doctype, and Activity Log volume does not matter."""
+        self.assertQueryCountBounded(
+            lambda size: self.seed(
+                size,
+                [
+                    "Desk Navbar Pin",
+                    "Desk Navbar Saved Search",
+                    "Activity Log",
+                    "Desk Navbar Recent Document",
+                ],
+            ),
+            lambda _names: history.get_recent_activity(limit=100),
+            bound=20,
+        )
+
+    def test_reorder_pins(self):
+        """Ownership and sequences are checked and written in bulk."""
+
+        def reorder(names):
+            payload = {"pins": [{"name": name, "sequence": idx} for idx, name in enumerate(names)]}
+            self.assertEqual(pins.reorder_pins(payload)["count"], len(names))
+
+        self.assertQueryCountBounded(
+            lambda size: self.seed(size, ["Desk Navbar Pin"]), reorder, bound=10
+        )
+
+    def test_mark_as_read(self):
+        """Notifications are marked read with one statement."""
+        self.assertQueryCountBounded(
+            lambda size: self.seed(size, ["Notification Log"]),
+            notifications.mark_as_read,
+            bound=10,
+        )
+
+    def test_command_palette_sources(self):
+        """Palette sources do not grow with the number of pins and saved searches."""
+        self.assertQueryCountBounded(
+            lambda size: self.seed(size, ["Desk Navbar Pin", "Desk Navbar Saved Search"]),
+            lambda _names: command_palette.get_command_palette_sources(),
+            bound=250,
+        )
@@ -0,0 +1,80 @@
+"""Tests for the per-user recent documents buffer."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended import recent_docs
+
+
+class TestRecentDocs(FrappeTestCase):
+    def setUp(self):
+        recent_docs.clear_buffer()
+        frappe.db.delete(recent_docs.RECENT_DOCTYPE, {"user": frappe.session.user})
+
+    def tearDown(self):
+        recent_docs.clear_buffer()
+
+    def test_newest_first_without_duplicates(self):
+        recent_docs.record("ToDo", "A", timestamp=1_800_000_000)
+        recent_docs.record("ToDo", "B", timestamp=1_800_000_001)
+        recent_docs.record("ToDo", "A", timestamp=1_800_000_002)
+
+        entries = recent_docs.get_recent(10)
+        self.assertEqual([entry["name"] for entry in entries], ["A", "B"])
+        self.assertEqual(len(recent_docs.get_recent(1)), 1)
+
+    def test_buffer_is_bounded(self):
+        with patch.multiple(recent_docs, MAX_RECENT_DOCS=3, TRIM_SLACK=1):
+            for idx in range(5):
+                recent_docs.record("ToDo", f"T{idx}", timestamp=1_800_000_000 + idx)
+
+            names = [entry["name"] for entry in recent_docs.get_recent(10)]
+        self.assertEqual(names, ["T4", "T3", "T2"])
+
+    def test_saving_a_document_records_it(self):
+        with patch.object(frappe.local, "request", object(), create=True):
+            todo = frappe.get_doc({"doctype": "ToDo", "description": "Remember me"}).insert()
+
+        self.assertEqual(recent_docs.get_recent(1)[0]["name"], todo.name)
+
+    def test_background_saves_are_not_recorded(self):
+        frappe.get_doc({"doctype": "ToDo", "description": "Scheduled"}).insert()
+
+        self.assertEqual(recent_docs.get_recent(1), [])
+
+    def test_deleting_a_document_forgets_it(self):
+        """Trashing a document clears it from the buffer and the table."""
+        with patch.object(frappe.local, "request", object(), create=True):
+            todo = frappe.get_doc({"doctype": "ToDo", "description": "Forget me"}).insert()
+        with patch.object(frappe.db, "commit"):
+            recent_docs.persist_recent_docs()
+
+        todo.delete()
+
+        self.assertEqual(recent_docs.get_recent(10), [])
+        self.assertFalse(
+            frappe.db.exists(
+                recent_docs.RECENT_DOCTYPE,
+                {"reference_doctype": "ToDo", "reference_name": todo.name},
+            )
+        )
+
+    def test_persisted_buffer_survives_redis_loss(self):
+        """The scheduler copy reloads a buffer Redis has lost."""
+        recent_docs.record("ToDo", "A", timestamp=1_800_000_000)
+        recent_docs.record("ToDo", "B", timestamp=1_800_000_001)
+        # The job commits per batch; keep the test inside its rollback.
+        with patch.object(frappe.db, "commit"):
+            recent_docs.persist_recent_docs()
+
+        recent_docs.clear_buffer()
+        entries = recent_docs.get_recent(10)
+
+        self.assertEqual([entry["name"] for entry in entries], ["B", "A"])
+        # The reload refilled Redis, so the table is not read again.
+        frappe.db.delete(recent_docs.RECENT_DOCTYPE, {"user": frappe.session.user})
+        self.assertEqual(len(recent_docs.get_recent(10)), 2)
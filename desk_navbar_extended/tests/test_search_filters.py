@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
+import time
+
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
 from desk_navbar_extended.api import search_filters
+from desk_navbar_extended.search import result_cache
+from desk_navbar_extended.search.fanout import fan_out
+
+
+def _slow_for_todo(doctype, delay):
+    if doctype == "ToDo":
+        time.sleep(delay)
+    return [{"name": doctype, "doctype": doctype}]
 
 
 class TestSearchFilters(FrappeTestCase):
@@ -68,6 +78,144 @@ class TestSearchFilters(FrappeTestCase):
         # Should be capped at 100
         self.assertLessEqual(result["count"], 100)
 
+    def test_owner_and_date_filters_fill_the_page(self):
+        """Filtered searches apply predicates in SQL and still return a full page."""
+        for idx in range(5):
+            frappe.get_doc(
+                {"doctype": "ToDo", "description": f"Filterpage probe {idx}"}
+            ).insert(ignore_permissions=True)
+
+        result = search_filters.search_with_filters(
+            query="Filterpage probe",
+            doctype="ToDo",
+            owner="Administrator",
+            limit=3,
+        )
+        self.assertEqual(result["count"], 3)
+        self.assertTrue(all(row["doctype"] == "ToDo" for row in result["results"]))
+
+        future = search_filters.search_with_filters(
+            query="Filterpage probe",
+            doctype="ToDo",
+            date_from="2999-01-01",
+        )
+        self.assertEqual(future["count"], 0)
+
+    def test_wildcards_in_query_match_literally(self):
+        """``%`` and ``_`` typed by the user are not LIKE wildcards."""
+        for description in ("Likeprobe 100% done", "Likeprobe 1000 done", "Likeprobe 1_0"):
+            frappe.get_doc({"doctype": "ToDo", "description": description}).insert(
+                ignore_permissions=True
+            )
+
+        for query in ("Likeprobe 100%", "Likeprobe 1_"):
+            result = search_filters.search_with_filters(
+                query=query, doctype="ToDo", owner="Administrator"
+            )
+            self.assertEqual(result["count"], 1, query)
+
+    def test_repeated_search_is_cached_until_doctype_changes(self):
+        """An identical search is served from cache until a write bumps the doctype."""
+        result_cache.on_document_change(frappe._dict(doctype="ToDo"))
+
+        first = search_filters.search_with_filters(query="Cacheprobe", doctype="ToDo")
+        second = search_filters.search_with_filters(query="Cacheprobe", doctype="ToDo")
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["count"], 0)
+
+        frappe.get_doc({"doctype": "ToDo", "description": "Cacheprobe entry"}).insert(
+            ignore_permissions=True
+        )
+
+        third = search_filters.search_with_filters(query="Cacheprobe", doctype="ToDo")
+        self.assertFalse(third["cached"])
+        self.assertEqual(third["count"], 1)
+
+    def test_documents_shared_with_a_user_change_the_fingerprint(self):
+        """Users with the same roles only share cached pages while nothing is shared."""
+        todo = frappe.get_doc({"doctype": "ToDo", "description": "Shareprobe"}).insert(
+            ignore_permissions=True
+        )
+        before = result_cache.get_permission_fingerprint(["ToDo"], "test@example.com")
+
+        frappe.share.add("ToDo", todo.name, "test@example.com", read=1)
+
+        after = result_cache.get_permission_fingerprint(["ToDo"], "test@example.com")
+        self.assertNotEqual(before, after)
+
+    def test_doctypes_outside_global_search_are_not_cached(self):
+        """Writes to such doctypes do not invalidate, so their searches skip the cache."""
+        search_filters.search_with_filters(query="Cacheprobe", doctype="Role")
+        second = search_filters.search_with_filters(query="Cacheprobe", doctype="Role")
+        self.assertFalse(second["cached"])
+
+    def test_cursor_pages_cover_every_match_once(self):
+        """Following the cursor returns each match exactly once, then stops."""
+        for idx in range(5):
+            frappe.get_doc({"doctype": "ToDo", "description": f"Cursorprobe {idx}"}).insert(
+                ignore_permissions=True
+            )
+
+        seen = []
+        cursor = None
+        for _page in range(5):
+            page = search_filters.search_with_cursor(
+                query="Cursorprobe", doctype="ToDo", limit=2, cursor=cursor
+            )
+            seen.extend(row["name"] for row in page["results"])
+            cursor = page["cursor"]
+            if not cursor:
+                break
+
+        self.assertIsNone(cursor)
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_cursor_is_bound_to_its_query(self):
+        """A cursor cannot be replayed against a different query."""
+        for idx in range(3):
+            frappe.get_doc({"doctype": "ToDo", "description": f"Cursorbind {idx}"}).insert(
+                ignore_permissions=True
+            )
+        page = search_filters.search_with_cursor(query="Cursorbind", doctype="ToDo", limit=1)
+        self.assertTrue(page["has_more"])
+
+        with self.assertRaises(frappe.ValidationError):
+            search_filters.search_with_cursor(
+                query="Something else", doctype="ToDo", limit=1, cursor=page["cursor"]
+            )
+
+    def test_global_search_reports_configured_doctypes(self):
+        """Global search covers the configured doctypes and reports each one."""
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.search_doctypes = "User, ToDo"
+        settings.flags.ignore_permissions = True
+        settings.save()
+
+        result = search_filters.search_with_filters(query="Fanoutprobe")
+
+        self.assertEqual(set(result["breakdown"]), {"User", "ToDo"})
+        for entry in result["breakdown"].values():
+            self.assertFalse(entry["timed_out"])
+            self.assertIn("ms", entry)
+        self.assertFalse(result["partial"])
+
+        settings.search_doctypes = ""
+        settings.save()
+
+    def test_fan_out_returns_partial_results_at_deadline(self):
+        """Doctypes still running at the deadline are reported, not awaited."""
+        started = time.monotonic()
+        results, breakdown = fan_out(
+            _slow_for_todo, ["User", "ToDo"], 2, deadline_ms=300, max_workers=2
+        )
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(list(results), ["User"])
+        self.assertTrue(breakdown["ToDo"]["timed_out"])
+        self.assertFalse(breakdown["User"]["timed_out"])
+
     def test_feature_flag_gating(self):
         """Test that feature flag gates access."""
         settings = frappe.get_single("Desk Navbar Extended Settings")
@@ -0,0 +1,126 @@
+"""Tests for the navbar search index."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended.search import index
+from desk_navbar_extended.search.trigram import TrigramIndex
+
+
+class TestSearchIndex(FrappeTestCase):
+    def setUp(self):
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.enable_smart_filters = 1
+        settings.enable_search_index = 1
+        settings.flags.ignore_permissions = True
+        settings.save()
+
+    def test_tokenize(self):
+        """Tokens are lower-cased, de-duplicated and ordered."""
+        self.assertEqual(
+            index.tokenize("Customer ACME Ltd, customer-42"),
+            ["customer", "acme", "ltd", "42"],
+        )
+
+    def test_insert_update_and_trash_maintain_index(self):
+        """doc_events keep the index in step with the document."""
+        todo = frappe.get_doc(
+            {"doctype": "ToDo", "description": "Zanzibar shipment"}
+        ).insert(ignore_permissions=True)
+
+        hits = index.search_index("zanzi", ["ToDo"])
+        self.assertIn(todo.name, [hit["value"] for hit in hits])
+
+        todo.description = "Quixotic parcel"
+        todo.save(ignore_permissions=True)
+        self.assertFalse(index.search_index("zanzibar", ["ToDo"]))
+        self.assertTrue(index.search_index("quixotic", ["ToDo"]))
+
+        todo.delete(ignore_permissions=True)
+        self.assertFalse(
+            frappe.db.exists(
+                index.INDEX_DOCTYPE, {"reference_doctype": "ToDo", "reference_name": todo.name}
+            )
+        )
+
+    def test_ranking_prefers_documents_matching_more_terms(self):
+        """Documents matching every query term rank first."""
+        partial = frappe.get_doc({"doctype": "ToDo", "description": "Walrus"}).insert(
+            ignore_permissions=True
+        )
+        full = frappe.get_doc({"doctype": "ToDo", "description": "Walrus harbour"}).insert(
+            ignore_permissions=True
+        )
+
+        hits = index.search_index("walrus harbour", ["ToDo"])
+        self.assertEqual(hits[0]["value"], full.name)
+        self.assertIn(partial.name, [hit["value"] for hit in hits])
+
+    def test_rebuild_indexes_existing_documents(self):
+        """A rebuild repopulates rows removed behind the hooks' back."""
+        todo = frappe.get_doc({"doctype": "ToDo", "description": "Marmalade audit"}).insert(
+            ignore_permissions=True
+        )
+        frappe.db.delete(index.INDEX_DOCTYPE, {"reference_doctype": "ToDo"})
+
+        # The rebuild commits per chunk; keep the test inside its rollback.
+        with patch.object(frappe.db, "commit"):
+            counts = index.rebuild_search_index(["ToDo"])
+
+        self.assertGreaterEqual(counts["ToDo"], 1)
+        hits = index.search_index("marmalade", ["ToDo"])
+        self.assertIn(todo.name, [hit["value"] for hit in hits])
+
+    def test_trash_drops_rows_while_the_index_is_disabled(self):
+        """Deleting a configured doctype's document clears its rows with the index off."""
+        todo = frappe.get_doc({"doctype": "ToDo", "description": "Pelican ledger"}).insert(
+            ignore_permissions=True
+        )
+        self._update_settings(enable_search_index=0)
+
+        todo.delete(ignore_permissions=True)
+        self.assertFalse(
+            frappe.db.exists(
+                index.INDEX_DOCTYPE, {"reference_doctype": "ToDo", "reference_name": todo.name}
+            )
+        )
+
+    def test_prune_drops_doctypes_that_left_the_index(self):
+        """Only rows of the configured doctypes survive a prune."""
+        todo = frappe.get_doc({"doctype": "ToDo", "description": "Heron manifest"}).insert(
+            ignore_permissions=True
+        )
+        self._update_settings(search_doctypes="Note")
+
+        index.prune_search_index()
+
+        self.assertFalse(frappe.db.exists(index.INDEX_DOCTYPE, {"reference_doctype": "ToDo"}))
+
+        self._update_settings(enable_search_index=0)
+        index.prune_search_index()
+        self.assertFalse(frappe.db.count(index.INDEX_DOCTYPE))
+        self.assertTrue(frappe.db.exists("ToDo", todo.name))
+
+    def test_stale_vocabulary_is_served_while_it_reloads(self):
+        """A stale vocabulary answers at once and is reloaded off the request."""
+        stale = TrigramIndex(["walrus"])
+        index._vocabularies.set(frappe.local.site, ("outdated", 0.0, stale))
+        try:
+            with patch.object(index, "_reload_vocabulary_in_background") as reload:
+                self.assertIs(index.get_vocabulary(), stale)
+            reload.assert_called_once()
+        finally:
+            index._vocabularies.pop(frappe.local.site)
+
+    def tearDown(self):
+        self._update_settings(enable_search_index=0, search_doctypes="")
+
+    def _update_settings(self, **values):
+        settings = frappe.get_single("Desk Navbar Extended Settings")
+        settings.update(values)
+        settings.flags.ignore_permissions = True
+        settings.save()
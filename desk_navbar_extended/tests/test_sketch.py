@@ -0,0 +1,60 @@
+"""Tests for the mergeable latency sketch."""
+
+from __future__ import annotations
+
+import random
+import unittest
+
+from desk_navbar_extended.metrics.sketch import LatencySketch
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestLatencySketch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.lognormvariate(3, 1) for _ in range(20_000)]
+
+    def test_quantiles_within_relative_accuracy(self):
+        sketch = LatencySketch(0.01)
+        sketch.extend(self.values)
+
+        for q in (0.5, 0.95, 0.99):
+            expected = exact_quantile(self.values, q)
+            self.assertAlmostEqual(sketch.quantile(q) / expected, 1, delta=0.02)
+
+    def test_merge_matches_single_sketch(self):
+        """Merging per-bucket sketches equals sketching the whole range."""
+        whole = LatencySketch()
+        whole.extend(self.values)
+
+        merged = LatencySketch()
+        for start in range(0, len(self.values), 1000):
+            part = LatencySketch()
+            part.extend(self.values[start : start + 1000])
+            merged.merge(part)
+
+        self.assertEqual(merged.bins, whole.bins)
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual(merged.quantile(0.99), whole.quantile(0.99))
+
+    def test_json_round_trip(self):
+        sketch = LatencySketch()
+        sketch.extend([0, 1.5, 20, 300])
+
+        restored = LatencySketch.from_json(sketch.to_json())
+
+        self.assertEqual(restored.to_dict(), sketch.to_dict())
+        self.assertEqual(restored.quantile(0.5), sketch.quantile(0.5))
+
+    def test_empty_sketch(self):
+        sketch = LatencySketch.from_json(None)
+        self.assertIsNone(sketch.quantile(0.5))
+        self.assertEqual(len(sketch), 0)
+
+    def test_merge_rejects_different_accuracy(self):
+        with self.assertRaises(ValueError):
+            LatencySketch(0.01).merge(LatencySketch(0.02))
@@ -0,0 +1,83 @@
+"""Tests for the shared document title cache."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from desk_navbar_extended import title_cache
+from desk_navbar_extended.tests.utils import count_queries
+
+TEST_USER = "dne-titles@example.com"
+
+
+class TestTitleCache(FrappeTestCase):
+    def setUp(self):
+        if not frappe.db.exists("User", TEST_USER):
+            frappe.get_doc(
+                {
+                    "doctype": "User",
+                    "email": TEST_USER,
+                    "first_name": "Title",
+                    "send_welcome_email": 0,
+                }
+            ).insert(ignore_permissions=True)
+        title_cache.invalidate("User", [TEST_USER])
+
+    def test_titles_are_fetched_once(self):
+        pairs = [("User", TEST_USER), ("DocType", "ToDo"), ("User", "missing@example.com")]
+        titles = title_cache.get_titles(pairs)
+
+        full_name = frappe.db.get_value("User", TEST_USER, "full_name")
+        self.assertEqual(titles[("User", TEST_USER)], full_name)
+        self.assertEqual(titles[("DocType", "ToDo")], "ToDo")
+        self.assertNotIn(("User", "missing@example.com"), titles)
+
+        with count_queries() as counter:
+            self.assertEqual(title_cache.get_titles(pairs[:2]), titles)
+        self.assertEqual(counter.queries, 0)
+
+    def test_saving_writes_the_new_title_through(self):
+        title_cache.get_titles([("User", TEST_USER)])
+        user = frappe.get_doc("User", TEST_USER)
+        user.first_name = "Renamed"
+        user.save(ignore_permissions=True)
+
+        with count_queries() as counter:
+            titles = title_cache.get_titles([("User", TEST_USER)])
+        self.assertEqual(titles[("User", TEST_USER)], user.full_name)
+        self.assertEqual(counter.queries, 0)
+
+    def test_late_reads_do_not_overwrite_a_written_through_title(self):
+        title_cache.set_titles({("User", TEST_USER): "Fresh"})
+        # A reader that fetched the old title before the save fills in last.
+        title_cache._fill({("User", TEST_USER): "Stale"}, {"User": "outdated"})
+        title_cache._local_titles.clear()
+
+        titles = title_cache.get_titles([("User", TEST_USER)])
+        self.assertEqual(titles[("User", TEST_USER)], "Fresh")
+
+    def test_inserts_leave_the_cache_alone(self):
+        with patch.object(title_cache, "bump_cache_version") as bump:
+            frappe.get_doc(
+                {
+                    "doctype": "User",
+                    "email": "dne-titles-new@example.com",
+                    "first_name": "New",
+                    "send_welcome_email": 0,
+                }
+            ).insert(ignore_permissions=True)
+        bumped = [call.args[0] for call in bump.call_args_list]
+        self.assertNotIn(title_cache.version_name("User"), bumped)
+
+    def test_deleted_documents_are_forgotten(self):
+        email = "dne-titles-deleted@example.com"
+        frappe.get_doc(
+            {"doctype": "User", "email": email, "first_name": "Gone", "send_welcome_email": 0}
+        ).insert(ignore_permissions=True)
+        self.assertIn(("User", email), title_cache.get_titles([("User", email)]))
+
+        frappe.delete_doc("User", email, ignore_permissions=True)
+        self.assertNotIn(("User", email), title_cache.get_titles([("User", email)]))
@@ -0,0 +1,38 @@
+"""Tests for the trigram vocabulary index."""
+
+from __future__ import annotations
+
+import unittest
+
+from desk_navbar_extended.search.trigram import TrigramIndex, trigrams
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex(["customer", "custom", "acme", "ltd", "supplier", "costume"])
+
+    def test_trigrams_are_padded(self):
+        self.assertEqual(trigrams("cat"), ["  c", " ca", "cat", "at "])
+        self.assertEqual(trigrams("cat", pad_end=False), ["  c", " ca", "cat"])
+
+    def test_exact_term_scores_one(self):
+        self.assertEqual(self.index.search("acme")[0], (1.0, "acme"))
+
+    def test_misspelling_finds_intended_term(self):
+        """Missing and transposed characters still rank the intended term first."""
+        self.assertEqual(self.index.search("custmer")[0][1], "customer")
+        self.assertEqual(self.index.search("supplier")[0][1], "supplier")
+        self.assertEqual(self.index.search("suppleir")[0][1], "supplier")
+
+    def test_prefix_scores_above_threshold(self):
+        terms = [term for _score, term in self.index.search("custo")]
+        self.assertIn("customer", terms)
+        self.assertIn("custom", terms)
+
+    def test_results_are_top_k_in_score_order(self):
+        results = self.index.search("cust", k=2)
+        self.assertEqual(len(results), 2)
+        self.assertGreaterEqual(results[0][0], results[1][0])
+
+    def test_unrelated_query_returns_nothing(self):
+        self.assertEqual(self.index.search("zzzz"), [])
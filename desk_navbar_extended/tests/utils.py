@@ -0,0 +1,53 @@
+"""Shared helpers for Desk Navbar Extended tests."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from desk_navbar_extended.metrics.instrumentation import QueryCounter
+
+QUERY_GUARD_SIZES = (10, 1000)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Count the queries issued through ``frappe.db.sql`` inside the block."""
+    counter = QueryCounter()
+    with counter:
+        yield counter
+
+
+class QueryCountGuardMixin:
+    """Assertions that catch N+1 query patterns in endpoints."""
+
+    def assertQueryCountBounded(
+        self,
+        setup: Callable[[int], Any],
+        call: Callable[[Any], Any],
+        bound: int,
+        sizes: tuple[int, ...] = QUERY_GUARD_SIZES,
+    ) -> dict[int, int]:
+        """Assert ``call`` stays within ``bound`` queries at every input size.
+
+        ``setup(size)`` prepares an input of ``size`` items and returns what is
+        passed to ``call``. Each call is made once unmeasured so caches are
+        warm, then measured. The count at the largest size may not exceed the
+        count at the smallest one, so the bound cannot silently scale.
+        """
+        counts = {}
+        for size in sizes:
+            arg = setup(size)
+            call(arg)
+            with count_queries() as counter:
+                call(arg)
+            counts[size] = counter.queries
+            self.assertLessEqual(
+                counter.queries, bound, f"{counter.queries} queries for {size} items"
+            )
+
+        self.assertLessEqual(
+            counts[max(sizes)], counts[min(sizes)], f"query count grows with input: {counts}"
+        )
+        return counts
@@ -0,0 +1,176 @@
+"""Shared ``(doctype, name) -> title`` cache for history, palette and search.
+
+Titles live in Redis under one key per document with a TTL, and the most
+recently used ones also in a process-local LRU keyed by a per-doctype version
+token. Lookups are bulk: local hits first, one MGET for the rest, then one
+query per doctype for titles nobody cached yet.
+
+Documents of doctypes with a title field write their new title through on
+save, and are dropped on delete and rename; each of these replaces the
+doctype's version token so other workers stop trusting their local copies.
+Doctypes without a title field are never cached, their title is the name.
+
+Titles are returned without permission checks; callers list only documents
+the user may read.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+import frappe
+
+from desk_navbar_extended.cache import LRUCache, bump_cache_version, get_cache_version
+
+TITLE_KEY_PREFIX = "desk_navbar_extended:title:"
+TITLE_TTL_SECONDS = 24 * 3600
+MAX_TITLE_LENGTH = 140
+
+_local_titles = LRUCache(maxsize=4096)
+
+
+def version_name(doctype: str) -> str:
+    return f"titles:{doctype}"
+
+
+def get_titles(pairs: Iterable[tuple[str, str]]) -> dict[tuple[str, str], str]:
+    """Return ``{(doctype, name): title}`` for the documents in ``pairs`` that exist.
+
+    Documents with an empty title fall back to their name. Doctypes without a
+    title field are answered with the name, without checking that it exists.
+    """
+    site = frappe.local.site
+    titles: dict[tuple[str, str], str] = {}
+    versions: dict[str, str] = {}
+    missing: list[tuple[str, str]] = []
+    for doctype, name in dict.fromkeys(pairs):
+        if not title_field(doctype):
+            titles[(doctype, name)] = name
+            continue
+        if doctype not in versions:
+            versions[doctype] = get_cache_version(version_name(doctype))
+        title = _local_titles.get((site, versions[doctype], doctype, name))
+        if title is None:
+            missing.append((doctype, name))
+        else:
+            titles[(doctype, name)] = title or name
+    if not missing:
+        return titles
+
+    cache = frappe.cache()
+    # Raw commands: the wrapper would pickle the values.
+    raw = cache.pipeline(transaction=False).mget(_keys(cache, missing)).execute()[0]
+    unresolved: dict[str, list[str]] = defaultdict(list)
+    for (doctype, name), value in zip(missing, raw):
+        if value is None:
+            unresolved[doctype].append(name)
+            continue
+        title = value.decode() if isinstance(value, bytes) else value
+        _local_titles.set((site, versions[doctype], doctype, name), title)
+        titles[(doctype, name)] = title or name
+
+    fetched: dict[tuple[str, str], Any] = {}
+    for doctype, names in unresolved.items():
+        try:
+            rows = frappe.get_all(
+                doctype,
+                filters={"name": ["in", names]},
+                fields=["name", title_field(doctype)],
+                as_list=True,
+            )
+        except Exception:  # noqa: BLE001
+            continue
+        fetched.update(((doctype, name), title) for name, title in rows)
+    _fill(fetched, versions)
+    titles.update((pair, title or pair[1]) for pair, title in fetched.items())
+    return titles
+
+
+def _fill(titles: dict[tuple[str, str], Any], versions: dict[str, str]) -> None:
+    """Cache titles read from the database without overwriting newer ones.
+
+    A save between our query and this write has already written its title
+    through and replaced the version token, so Redis keeps the existing key
+    (SET NX) and the local copies carry the token read before the query,
+    which no longer matches.
+    """
+    if not titles:
+        return
+    site = frappe.local.site
+    cache = frappe.cache()
+    pipe = cache.pipeline(transaction=False)
+    for (doctype, name), title in titles.items():
+        title = str(title or "")[:MAX_TITLE_LENGTH]
+        pipe.set(_keys(cache, [(doctype, name)])[0], title, ex=TITLE_TTL_SECONDS, nx=True)
+        _local_titles.set((site, versions[doctype], doctype, name), title)
+    pipe.execute()
+
+
+def set_titles(titles: dict[tuple[str, str], Any]) -> None:
+    """Store ``{(doctype, name): title}`` in Redis and in process."""
+    if not titles:
+        return
+    site = frappe.local.site
+    cache = frappe.cache()
+    pipe = cache.pipeline(transaction=False)
+    for (doctype, name), title in titles.items():
+        title = str(title or "")[:MAX_TITLE_LENGTH]
+        pipe.set(_keys(cache, [(doctype, name)])[0], title, ex=TITLE_TTL_SECONDS)
+        version = get_cache_version(version_name(doctype))
+        _local_titles.set((site, version, doctype, name), title)
+    pipe.execute()
+
+
+def invalidate(doctype: str, names: Iterable[str]) -> None:
+    """Forget the titles of ``names`` in every worker."""
+    cache = frappe.cache()
+    keys = _keys(cache, [(doctype, name) for name in names])
+    if keys:
+        cache.pipeline(transaction=False).delete(*keys).execute()
+    bump_cache_version(version_name(doctype))
+
+
+def title_field(doctype: str) -> str | None:
+    """Return the title field of ``doctype``, or None when its title is the name."""
+    try:
+        field = frappe.get_meta(doctype).get_title_field()
+    except Exception:  # noqa: BLE001
+        return None
+    return field if field and field != "name" else None
+
+
+def _keys(cache: Any, pairs: Iterable[tuple[str, str]]) -> list[str]:
+    return [cache.make_key(f"{TITLE_KEY_PREFIX}{doctype}::{name}") for doctype, name in pairs]
+
+
+def on_document_update(doc: Any, method: str | None = None) -> None:
+    """doc_events hook: write a changed title through."""
+    if frappe.flags.in_install or frappe.flags.in_migrate:
+        return
+    # New documents cannot have a cached title yet.
+    if doc.flags.in_insert or doc.get_doc_before_save() is None:
+        return
+    field = title_field(doc.doctype)
+    if field and doc.has_value_changed(field):
+        bump_cache_version(version_name(doc.doctype))
+        set_titles({(doc.doctype, doc.name): doc.get(field)})
+
+
+def on_document_trash(doc: Any, method: str | None = None) -> None:
+    """doc_events hook: drop the title of a deleted document."""
+    if title_field(doc.doctype):
+        invalidate(doc.doctype, [doc.name])
+
+
+def on_document_rename(
+    doc: Any,
+    method: str | None = None,
+    old_name: str | None = None,
+    new_name: str | None = None,
+    merge: bool = False,
+) -> None:
+    """doc_events hook: drop the titles of both the old and the new name."""
+    if title_field(doc.doctype):
+        invalidate(doc.doctype, [name for name in (old_name, new_name) if name])